@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark how long the event loop stalls while a blocking function is
+retried from async code, calling it directly vs. with retry_to_thread
+"""
+
+import asyncio
+import logging
+import time
+import warnings
+from typing import Awaitable, Callable, List
+
+import tubthumper
+
+TICK = 1e-3
+BACKOFF = 0.05
+RETRIES = 5
+
+
+def flaky() -> Callable[[], int]:
+    """Create a function failing RETRIES times before succeeding"""
+    failures = iter(range(RETRIES))
+
+    def func() -> int:
+        if next(failures, None) is not None:
+            raise ConnectionError
+        return 1
+
+    return func
+
+
+async def max_stall(call: Callable[[], Awaitable[object]]) -> float:
+    """Run a ticker alongside the call, returning the longest gap between ticks"""
+    gaps: List[float] = []
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(TICK)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(TICK)
+    await call()
+    await asyncio.sleep(2 * TICK)
+    task.cancel()
+    return max(gaps)
+
+
+async def direct() -> int:
+    wrapped = tubthumper.retry_factory(
+        flaky(),
+        exceptions=ConnectionError,
+        init_backoff=BACKOFF,
+        exponential=1,
+        jitter=False,
+        on_event_loop="ignore",
+    )
+    return wrapped()
+
+
+async def to_thread() -> int:
+    return await tubthumper.retry_to_thread(
+        flaky(),
+        exceptions=ConnectionError,
+        init_backoff=BACKOFF,
+        exponential=1,
+        jitter=False,
+    )
+
+
+async def main() -> None:
+    warnings.simplefilter("ignore")
+    logging.getLogger("tubthumper").setLevel(logging.ERROR)
+    print(f"{RETRIES} retries with a {BACKOFF * 1e3:.0f} ms backoff")
+    for name, call in (("direct", direct), ("retry_to_thread", to_thread)):
+        stall = await max_stall(call)
+        print(f"{name:>16}: longest event loop stall {stall * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory usage during a long sequence of retries of a function
+referencing a large payload, with logged exceptions held by a buffering
+handler, with & without clearing the traceback frames of retried attempts
+"""
+
+import logging
+import logging.handlers
+import tracemalloc
+from typing import Callable
+
+import tubthumper
+
+PAYLOAD_SIZE = 1_000_000
+RETRIES = 50
+
+
+def flaky() -> Callable[[], int]:
+    """Create a function failing RETRIES times before succeeding"""
+    failures = iter(range(RETRIES))
+
+    def func() -> int:
+        payload = bytearray(PAYLOAD_SIZE)  # noqa: F841
+        if next(failures, None) is not None:
+            raise ConnectionError
+        return 1
+
+    return func
+
+
+def peak_usage(**kwargs: object) -> float:
+    """Retry the function, returning the peak memory allocated in MB"""
+    handler = logging.handlers.MemoryHandler(capacity=RETRIES + 1)
+    logger = logging.getLogger("tubthumper.benchmark")
+    logger.addHandler(handler)
+    logger.propagate = False
+    wrapped = tubthumper.retry_factory(
+        flaky(),
+        exceptions=ConnectionError,
+        init_backoff=0,
+        logger=logger,
+        **kwargs,  # pyright: ignore [reportArgumentType]
+    )
+    tracemalloc.start()
+    wrapped()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    logger.removeHandler(handler)
+    handler.buffer.clear()
+    return peak / 1e6
+
+
+def main() -> None:
+    print(f"{RETRIES} retries, each referencing a {PAYLOAD_SIZE / 1e6:.0f} MB payload")
+    for name, kwargs in (
+        ("default", {}),
+        ("clear_frames", {"clear_frames": True}),
+        ("keep_exceptions=3", {"clear_frames": True, "keep_exceptions": 3}),
+    ):
+        print(f"{name:>18}: peak memory {peak_usage(**kwargs):8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
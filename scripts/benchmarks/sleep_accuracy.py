@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark how much longer than requested sub-millisecond backoffs last,
+sleeping vs. spin-waiting at the end of each backoff
+"""
+
+import logging
+import time
+from typing import Callable
+
+import tubthumper
+
+BACKOFFS = (50e-6, 100e-6, 200e-6, 500e-6, 1e-3)
+RETRIES = 200
+SPIN_THRESHOLD = 1e-3
+
+
+def flaky() -> Callable[[], int]:
+    """Create a function failing RETRIES times before succeeding"""
+    failures = iter(range(RETRIES))
+
+    def func() -> int:
+        if next(failures, None) is not None:
+            raise ConnectionError
+        return 1
+
+    return func
+
+
+def oversleep(backoff: float, spin_threshold: float) -> float:
+    """
+    Retry the function, returning how much longer than requested backoffs
+    lasted on average, including the overhead of each retry
+    """
+    logging.getLogger("tubthumper").setLevel(logging.ERROR)
+    wrapped = tubthumper.retry_factory(
+        flaky(),
+        exceptions=ConnectionError,
+        retry_limit=RETRIES,
+        init_backoff=backoff,
+        exponential=1,
+        jitter=False,
+        spin_threshold=spin_threshold,
+    )
+    start = time.perf_counter()
+    wrapped()
+    elapsed = time.perf_counter() - start
+    return elapsed / RETRIES - backoff
+
+
+def main() -> None:
+    print(f"Mean oversleep per backoff over {RETRIES} retries, in µs")
+    print(f"{'backoff':>10} {'sleep':>10} {'spin':>10}")
+    for backoff in BACKOFFS:
+        slept = oversleep(backoff, 0)
+        spun = oversleep(backoff, SPIN_THRESHOLD)
+        print(f"{backoff * 1e6:10.0f} {slept * 1e6:10.1f} {spun * 1e6:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark the overhead of retrying calls succeeding on their first attempt,
+calling functions and coroutines directly vs. wrapped, with and without
+exposing the attempt to them
+"""
+
+import asyncio
+import timeit
+from typing import Any, Awaitable, Callable, Dict
+
+import tubthumper
+
+CALLS = 100_000
+REPEATS = 5
+CONFIGS: Dict[str, Dict[str, Any]] = {
+    "wrapped": {},
+    "exposed": {"expose_attempt": True},
+}
+
+
+def func() -> int:
+    """Succeed right away"""
+    return 1
+
+
+async def coro_func() -> int:
+    """Succeed right away, asynchronously"""
+    return 1
+
+
+def sync_cost(call: Callable[[], object]) -> float:
+    """Return the best mean duration of a call over REPEATS runs of CALLS calls"""
+    return min(timeit.repeat(call, number=CALLS, repeat=REPEATS)) / CALLS
+
+
+def async_cost(call: Callable[[], Awaitable[object]]) -> float:
+    """Return the best mean duration of awaiting a call over REPEATS runs of CALLS calls"""
+
+    async def run() -> float:
+        durations = []
+        for _ in range(REPEATS):
+            start = timeit.default_timer()
+            for _ in range(CALLS):
+                await call()
+            durations.append(timeit.default_timer() - start)
+        return min(durations) / CALLS
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    print(f"Mean duration of a call succeeding right away over {CALLS} calls, in µs")
+    print(f"{'':>10} {'function':>10} {'coroutine':>10}")
+    synced = sync_cost(func) * 1e6
+    awaited = async_cost(coro_func) * 1e6
+    print(f"{'direct':>10} {synced:10.2f} {awaited:10.2f}")
+    for name, config in CONFIGS.items():
+        wrapped = tubthumper.retry_factory(func, exceptions=ConnectionError, **config)
+        wrapped_coro = tubthumper.retry_factory(
+            coro_func, exceptions=ConnectionError, **config
+        )
+        synced = sync_cost(wrapped) * 1e6
+        awaited = async_cost(wrapped_coro) * 1e6
+        print(f"{name:>10} {synced:10.2f} {awaited:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,75 @@
 """Initialization code for tubthumper package"""
 
-from tubthumper._interfaces import retry, retry_decorator, retry_factory
-from tubthumper._retry_factory import RetryError
+from tubthumper._adaptive import AdaptiveBackoff
+from tubthumper._backoff_state import BackoffState
+from tubthumper._budget import RetryBudget
+from tubthumper._bulkhead import Bulkhead
+from tubthumper._cache import ResultCache
+from tubthumper._classifier import ExceptionClassifier, ExceptionPolicy
+from tubthumper._context import AttemptContext, attempt_context, deadline, priority
+from tubthumper._dead_letter import (
+    DeadLetter,
+    DeadLetterStore,
+    FileDeadLetterStore,
+    SQLiteDeadLetterStore,
+)
+from tubthumper._endpoints import EndpointPool
+from tubthumper._in_flight import InFlightRetries, RetryLoop, in_flight
+from tubthumper._interfaces import (
+    retry,
+    retry_decorator,
+    retry_factory,
+    retry_to_thread,
+    retrying,
+)
+from tubthumper._policies import PolicyRegistry, policy_registry
+from tubthumper._retry_factory import (
+    Attempt,
+    AttemptRecord,
+    EventLoopBlockingError,
+    RetryError,
+    Retrying,
+)
+from tubthumper._shedding import LoadShedder, load_shedder
+from tubthumper._slow_start import SlowStart
 from tubthumper._types import Logger
 from tubthumper._version import __version__
 
 __all__ = [
+    "AdaptiveBackoff",
+    "Attempt",
+    "AttemptContext",
+    "AttemptRecord",
+    "BackoffState",
+    "Bulkhead",
+    "DeadLetter",
+    "DeadLetterStore",
+    "EndpointPool",
+    "EventLoopBlockingError",
+    "ExceptionClassifier",
+    "ExceptionPolicy",
+    "FileDeadLetterStore",
+    "InFlightRetries",
+    "LoadShedder",
     "Logger",
+    "PolicyRegistry",
+    "ResultCache",
+    "RetryBudget",
     "RetryError",
+    "RetryLoop",
+    "Retrying",
+    "SQLiteDeadLetterStore",
+    "SlowStart",
     "__version__",
+    "attempt_context",
+    "deadline",
+    "in_flight",
+    "load_shedder",
+    "policy_registry",
+    "priority",
     "retry",
     "retry_decorator",
     "retry_factory",
+    "retry_to_thread",
+    "retrying",
 ]
@@ -0,0 +1,124 @@
+"""Module defining the AdaptiveBackoff class"""
+
+import threading
+from typing import Dict
+
+from tubthumper import _types as tub_types
+
+
+class AdaptiveBackoff:
+    r"""Backoff duration & retry concurrency adapting to the observed success rate
+
+    Provide an instance of this class as the ``adaptive`` argument of any of
+    ``tubthumper``'s interfaces to replace the static ``init_backoff`` and
+    ``exponential`` with additive-increase/multiplicative-decrease (AIMD)
+    control across recent calls. Each failed attempt multiplies the backoff
+    duration by ``factor``, up to ``max_delay``, and divides the number of
+    callers allowed to back off at once by it, down to ``min_concurrency``.
+    Each call returning successfully shortens the backoff duration by
+    ``step`` seconds, down to ``min_delay``, and allows one more caller to
+    back off at once, up to ``max_concurrency``. Callers beyond that number
+    give up with a `RetryError` rather than retrying. The state is exposed
+    by `stats` for monitoring.
+
+    Args:
+        min_delay:
+            shortest backoff duration in seconds, and the initial one
+        max_delay:
+            longest backoff duration in seconds
+        factor:
+            factor the backoff duration grows by, and the number of callers
+            allowed to back off at once shrinks by, with each failed attempt
+        step:
+            duration in seconds the backoff duration shrinks by with each
+            call returning successfully
+        min_concurrency:
+            smallest number of callers allowed to back off at once
+        max_concurrency:
+            largest number of callers allowed to back off at once,
+            and the initial one
+    """
+
+    min_delay: tub_types.Duration
+    max_delay: tub_types.Duration
+    factor: float
+    step: tub_types.Duration
+    min_concurrency: float
+    max_concurrency: float
+    _lock: threading.Lock
+    _delay: tub_types.Duration
+    _concurrency: float
+    _backing_off: int
+    _success_rate: float
+    _rejected: int
+
+    def __init__(
+        self,
+        *,
+        min_delay: tub_types.Duration = 0.1,
+        max_delay: tub_types.Duration = 60,
+        factor: float = 2,
+        step: tub_types.Duration = 0.1,
+        min_concurrency: float = 1,
+        max_concurrency: float = 100,
+    ):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.step = step
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._delay = min_delay
+        self._concurrency = max_concurrency
+        self._backing_off = self._rejected = 0
+        self._success_rate = 1.0
+
+    @property
+    def delay(self) -> tub_types.Duration:
+        """Current backoff duration, read without locking"""
+        return self._delay
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Current backoff duration & number of callers allowed to back off at once,
+        callers backing off & rejected so far, and moving average of the success rate
+        """
+        with self._lock:
+            return {
+                "delay": self._delay,
+                "concurrency": self._concurrency,
+                "backing_off": self._backing_off,
+                "rejected": self._rejected,
+                "success_rate": self._success_rate,
+            }
+
+    def record_success(self) -> None:
+        """Shorten the backoff duration & allow one more caller to back off at once"""
+        with self._lock:
+            self._delay = max(self.min_delay, self._delay - self.step)
+            self._concurrency = min(self.max_concurrency, self._concurrency + 1)
+            self._success_rate += 0.1 * (1 - self._success_rate)
+
+    def record_failure(self) -> None:
+        """Lengthen the backoff duration & allow fewer callers to back off at once"""
+        with self._lock:
+            self._delay = min(self.max_delay, self._delay * self.factor)
+            self._concurrency = max(
+                self.min_concurrency, self._concurrency / self.factor
+            )
+            self._success_rate -= 0.1 * self._success_rate
+
+    def start_backoff(self) -> bool:
+        """Count a caller sleeping in backoff, returning False if rejected instead"""
+        with self._lock:
+            if self._backing_off >= self._concurrency:
+                self._rejected += 1
+                return False
+            self._backing_off += 1
+            return True
+
+    def end_backoff(self) -> None:
+        """Count a caller done sleeping in backoff"""
+        with self._lock:
+            self._backing_off -= 1
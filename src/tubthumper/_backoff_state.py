@@ -0,0 +1,82 @@
+"""Module defining the BackoffState class"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+from tubthumper import _types as tub_types
+from tubthumper._singleflight import default_key
+
+
+class BackoffState:
+    r"""Backoff durations shared between calls to the same resource
+
+    Provide an instance of this class as the ``backoff_state`` argument of
+    any of ``tubthumper``'s interfaces so calls to a resource that has been
+    failing for a while don't start backing off from ``init_backoff`` again.
+    Each call's arguments map to a key, e.g. a host or a tenant, whose
+    backoff duration grows with each retry of any call with that key, and
+    new calls start backing off from it. Each call returning successfully
+    shrinks it by a factor of ``decay``, until it falls back to the call's
+    ``init_backoff``. At most ``max_keys`` keys are tracked, forgetting the
+    least recently used.
+
+    Args:
+        key:
+            function called with each call's arguments returning its key,
+            by default the arguments themselves, which must then be hashable
+        max_keys:
+            maximum number of keys tracked
+        decay:
+            factor the backoff duration of a key shrinks by with each
+            call returning successfully, between 0 and 1
+    """
+
+    key: Callable[..., Hashable]
+    max_keys: int
+    decay: float
+    _levels: "OrderedDict[Hashable, tub_types.Duration]"
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        key: Optional[Callable[..., Hashable]] = None,
+        *,
+        max_keys: int = 1024,
+        decay: float = 0.5,
+    ):
+        self.key = default_key if key is None else key
+        self.max_keys = max_keys
+        self.decay = decay
+        self._levels = OrderedDict()
+        self._lock = threading.Lock()
+
+    def levels(self) -> Dict[Hashable, tub_types.Duration]:
+        """Backoff duration of each key tracked, from least to most recently used"""
+        with self._lock:
+            return dict(self._levels)
+
+    def level(self, key: Hashable) -> tub_types.Duration:
+        """Backoff duration new calls with the key start from, 0 if untracked"""
+        with self._lock:
+            return self._levels.get(key, 0)
+
+    def escalate(self, key: Hashable, backoff: tub_types.Duration) -> None:
+        """Raise the key's backoff duration, forgetting the least recently used key if full"""
+        with self._lock:
+            self._levels[key] = max(self._levels.get(key, 0), backoff)
+            self._levels.move_to_end(key)
+            if len(self._levels) > self.max_keys:
+                self._levels.popitem(last=False)
+
+    def recover(self, key: Hashable, floor: tub_types.Duration) -> None:
+        """Shrink the key's backoff duration, forgetting it once down to the floor"""
+        with self._lock:
+            level = self._levels.get(key)
+            if level is None:
+                return
+            level *= self.decay
+            if level <= floor:
+                del self._levels[key]
+            else:
+                self._levels[key] = level
@@ -0,0 +1,247 @@
+"""Module defining the RetryBudget class"""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from tubthumper import _types as tub_types
+
+if sys.platform == "win32":  # pragma: no cover
+    import msvcrt
+
+    def _lock_file(fileno: int) -> None:
+        os.lseek(fileno, 0, os.SEEK_SET)
+        msvcrt.locking(fileno, msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(fileno: int) -> None:
+        os.lseek(fileno, 0, os.SEEK_SET)
+        msvcrt.locking(fileno, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(fileno: int) -> None:
+        fcntl.flock(fileno, fcntl.LOCK_EX)
+
+    def _unlock_file(fileno: int) -> None:
+        fcntl.flock(fileno, fcntl.LOCK_UN)
+
+
+_MAGIC = b"TUBB"
+_VERSION = 1
+_BUCKETS = 10
+# magic, version, circuit breaker open until (seconds since the epoch)
+_HEADER = struct.Struct("<4sId")
+# bucket number, calls, retries, failures
+_BUCKET = struct.Struct("<4q")
+_SIZE = _HEADER.size + _BUCKETS * _BUCKET.size
+_CALLS = 1
+_RETRIES = 2
+_FAILURES = 3
+
+
+class RetryBudget:
+    r"""Budget limiting retries, with a circuit breaker, optionally shared across processes
+
+    Provide an instance of this class as the ``budget`` argument of any of
+    ``tubthumper``'s interfaces to limit retries to a ratio of calls made in a
+    sliding time window, and to fail calls fast with a `RetryError` while the
+    dependency is failing too often. Share an instance between wrappers calling
+    the same dependency so they back off together.
+
+    By default, the budget's state lives in anonymous memory, shared by the
+    threads of this process only, since its updates are serialized with a
+    lock that isn't shared with forked processes. Given a ``path``, the state is memory-mapped from that file
+    instead, so every process on the host using the same path, e.g. each
+    worker of a web server, sees the same failure rate, and a restarted
+    process picks up where its predecessor left off. Updates are serialized
+    with an advisory lock on the file.
+
+    Args:
+        path:
+            file to store the budget's state in, created if needed
+        ratio:
+            maximum number of retries, as a fraction of calls
+            made within the window
+        min_retries:
+            number of retries allowed within the window regardless of ``ratio``,
+            so that rarely called functions can still retry
+        window:
+            duration in seconds of the sliding window calls,
+            retries, and failures are counted over
+        failure_threshold:
+            fraction of failed attempts within the window
+            at which the circuit breaker opens
+        min_attempts:
+            minimum number of attempts within the window
+            before the circuit breaker can open
+        cooldown:
+            duration in seconds the circuit breaker stays open,
+            failing calls without attempting them
+    """
+
+    path: Optional[str]
+    ratio: float
+    min_retries: int
+    window: tub_types.Duration
+    failure_threshold: float
+    min_attempts: int
+    cooldown: tub_types.Duration
+    _bucket_duration: tub_types.Duration
+    _fileno: Optional[int]
+    _mmap: mmap.mmap
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        ratio: float = 0.2,
+        min_retries: int = 10,
+        window: tub_types.Duration = 10,
+        failure_threshold: float = 0.5,
+        min_attempts: int = 20,
+        cooldown: tub_types.Duration = 30,
+    ):
+        self.path = path
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.min_attempts = min_attempts
+        self.cooldown = cooldown
+        self._bucket_duration = window / _BUCKETS
+        self._lock = threading.Lock()
+        if path is None:
+            self._fileno = None
+            self._mmap = mmap.mmap(-1, _SIZE)
+        else:
+            self._fileno = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            _lock_file(self._fileno)
+            try:
+                if os.fstat(self._fileno).st_size < _SIZE:
+                    os.ftruncate(self._fileno, _SIZE)
+                self._mmap = mmap.mmap(self._fileno, _SIZE)
+            finally:
+                _unlock_file(self._fileno)
+        with self._locked():
+            magic, version, _ = _HEADER.unpack_from(self._mmap)
+            if magic != _MAGIC or version != _VERSION:
+                self._mmap[:] = bytes(_SIZE)
+                _HEADER.pack_into(self._mmap, 0, _MAGIC, _VERSION, 0.0)
+
+    def close(self) -> None:
+        """Unmap the budget's state, closing its file"""
+        self._mmap.close()
+        if self._fileno is not None:
+            os.close(self._fileno)
+
+    def is_open(self) -> bool:
+        """Whether or not the circuit breaker is open, read without locking"""
+        return time.time() < self._open_until()
+
+    def start(self) -> bool:
+        """Count a call, returning False if the circuit breaker is open instead"""
+        with self._locked():
+            now = time.time()
+            if now < self._open_until():
+                return False
+            self._add(now, _CALLS)
+            return True
+
+    def record_failure(self) -> None:
+        """Count a failed attempt, opening the circuit breaker if too many have failed"""
+        with self._locked():
+            now = time.time()
+            self._add(now, _FAILURES)
+            calls, retries, failures = self._totals(now)
+            attempts = calls + retries
+            if (
+                attempts >= self.min_attempts
+                and failures >= self.failure_threshold * attempts
+            ):
+                self._trip(now)
+
+    def acquire_retry(self) -> bool:
+        """Count a retry, returning False if the budget is exhausted instead"""
+        with self._locked():
+            now = time.time()
+            if now < self._open_until():
+                return False
+            calls, retries, _ = self._totals(now)
+            if retries >= max(self.ratio * calls, self.min_retries):
+                return False
+            self._add(now, _RETRIES)
+            return True
+
+    def stats(self) -> Dict[str, float]:
+        """Calls, retries, and failures within the window, plus when the circuit breaker closes"""
+        with self._locked():
+            calls, retries, failures = self._totals(time.time())
+            return {
+                "calls": calls,
+                "retries": retries,
+                "failures": failures,
+                "open_until": self._open_until(),
+            }
+
+    def _open_until(self) -> float:
+        return _HEADER.unpack_from(self._mmap)[2]
+
+    def _trip(self, now: float) -> None:
+        """Open the circuit breaker, starting the window over"""
+        self._mmap[_HEADER.size :] = bytes(_SIZE - _HEADER.size)
+        _HEADER.pack_into(self._mmap, 0, _MAGIC, _VERSION, now + self.cooldown)
+
+    def _add(self, now: float, field: int) -> None:
+        """Increment a field of the current bucket, resetting it if stale"""
+        number = int(now // self._bucket_duration)
+        offset = _HEADER.size + (number % _BUCKETS) * _BUCKET.size
+        bucket = list(_BUCKET.unpack_from(self._mmap, offset))
+        if bucket[0] != number:
+            bucket = [number, 0, 0, 0]
+        bucket[field] += 1
+        _BUCKET.pack_into(self._mmap, offset, *bucket)
+
+    def _totals(self, now: float) -> Tuple[int, int, int]:
+        """Sum calls, retries, and failures over the buckets within the window"""
+        oldest = int(now // self._bucket_duration) - _BUCKETS
+        calls = retries = failures = 0
+        for (
+            number,
+            bucket_calls,
+            bucket_retries,
+            bucket_failures,
+        ) in _BUCKET.iter_unpack(self._mmap[_HEADER.size :]):
+            if number > oldest:
+                calls += bucket_calls
+                retries += bucket_retries
+                failures += bucket_failures
+        return calls, retries, failures
+
+    def _locked(self) -> "_BudgetLock":
+        return _BudgetLock(self._lock, self._fileno)
+
+
+class _BudgetLock:
+    """Context manager holding the budget's thread lock, and file lock if any"""
+
+    __slots__ = ("_fileno", "_lock")
+
+    def __init__(self, lock: threading.Lock, fileno: Optional[int]):
+        self._lock = lock
+        self._fileno = fileno
+
+    def __enter__(self) -> None:
+        self._lock.acquire()
+        if self._fileno is not None:
+            _lock_file(self._fileno)
+
+    def __exit__(self, *_: object) -> None:
+        if self._fileno is not None:
+            _unlock_file(self._fileno)
+        self._lock.release()
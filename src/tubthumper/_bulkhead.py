@@ -0,0 +1,180 @@
+"""Module defining the Bulkhead class"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from tubthumper import _types as tub_types
+from tubthumper._named import named
+
+
+class Bulkhead:
+    r"""Bulkhead limiting concurrent attempts, and callers waiting in backoff
+
+    Provide an instance of this class as the ``bulkhead`` argument of any of
+    ``tubthumper``'s interfaces to stop retry loops from piling up on a
+    struggling dependency. At most ``max_concurrent`` calls of the function
+    are in flight at once, across threads and coroutines, with callers
+    beyond that waiting up to ``queue_timeout`` seconds for one to finish,
+    or rejected right away by default. At most ``max_waiting`` callers sleep
+    in backoff at once, with callers beyond that rejected rather than retried.
+    Rejected callers raise a `RetryError`.
+
+    Share an instance between wrappers calling the same dependency, or use
+    `Bulkhead.named` to share one by name.
+
+    Args:
+        max_concurrent:
+            maximum number of calls of the function in flight at once
+        max_waiting:
+            maximum number of callers sleeping in backoff at once
+        queue_timeout:
+            duration in seconds a caller waits for a call in flight
+            to finish before being rejected
+    """
+
+    max_concurrent: int
+    max_waiting: float
+    queue_timeout: tub_types.Duration
+    _lock: threading.Lock
+    _waiters: Deque[Callable[[], Any]]
+    _in_flight: int
+    _backing_off: int
+    _rejected: int
+    _rejected_backoff: int
+
+    def __init__(
+        self,
+        max_concurrent: int = 10,
+        *,
+        max_waiting: float = float("inf"),
+        queue_timeout: tub_types.Duration = 0,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self._in_flight = self._backing_off = 0
+        self._rejected = self._rejected_backoff = 0
+
+    @classmethod
+    def named(
+        cls,
+        name: str,
+        max_concurrent: Optional[int] = None,
+        *,
+        max_waiting: Optional[float] = None,
+        queue_timeout: Optional[tub_types.Duration] = None,
+    ) -> "Bulkhead":
+        """
+        Return the bulkhead shared under this name, creating it with
+        the provided limits, or the defaults, if it doesn't exist yet,
+        raising a ValueError if it exists with different limits
+        """
+        return named(
+            cls,
+            name,
+            max_concurrent=max_concurrent,
+            max_waiting=max_waiting,
+            queue_timeout=queue_timeout,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Calls in flight, callers queued & backing off, and rejections so far"""
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "backing_off": self._backing_off,
+                "rejected": self._rejected,
+                "rejected_backoff": self._rejected_backoff,
+            }
+
+    def acquire(self) -> bool:
+        """Acquire a slot for a call, waiting up to the queue timeout, returning False if rejected"""
+        deadline = None
+        while True:
+            with self._lock:
+                if self._in_flight < self.max_concurrent:
+                    self._in_flight += 1
+                    return True
+                if deadline is None:
+                    deadline = time.monotonic() + self.queue_timeout
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._rejected += 1
+                    return False
+                event = threading.Event()
+                wake = event.set
+                self._waiters.append(wake)
+            if not event.wait(remaining):
+                self._stop_waiting(wake, timed_out=True)
+                return False
+
+    async def acquire_async(self) -> bool:
+        """Like `acquire`, but waiting without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        deadline = None
+        while True:
+            with self._lock:
+                if self._in_flight < self.max_concurrent:
+                    self._in_flight += 1
+                    return True
+                if deadline is None:
+                    deadline = loop.time() + self.queue_timeout
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self._rejected += 1
+                    return False
+                future = loop.create_future()
+
+                def wake(future: "asyncio.Future[None]" = future) -> None:
+                    loop.call_soon_threadsafe(future.set_result, None)
+
+                self._waiters.append(wake)
+            try:
+                await asyncio.wait({future}, timeout=remaining)
+            except asyncio.CancelledError:
+                self._stop_waiting(wake, timed_out=False)
+                raise
+            if not future.done():
+                self._stop_waiting(wake, timed_out=True)
+                return False
+
+    def release(self) -> None:
+        """Release a call's slot, waking the longest queued caller"""
+        with self._lock:
+            self._in_flight -= 1
+            if self._waiters:
+                self._waiters.popleft()()
+
+    def start_backoff(self) -> bool:
+        """Count a caller sleeping in backoff, returning False if rejected instead"""
+        with self._lock:
+            if self._backing_off >= self.max_waiting:
+                self._rejected_backoff += 1
+                return False
+            self._backing_off += 1
+            return True
+
+    def end_backoff(self) -> None:
+        """Count a caller done sleeping in backoff"""
+        with self._lock:
+            self._backing_off -= 1
+
+    def _stop_waiting(self, wake: Callable[[], Any], timed_out: bool) -> None:
+        """
+        Stop waiting to be woken after timing out or being cancelled,
+        passing the wakeup on to the next queued caller if already woken
+        """
+        with self._lock:
+            if timed_out:
+                self._rejected += 1
+            try:
+                self._waiters.remove(wake)
+            except ValueError:
+                if self._waiters:
+                    self._waiters.popleft()()
@@ -0,0 +1,183 @@
+"""Module defining the ResultCache class"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+)
+
+from tubthumper import _types as tub_types
+from tubthumper._singleflight import default_key
+
+_MISSING: Any = object()
+
+
+class ResultCache:
+    r"""Cache of returned objects, served stale when retries give up
+
+    Provide an instance of this class as the ``cache`` argument of
+    `retry_decorator` or `retry_factory` for read paths where a slightly
+    stale object is better than an error. Calls within ``ttl`` seconds of
+    the last returned object for the same arguments return it without
+    calling the function. Otherwise, the function is called with retry
+    logic, and if that gives up, e.g. with a `RetryError`, the last returned
+    object is returned instead, as long as it is within ``stale_ttl``
+    seconds. The cache holds at most ``max_size`` objects, evicting the
+    least recently used, and is safe to share between threads and coroutines.
+
+    Args:
+        ttl:
+            duration in seconds a returned object is served without calling
+            the function
+        stale_ttl:
+            duration in seconds a returned object is served when the function
+            fails, from when it was returned
+        max_size:
+            maximum number of returned objects held
+        key:
+            function called with each call's arguments returning its key,
+            by default the arguments themselves, which must then be hashable
+    """
+
+    ttl: tub_types.Duration
+    stale_ttl: tub_types.Duration
+    max_size: int
+    key: Callable[..., Hashable]
+    _entries: "OrderedDict[Hashable, Tuple[float, Any]]"
+    _lock: threading.Lock
+    _hits: int
+    _stale_hits: int
+    _misses: int
+    _evictions: int
+
+    def __init__(
+        self,
+        *,
+        ttl: tub_types.Duration = 60,
+        stale_ttl: tub_types.Duration = 3600,
+        max_size: int = 1024,
+        key: Optional[Callable[..., Hashable]] = None,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.key = default_key if key is None else key
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._stale_hits = self._misses = self._evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Counts of hits, stale hits, misses, and evictions, plus ratios of hits to lookups"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "stale_hit_ratio": self._stale_hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Remove all returned objects, resetting the counts"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._stale_hits = self._misses = self._evictions = 0
+
+    def get_fresh(self, key: Hashable) -> Any:
+        """Return the object cached for the key if within its TTL, counting a hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            return _MISSING
+
+    def get_stale(self, key: Hashable) -> Any:
+        """Return the object cached for the key if within its stale TTL, counting a stale hit"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.stale_ttl:
+                return _MISSING
+            self._stale_hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a returned object for the key, evicting the least recently used if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+
+def sync_cached(
+    func: Callable[tub_types.P, tub_types.T],
+    cache: ResultCache,
+    qualname: str,
+    serve_stale: Callable[[Exception], bool],
+    retry_on_result: tub_types.RetryOnResult,
+) -> Callable[tub_types.P, tub_types.T]:
+    """Wrap a function with retry logic to return cached objects"""
+    cache_key = cache.key
+
+    def cached_func(*args: tub_types.P.args, **kwargs: tub_types.P.kwargs) -> Any:
+        key = qualname, cache_key(*args, **kwargs)
+        value = cache.get_fresh(key)
+        if value is not _MISSING:
+            return value
+        try:
+            result = func(*args, **kwargs)
+        except Exception as exc:
+            if serve_stale(exc):
+                value = cache.get_stale(key)
+                if value is not _MISSING:
+                    return value
+            raise
+        if retry_on_result is None or not retry_on_result(result):
+            cache.set(key, result)
+        return result
+
+    return cached_func
+
+
+def async_cached(
+    func: Callable[tub_types.P, Awaitable[tub_types.T]],
+    cache: ResultCache,
+    qualname: str,
+    serve_stale: Callable[[Exception], bool],
+    retry_on_result: tub_types.RetryOnResult,
+) -> Callable[tub_types.P, Awaitable[tub_types.T]]:
+    """Wrap a coroutine function with retry logic to return cached objects"""
+    cache_key = cache.key
+
+    async def cached_func(*args: tub_types.P.args, **kwargs: tub_types.P.kwargs) -> Any:
+        key = qualname, cache_key(*args, **kwargs)
+        value = cache.get_fresh(key)
+        if value is not _MISSING:
+            return value
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as exc:
+            if serve_stale(exc):
+                value = cache.get_stale(key)
+                if value is not _MISSING:
+                    return value
+            raise
+        if retry_on_result is None or not retry_on_result(result):
+            cache.set(key, result)
+        return result
+
+    return cached_func
@@ -0,0 +1,152 @@
+"""Module defining the ExceptionClassifier class"""
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple, Type
+
+from tubthumper import _types as tub_types
+
+
+@dataclass(frozen=True, eq=False)
+class ExceptionPolicy:
+    r"""Overrides of the retry config for a class of exceptions
+
+    Any field left as ``None`` falls back to the wrapper's configuration.
+    Each policy keeps its own retry count and backoff duration within a
+    call, while the wrapper's ``time_limit`` is shared by all of them,
+    e.g. to back off slowly from throttling errors while retrying
+    connection resets almost instantly.
+
+    Args:
+        retry_limit:
+            number of retries of this class of exceptions to perform
+            before raising an exception
+        init_backoff:
+            duration in seconds to sleep before the first retry
+            of this class of exceptions
+        exponential:
+            backoff duration between retries of this class of exceptions
+            grows by this factor with each retry
+        jitter:
+            whether or not to "jitter" the backoff duration randomly
+        reraise:
+            whether or not to re-raise the caught exception instead of
+            a `RetryError` when a retry or time limit is reached
+        log_level:
+            level for logging caught exceptions
+    """
+
+    retry_limit: Optional[tub_types.RetryLimit] = None
+    init_backoff: Optional[tub_types.Duration] = None
+    exponential: Optional[tub_types.Exponential] = None
+    jitter: Optional[tub_types.Jitter] = None
+    reraise: Optional[tub_types.Reraise] = None
+    log_level: Optional[tub_types.LogLevel] = None
+
+
+DEFAULT_POLICY = ExceptionPolicy()
+
+
+@dataclass(frozen=True)
+class _Decision:
+    """Cached classification of an exception type"""
+
+    predicate: Optional[tub_types.ExceptionPredicate]
+    policy: ExceptionPolicy
+
+
+class ExceptionClassifier:
+    r"""Classifier deciding which caught exceptions should be retried
+
+    Provide an instance of this class as the ``exceptions`` argument
+    of any of ``tubthumper``'s interfaces for finer control than a
+    tuple of exceptions. Each exception type is matched against the
+    classes in its method resolution order, most specific first, so
+    ``ExceptionClassifier(OSError, exclude=PermissionError)`` retries
+    a ``ConnectionError`` but never a ``PermissionError``. These
+    decisions are cached per exception type, so each type only walks
+    its method resolution order once.
+
+    Args:
+        include:
+            exceptions to be caught, resulting in a retry
+        exclude:
+            subclasses of the included exceptions not to be retried
+        predicates:
+            mapping of exception classes to a predicate called with
+            each caught exception of that class, preventing a retry
+            when it returns ``False``, e.g. to check an ``errno``
+            or status code attribute
+        policies:
+            mapping of exception classes to an `ExceptionPolicy`
+            overriding the retry config for that class of exception
+    """
+
+    include: Tuple[Type[Exception], ...]
+    exclude: Tuple[Type[Exception], ...]
+    predicates: Mapping[Type[Exception], tub_types.ExceptionPredicate]
+    policies: Mapping[Type[Exception], ExceptionPolicy]
+    _cache: Dict[Type[Exception], Optional[_Decision]]
+
+    def __init__(
+        self,
+        include: tub_types.ExceptionTypes,
+        *,
+        exclude: tub_types.ExceptionTypes = (),
+        predicates: Optional[
+            Mapping[Type[Exception], tub_types.ExceptionPredicate]
+        ] = None,
+        policies: Optional[Mapping[Type[Exception], ExceptionPolicy]] = None,
+    ):
+        self.include = _as_tuple(include)
+        self.exclude = _as_tuple(exclude)
+        self.predicates = dict(predicates or {})
+        self.policies = dict(policies or {})
+        self._cache = {}
+
+    def classify(self, exc: Exception) -> Optional[ExceptionPolicy]:
+        """
+        Classify a caught exception, returning None if it shouldn't be retried,
+        or the `ExceptionPolicy` to retry it with
+        """
+        exc_type = type(exc)
+        try:
+            decision = self._cache[exc_type]
+        except KeyError:
+            decision = self._cache[exc_type] = self._decide(exc_type)
+        if decision is None:
+            return None
+        if decision.predicate is not None and not decision.predicate(exc):
+            return None
+        return decision.policy
+
+    def _decide(self, exc_type: Type[Exception]) -> Optional[_Decision]:
+        """Walk the exception type's method resolution order to classify it"""
+        mro = exc_type.__mro__
+        for cls in mro:
+            if cls in self.exclude:
+                return None
+            if cls in self.include:
+                break
+        else:
+            return None
+        predicate = next(
+            (self.predicates[cls] for cls in mro if cls in self.predicates), None
+        )
+        policy = next(
+            (self.policies[cls] for cls in mro if cls in self.policies),
+            DEFAULT_POLICY,
+        )
+        return _Decision(predicate=predicate, policy=policy)
+
+
+def as_classifier(exceptions: tub_types.Exceptions) -> ExceptionClassifier:
+    """Coerce the exceptions argument of the public interfaces into a classifier"""
+    if isinstance(exceptions, ExceptionClassifier):
+        return exceptions
+    return ExceptionClassifier(exceptions)
+
+
+def _as_tuple(exceptions: tub_types.ExceptionTypes) -> Tuple[Type[Exception], ...]:
+    if isinstance(exceptions, tuple):
+        return exceptions
+    return (exceptions,)
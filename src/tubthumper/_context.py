@@ -0,0 +1,149 @@
+"""Module defining context propagated from calls with retry logic to the calls they make"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+from tubthumper import _types as tub_types
+from tubthumper._classifier import ExceptionPolicy
+
+
+@dataclass(frozen=True)
+class AttemptContext:
+    r"""Snapshot of the attempt in progress of a call with retry logic
+
+    Returned by `attempt_context` to the function being retried, e.g. to
+    shrink a batch, switch to a replica, or lower a timeout on later attempts.
+
+    Args:
+        number:
+            number of the attempt in progress, starting from 1
+        elapsed:
+            duration in seconds since the call started
+        remaining:
+            duration in seconds until the call's time limit,
+            or the deadline of an enclosing call, if sooner
+        exception:
+            exception caught on the previous attempt, if any
+        endpoint:
+            endpoint chosen for the attempt from the call's
+            `EndpointPool`, if any
+    """
+
+    number: int
+    elapsed: tub_types.Duration
+    remaining: tub_types.Duration
+    exception: Optional[Exception]
+    endpoint: Any = None
+
+
+class Scope:
+    """
+    Deadline, in `time.monotonic` time, and exceptions retried
+    by an enclosing call with retry logic
+    """
+
+    __slots__ = ("attempt", "classify", "deadline", "parent")
+
+    deadline: float
+    classify: Optional[Callable[[Exception], Optional[ExceptionPolicy]]]
+    parent: Optional["Scope"]
+    attempt: Optional[Callable[[], AttemptContext]]
+
+    def __init__(
+        self,
+        deadline: float,
+        classify: Optional[Callable[[Exception], Optional[ExceptionPolicy]]],
+        parent: Optional["Scope"],
+        attempt: Optional[Callable[[], AttemptContext]] = None,
+    ):
+        self.deadline = deadline
+        self.classify = classify
+        self.parent = parent
+        self.attempt = attempt
+
+    def retries(self, exc: Exception) -> bool:
+        """Whether or not this or any enclosing scope retries the exception"""
+        scope: Optional[Scope] = self
+        while scope is not None:
+            if scope.classify is not None and scope.classify(exc) is not None:
+                return True
+            scope = scope.parent
+        return False
+
+
+scope: contextvars.ContextVar[Optional[Scope]] = contextvars.ContextVar(
+    "tubthumper_scope", default=None
+)
+
+call_priority: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "tubthumper_priority", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: tub_types.Duration) -> Iterator[None]:
+    r"""Context manager setting a deadline for calls with retry logic made within it
+
+    Retries that would end after the deadline are prevented, just like
+    retries beyond a ``time_limit``, in this thread or task and any
+    threads or tasks started within it that copy its `contextvars`, e.g.
+    with `asyncio.create_task` or `asyncio.to_thread`. Deadlines nest,
+    with the tightest one winning.
+
+    Args:
+        seconds:
+            duration in seconds from now until the deadline
+    """
+    parent = scope.get()
+    absolute = time.monotonic() + seconds
+    if parent is not None and parent.deadline < absolute:
+        absolute = parent.deadline
+    token = scope.set(Scope(absolute, None, parent))
+    try:
+        yield
+    finally:
+        scope.reset(token)
+
+
+def attempt_context() -> Optional[AttemptContext]:
+    r"""Return the attempt in progress of the innermost call with retry logic exposing it
+
+    Call this from within a function being retried with ``expose_attempt=True``,
+    or ``endpoints``, to adapt its behavior to the attempt it's on. The
+    snapshot is only taken when asked for, and only calls exposing their
+    attempt publish it, so functions that don't ask for it pay nothing for it.
+
+    Returns:
+        the attempt in progress, or ``None`` outside of any call with retry
+        logic exposing it
+    """
+    current = scope.get()
+    while current is not None:
+        if current.attempt is not None:
+            return current.attempt()
+        current = current.parent
+    return None
+
+
+@contextmanager
+def priority(value: tub_types.Priority) -> Iterator[None]:
+    r"""Context manager setting the priority of calls with retry logic made within it
+
+    Overrides the ``priority`` argument of the calls' wrappers, in this
+    thread or task and any threads or tasks started within it that copy its
+    `contextvars`, e.g. to shed retries of a background job before those of
+    user-facing calls.
+
+    Args:
+        value:
+            process-wide pressure of `load_shedder` at which retries are shed,
+            giving up with a `RetryError`, or ``None`` to never shed them
+    """
+    token = call_priority.set(float("inf") if value is None else value)
+    try:
+        yield
+    finally:
+        call_priority.reset(token)
@@ -0,0 +1,408 @@
+"""Module defining dead-letter stores for calls that exhausted their retries"""
+
+import asyncio
+import atexit
+import contextvars
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from tubthumper import _types as tub_types
+from tubthumper._budget import _lock_file, _unlock_file
+
+_replaying: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "tubthumper_replaying", default=False
+)
+_open_stores: "weakref.WeakSet[DeadLetterStore]" = weakref.WeakSet()
+
+
+@dataclass(frozen=True)
+class DeadLetter:
+    r"""Record of a call that exhausted its retries
+
+    Args:
+        id:
+            unique identifier of the record
+        qualname:
+            module and qualified name of the function called
+        args:
+            positional arguments of the call
+        kwargs:
+            keyword arguments of the call
+        replayable:
+            whether or not the arguments could be serialized as JSON,
+            otherwise ``args`` & ``kwargs`` hold their ``repr`` instead
+        exceptions:
+            chain of exceptions the call failed with, outermost first,
+            as ``(type, message)`` pairs
+        started:
+            time the call started, in seconds since the epoch
+        elapsed:
+            duration in seconds of the call
+        attempts:
+            number of times the function was called
+    """
+
+    id: str
+    qualname: str
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    replayable: bool
+    exceptions: Tuple[Tuple[str, str], ...]
+    started: float
+    elapsed: tub_types.Duration
+    attempts: int
+
+    @classmethod
+    def from_call(
+        cls,
+        qualname: str,
+        args: Tuple[Any, ...],
+        kwargs: Mapping[str, Any],
+        *,
+        exc: BaseException,
+        elapsed: tub_types.Duration,
+        attempts: int,
+    ) -> "DeadLetter":
+        """Create a dead letter from a call that exhausted its retries"""
+        try:
+            json.dumps([args, kwargs])
+        except (TypeError, ValueError):
+            args = tuple(repr(arg) for arg in args)
+            kwargs = {key: repr(value) for key, value in kwargs.items()}
+            replayable = False
+        else:
+            replayable = True
+        return cls(
+            id=uuid.uuid4().hex,
+            qualname=qualname,
+            args=tuple(args),
+            kwargs=dict(kwargs),
+            replayable=replayable,
+            exceptions=_exception_chain(exc),
+            started=time.time() - elapsed,
+            elapsed=elapsed,
+            attempts=attempts,
+        )
+
+    def to_json(self) -> str:
+        """Serialize the dead letter as JSON"""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "DeadLetter":
+        """Deserialize a dead letter from JSON"""
+        fields = json.loads(data)
+        fields["args"] = tuple(fields["args"])
+        fields["exceptions"] = tuple(
+            (exc_type, message) for exc_type, message in fields["exceptions"]
+        )
+        return cls(**fields)
+
+
+def _exception_chain(exc: BaseException) -> Tuple[Tuple[str, str], ...]:
+    """Describe an exception and the exceptions it was caused by"""
+    chain = []
+    current: Optional[BaseException] = exc
+    while current is not None and len(chain) < 16:
+        exc_type = type(current)
+        chain.append((f"{exc_type.__module__}.{exc_type.__qualname__}", str(current)))
+        current = current.__cause__ or current.__context__
+    return tuple(chain)
+
+
+class DeadLetterStore(ABC):
+    r"""Base class of stores for calls that exhausted their retries
+
+    Provide an instance of a subclass as the ``dead_letter`` argument of any of
+    ``tubthumper``'s interfaces to record calls that give up, rather than
+    losing that work. Records are buffered and written in batches, once
+    ``batch_size`` records are buffered or ``flush_interval`` seconds after the
+    first buffered record, so a burst of failures doesn't pay for a durable
+    write per record. Buffered records are also written when the store is
+    closed, or the interpreter exits.
+
+    Args:
+        batch_size:
+            number of buffered records that triggers a write
+        flush_interval:
+            maximum duration in seconds a record is buffered before being written
+    """
+
+    batch_size: int
+    flush_interval: tub_types.Duration
+    _buffer: List[DeadLetter]
+    _lock: threading.RLock
+    _timer: Optional[threading.Timer]
+
+    def __init__(self, *, batch_size: int = 100, flush_interval: float = 1):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.RLock()
+        self._timer = None
+        _open_stores.add(self)
+
+    def record(self, letter: DeadLetter) -> None:
+        """Buffer a dead letter, writing the buffer if it is full"""
+        if _replaying.get():
+            return
+        with self._lock:
+            self._buffer.append(letter)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write all buffered dead letters"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._buffer:
+                self._write(self._buffer)
+                self._buffer = []
+
+    def close(self) -> None:
+        """Write all buffered dead letters and release the store's resources"""
+        self.flush()
+        _open_stores.discard(self)
+
+    def replay(self, func: Callable[..., Any]) -> int:
+        """
+        Call the function with the arguments of each replayable dead letter recorded
+        for it, typically the function with retry logic, deleting the dead letters of
+        calls that succeed, and returning how many did
+        """
+        letters = self._replayable(func)
+        token = _replaying.set(True)
+        succeeded = []
+        try:
+            for letter in letters:
+                try:
+                    func(*letter.args, **letter.kwargs)
+                except Exception:
+                    continue
+                succeeded.append(letter.id)
+        finally:
+            _replaying.reset(token)
+            self._finish_replay(succeeded)
+        return len(succeeded)
+
+    async def replay_async(self, func: Callable[..., Awaitable[Any]]) -> int:
+        """
+        Like `replay`, but for coroutine functions, reading and deleting
+        dead letters in a thread so as not to block the event loop
+        """
+        letters = await asyncio.to_thread(self._replayable, func)
+        token = _replaying.set(True)
+        succeeded = []
+        try:
+            for letter in letters:
+                try:
+                    await func(*letter.args, **letter.kwargs)
+                except Exception:
+                    continue
+                succeeded.append(letter.id)
+        finally:
+            _replaying.reset(token)
+            await asyncio.to_thread(self._finish_replay, succeeded)
+        return len(succeeded)
+
+    def _replayable(self, func: Callable[..., Any]) -> List[DeadLetter]:
+        """
+        Read the replayable dead letters of the function, for replays to
+        stop recording dead letters in their context, since failed replays
+        are kept as is
+        """
+        self.flush()
+        qualname = qualified_name(func)
+        return [
+            letter
+            for letter in self.read()
+            if letter.qualname == qualname and letter.replayable
+        ]
+
+    def _finish_replay(self, ids: List[str]) -> None:
+        if ids:
+            with self._lock:
+                self._delete(ids)
+
+    @abstractmethod
+    def read(self) -> List[DeadLetter]:
+        """Read all written dead letters, oldest first"""
+
+    @abstractmethod
+    def _write(self, letters: List[DeadLetter]) -> None:
+        """Durably write a batch of dead letters"""
+
+    @abstractmethod
+    def _delete(self, ids: List[str]) -> None:
+        """Delete written dead letters"""
+
+
+class SQLiteDeadLetterStore(DeadLetterStore):
+    r"""Dead-letter store backed by a local SQLite database
+
+    Each batch of dead letters is written in a single transaction.
+
+    Args:
+        path:
+            path of the SQLite database file, created if needed
+        batch_size:
+            number of buffered records that triggers a write
+        flush_interval:
+            maximum duration in seconds a record is buffered before being written
+    """
+
+    path: str
+    _connection: sqlite3.Connection
+
+    def __init__(self, path: str, *, batch_size: int = 100, flush_interval: float = 1):
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS dead_letters "
+                "(id TEXT PRIMARY KEY, letter TEXT NOT NULL)"
+            )
+
+    def close(self) -> None:
+        """Write all buffered dead letters and close the database connection"""
+        super().close()
+        self._connection.close()
+
+    def read(self) -> List[DeadLetter]:
+        """Read all written dead letters, oldest first"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT letter FROM dead_letters ORDER BY rowid"
+            ).fetchall()
+        return [DeadLetter.from_json(letter) for (letter,) in rows]
+
+    def _write(self, letters: List[DeadLetter]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO dead_letters (id, letter) VALUES (?, ?)",
+                [(letter.id, letter.to_json()) for letter in letters],
+            )
+
+    def _delete(self, ids: List[str]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM dead_letters WHERE id = ?", [(id_,) for id_ in ids]
+            )
+
+
+class FileDeadLetterStore(DeadLetterStore):
+    r"""Dead-letter store backed by an append-only file of JSON lines
+
+    Each batch of dead letters is appended with a single write and ``fsync``.
+    Deleting replayed dead letters rewrites the file. Reads, writes and
+    deletions hold a lock on a ``.lock`` file next to it, so several
+    processes can record to and replay from the same file.
+
+    Args:
+        path:
+            path of the file, created if needed
+        batch_size:
+            number of buffered records that triggers a write
+        flush_interval:
+            maximum duration in seconds a record is buffered before being written
+    """
+
+    path: str
+
+    def __init__(self, path: str, *, batch_size: int = 100, flush_interval: float = 1):
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        self.path = path
+
+    def read(self) -> List[DeadLetter]:
+        """Read all written dead letters, oldest first"""
+        with self._lock, self._locked():
+            return self._read()
+
+    def _write(self, letters: List[DeadLetter]) -> None:
+        data = "".join(f"{letter.to_json()}\n" for letter in letters)
+        with self._locked(), open(self.path, "a", encoding="utf-8") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _delete(self, ids: List[str]) -> None:
+        deleted = set(ids)
+        with self._locked():
+            kept = [letter for letter in self._read() if letter.id not in deleted]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.writelines(f"{letter.to_json()}\n" for letter in kept)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+
+    def _read(self) -> List[DeadLetter]:
+        """Read all written dead letters, holding the lock on the file"""
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+        return [DeadLetter.from_json(line) for line in lines if line.strip()]
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Hold the lock on the file across processes, on a separate lock file
+        since deleting dead letters replaces the file
+        """
+        fileno = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _lock_file(fileno)
+            try:
+                yield
+            finally:
+                _unlock_file(fileno)
+        finally:
+            os.close(fileno)
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    """
+    Write the buffered dead letters of stores still open as the interpreter exits,
+    without keeping stores alive, since those with buffered records are kept alive
+    by their flush timer anyway
+    """
+    for store in list(_open_stores):
+        store.flush()
+
+
+def qualified_name(func: Callable[..., Any]) -> str:
+    """Module and qualified name of a function, used to match dead letters to it"""
+    func = inspect.unwrap(func)
+    module = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", None) or repr(func)
+    return f"{module}.{qualname}"
@@ -0,0 +1,135 @@
+"""Module defining the EndpointPool class"""
+
+import random
+import threading
+import time
+from typing import Any, Collection, Dict, List, Sequence
+
+from tubthumper import _types as tub_types
+
+
+class _Health:
+    """Class tracking the health of an endpoint across calls"""
+
+    __slots__ = ("ejected_until", "error_rate", "latency")
+
+    latency: tub_types.Duration
+    error_rate: float
+    ejected_until: float
+
+    def __init__(self) -> None:
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.ejected_until = 0.0
+
+
+class EndpointPool:
+    r"""Pool of endpoints for retries to fail over between
+
+    Provide an instance of this class as the ``endpoints`` argument of any of
+    ``tubthumper``'s interfaces to make each attempt of a call with a different
+    endpoint, e.g. the host of a replica, available to the function being
+    retried as the ``endpoint`` of `attempt_context`. Endpoints are chosen
+    at random, weighted by their health score, i.e. the exponentially
+    weighted moving averages of their latency and error rate, kept across
+    calls. Endpoints whose error rate reaches ``max_error_rate`` are ejected
+    for ``ejection_time`` seconds. After a failed attempt, the retry is made
+    right away, without sleeping, when another endpoint is healthy.
+
+    Share an instance between wrappers calling the same pool of endpoints.
+
+    Args:
+        endpoints:
+            endpoints to choose from, in no particular order
+        decay:
+            weight of each new latency & error observation in
+            the moving averages, between 0 and 1
+        max_error_rate:
+            error rate at which an endpoint is ejected
+        ejection_time:
+            duration in seconds an ejected endpoint isn't chosen,
+            unless every endpoint is ejected
+    """
+
+    endpoints: Sequence[Any]
+    decay: float
+    max_error_rate: float
+    ejection_time: tub_types.Duration
+    _lock: threading.Lock
+    _health: List[_Health]
+
+    def __init__(
+        self,
+        endpoints: Sequence[Any],
+        *,
+        decay: float = 0.3,
+        max_error_rate: float = 0.5,
+        ejection_time: tub_types.Duration = 30,
+    ):
+        if not endpoints:
+            raise ValueError("EndpointPool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.decay = decay
+        self.max_error_rate = max_error_rate
+        self.ejection_time = ejection_time
+        self._lock = threading.Lock()
+        self._health = [_Health() for _ in endpoints]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Latency, error rate & ejection of each endpoint"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "endpoint": endpoint,
+                    "latency": health.latency,
+                    "error_rate": health.error_rate,
+                    "ejected": health.ejected_until > now,
+                }
+                for endpoint, health in zip(self.endpoints, self._health)
+            ]
+
+    def choose(self, tried: Collection[int] = ()) -> int:
+        """
+        Choose the index of an endpoint for an attempt, weighted by health,
+        preferring healthy endpoints not yet tried in the call
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [
+                index
+                for index, health in enumerate(self._health)
+                if health.ejected_until <= now
+            ]
+            if not healthy:
+                return min(
+                    range(len(self._health)),
+                    key=lambda index: self._health[index].ejected_until,
+                )
+            candidates = [index for index in healthy if index not in tried] or healthy
+            weights = [self._weight(self._health[index]) for index in candidates]
+        return random.choices(candidates, weights)[0]
+
+    def has_healthy(self, index: int) -> bool:
+        """Whether or not an endpoint other than this one isn't ejected"""
+        now = time.monotonic()
+        with self._lock:
+            return any(
+                health.ejected_until <= now
+                for other, health in enumerate(self._health)
+                if other != index
+            )
+
+    def record(self, index: int, latency: tub_types.Duration, ok: bool) -> None:
+        """Record the latency & outcome of an attempt, ejecting the endpoint if failing"""
+        with self._lock:
+            health = self._health[index]
+            health.latency += self.decay * (latency - health.latency)
+            health.error_rate += self.decay * (float(not ok) - health.error_rate)
+            if not ok and health.error_rate >= self.max_error_rate:
+                health.ejected_until = time.monotonic() + self.ejection_time
+
+    @staticmethod
+    def _weight(health: _Health) -> float:
+        """Health score of an endpoint, favoring fast & reliable ones"""
+        return (1.01 - health.error_rate) / (health.latency + 1e-3)
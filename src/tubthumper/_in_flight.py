@@ -0,0 +1,124 @@
+"""Module defining the InFlightRetries class"""
+
+import json
+import signal
+import sys
+import time
+from types import FrameType
+from typing import Any, Dict, List, Optional, Set, TextIO, Type
+
+
+class RetryLoop:
+    """State of a retry loop in flight, updated in place after each failed attempt
+
+    Attributes:
+        function:
+            qualified name of the function retried
+        started:
+            when the retry loop started, as a POSIX timestamp
+        attempt:
+            number of failed attempts so far, 0 until the first is recorded
+        wake_up:
+            when the loop wakes up from its current backoff, as a POSIX
+            timestamp, initially when it started
+        exception:
+            qualified name of the class of the last exception caught, if any
+    """
+
+    __slots__ = ("attempt", "exception", "function", "started", "wake_up")
+
+    function: str
+    started: float
+    attempt: int
+    wake_up: float
+    exception: Optional[str]
+
+    def __init__(self, function: str, started: float):
+        self.function = function
+        self.started = started
+        self.attempt = 0
+        self.wake_up = started
+        self.exception = None
+
+    def update(
+        self, attempt: int, exception: Optional[Type[BaseException]], backoff: float
+    ) -> None:
+        """Record a failed attempt, and when the loop wakes up from its backoff"""
+        self.attempt = attempt
+        self.exception = None if exception is None else exception.__qualname__
+        self.wake_up = time.time() + backoff
+
+
+class InFlightRetries:
+    r"""Registry of retry loops in flight, to see which calls are stuck retrying
+
+    Every call with retry logic registers here after its first failed
+    attempt, until it returns or gives up, so calls that never fail cost
+    nothing. A `snapshot` of each retry loop gives its function's qualified
+    name, the number of failed attempts so far, when it started & wakes up
+    from its current backoff as POSIX timestamps, whether it is sleeping in
+    backoff or attempting again, and the class of the last exception
+    caught, if any. Use the process-wide instance, `in_flight`, calling
+    `dump` on demand, or `dump_on_signal` to dump a snapshot as JSON
+    whenever the process receives a signal.
+
+    Registering, unregistering, and taking a snapshot don't lock, relying on
+    atomic set operations, so a snapshot is safe to take from a signal handler.
+    """
+
+    _loops: Set[RetryLoop]
+
+    def __init__(self) -> None:
+        self._loops = set()
+
+    def register(self, function: str, started: float) -> RetryLoop:
+        """Register a retry loop, returning its state to update in place"""
+        loop = RetryLoop(function, started)
+        self._loops.add(loop)
+        return loop
+
+    def unregister(self, loop: RetryLoop) -> None:
+        """Unregister a retry loop once it returns or gives up"""
+        self._loops.discard(loop)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """State of each retry loop in flight, longest-running first"""
+        now = time.time()
+        return [
+            {
+                "function": loop.function,
+                "attempt": loop.attempt,
+                "started": loop.started,
+                "wake_up": loop.wake_up,
+                "sleeping": loop.wake_up > now,
+                "exception": loop.exception,
+            }
+            for loop in sorted(tuple(self._loops), key=_started)
+        ]
+
+    def dump(self, file: Optional[TextIO] = None) -> str:
+        """Snapshot as a line of JSON, also written to the file, if any"""
+        data = json.dumps({"time": time.time(), "retries": self.snapshot()})
+        if file is not None:
+            file.write(f"{data}\n")
+            file.flush()
+        return data
+
+    def dump_on_signal(self, signum: int, file: Optional[TextIO] = None) -> None:
+        """
+        Dump a snapshot to the file, standard error by default, whenever
+        the process receives the signal, e.g. ``signal.SIGUSR1``
+        """
+
+        def handler(signum: int, frame: Optional[FrameType]) -> None:
+            self.dump(sys.stderr if file is None else file)
+
+        signal.signal(signum, handler)
+
+
+def _started(loop: RetryLoop) -> float:
+    """When the retry loop started"""
+    return loop.started
+
+
+in_flight = InFlightRetries()
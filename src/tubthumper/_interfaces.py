@@ -1,10 +1,11 @@
 """Interfaces for tubthumper package"""
 
+import asyncio
 import logging
 from typing import Callable
 
 from tubthumper import _types as tub_types
-from tubthumper._retry_factory import RetryConfig
+from tubthumper._retry_factory import RetryConfig, Retrying
 from tubthumper._retry_factory import retry_factory as _retry_factory
 
 RETRY_LIMIT_DEFAULT = float("inf")
@@ -13,14 +14,36 @@ INIT_BACKOFF_DEFAULT = 1
 EXPONENTIAL_DEFAULT = 2
 JITTER_DEFAULT = True
 RERAISE_DEFAULT = False
+EXCEPTIONS_DEFAULT = None
+RETRY_ON_RESULT_DEFAULT = None
 LOG_LEVEL_DEFAULT = logging.WARNING
 LOGGER_DEFAULT = logging.getLogger("tubthumper")
+BUDGET_DEFAULT = None
+DEAD_LETTER_DEFAULT = None
+ON_EVENT_LOOP_DEFAULT: tub_types.OnEventLoop = "warn"
+COALESCE_DEFAULT = False
+CACHE_DEFAULT = None
+BULKHEAD_DEFAULT = None
+DEFER_TO_OUTER_DEFAULT = False
+ENDPOINTS_DEFAULT = None
+BACKOFF_STATE_DEFAULT = None
+SLOW_START_DEFAULT = None
+PRIORITY_DEFAULT = None
+ADAPTIVE_DEFAULT = None
+CLEAR_FRAMES_DEFAULT = False
+KEEP_EXCEPTIONS_DEFAULT = 0
+POLICY_DEFAULT = None
+SPIN_THRESHOLD_DEFAULT = 0
+FINAL_ATTEMPT_MARGIN_DEFAULT = None
+RESUME_DEFAULT = None
+EXPOSE_ATTEMPT_DEFAULT = False
 
 
 def retry(
     func: Callable[tub_types.P, tub_types.T],
     *,
-    exceptions: tub_types.Exceptions,
+    exceptions: tub_types.ExceptionsArg = EXCEPTIONS_DEFAULT,
+    retry_on_result: tub_types.RetryOnResult = RETRY_ON_RESULT_DEFAULT,
     args: tub_types.Args = None,
     kwargs: tub_types.Kwargs = None,
     retry_limit: tub_types.RetryLimit = RETRY_LIMIT_DEFAULT,
@@ -31,6 +54,23 @@ def retry(
     reraise: tub_types.Reraise = RERAISE_DEFAULT,
     log_level: tub_types.LogLevel = LOG_LEVEL_DEFAULT,
     logger: tub_types.Logger = LOGGER_DEFAULT,
+    budget: tub_types.Budget = BUDGET_DEFAULT,
+    dead_letter: tub_types.DeadLetterSink = DEAD_LETTER_DEFAULT,
+    bulkhead: tub_types.BulkheadArg = BULKHEAD_DEFAULT,
+    defer_to_outer: tub_types.DeferToOuter = DEFER_TO_OUTER_DEFAULT,
+    endpoints: tub_types.Endpoints = ENDPOINTS_DEFAULT,
+    backoff_state: tub_types.BackoffStateArg = BACKOFF_STATE_DEFAULT,
+    slow_start: tub_types.SlowStartArg = SLOW_START_DEFAULT,
+    priority: tub_types.Priority = PRIORITY_DEFAULT,
+    adaptive: tub_types.Adaptive = ADAPTIVE_DEFAULT,
+    clear_frames: tub_types.ClearFrames = CLEAR_FRAMES_DEFAULT,
+    keep_exceptions: tub_types.KeepExceptions = KEEP_EXCEPTIONS_DEFAULT,
+    policy: tub_types.PolicyName = POLICY_DEFAULT,
+    spin_threshold: tub_types.Duration = SPIN_THRESHOLD_DEFAULT,
+    final_attempt_margin: tub_types.FinalAttemptMargin = FINAL_ATTEMPT_MARGIN_DEFAULT,
+    resume: tub_types.Resume = RESUME_DEFAULT,
+    expose_attempt: tub_types.ExposeAttempt = EXPOSE_ATTEMPT_DEFAULT,
+    on_event_loop: tub_types.OnEventLoop = ON_EVENT_LOOP_DEFAULT,
 ) -> tub_types.T:
     r"""Call the provided callable with retry logic.
 
@@ -40,7 +80,12 @@ def retry(
         func:
             callable to be called
         exceptions:
-            exceptions to be caught, resulting in a retry
+            exceptions to be caught, resulting in a retry, or an
+            `ExceptionClassifier` for finer control, required unless the
+            ``policy`` provides them
+        retry_on_result:
+            predicate called with each object returned by the callable,
+            resulting in a retry when it returns ``True``
         args:
             positional arguments for the callable
         kwargs:
@@ -52,7 +97,8 @@ def retry(
             duration in seconds after which a retry attempt will
             be prevented by raising an exception, i.e. not a timeout
             stopping long running calls, but rather a mechanism to prevent
-            retry attempts after a certain duration
+            retry attempts after a certain duration, or the `deadline` of
+            an enclosing call with retry logic, if sooner
         init_backoff:
             duration in seconds to sleep before the first retry
         exponential:
@@ -61,15 +107,88 @@ def retry(
             whether or not to "jitter" the backoff duration randomly
         reraise:
             whether or not to re-raise the caught exception instead of
-            a `RetryError` when a retry or time limit is reached
+            a `RetryError` when a retry or time limit is reached, or
+            for a retry due to ``retry_on_result``, return the last
+            returned object
         log_level:
             level for logging caught exceptions, defaults to `logging.WARNING`
         logger:
             logger to log caught exceptions with
+        budget:
+            `RetryBudget` limiting retries to a ratio of calls, and failing
+            calls fast while its circuit breaker is open
+        dead_letter:
+            `DeadLetterStore` recording calls that give up,
+            to be replayed later
+        bulkhead:
+            `Bulkhead` limiting concurrent calls of the callable,
+            and callers sleeping in backoff
+        defer_to_outer:
+            whether or not to raise caught exceptions right away, rather than
+            retrying them, when an enclosing call with retry logic retries them
+        endpoints:
+            `EndpointPool` to choose a different endpoint from for each attempt,
+            retrying right away with another endpoint when one is healthy
+        backoff_state:
+            `BackoffState` sharing backoff durations between calls
+            to the same resource, keyed by their arguments
+        slow_start:
+            `SlowStart` ramping up the share of attempts let through
+            once the dependency recovers from calls giving up
+        priority:
+            process-wide pressure of `load_shedder` at which retries are shed,
+            giving up with a `RetryError`, unless overridden with `priority`,
+            by default never
+        adaptive:
+            `AdaptiveBackoff` replacing ``init_backoff`` & ``exponential`` with
+            a backoff duration & retry concurrency adapting to the success rate
+        clear_frames:
+            whether or not to clear the local variables of the traceback frames
+            of exceptions caught on attempts that are retried, once logged,
+            so large objects they reference can be freed
+        keep_exceptions:
+            number of exceptions caught on the last attempts to keep as the
+            ``exceptions`` of the `RetryError`, raised from an `ExceptionGroup`
+            of them on Python 3.11+
+        policy:
+            name of a policy of `policy_registry` whose values override
+            those provided here, reloadable at runtime
+        spin_threshold:
+            duration in seconds at the end of each backoff of a function,
+            rather than a coroutine function, to spin-wait rather than sleep,
+            for sub-millisecond accuracy at the cost of CPU time
+        final_attempt_margin:
+            rather than giving up when the next backoff would end after the
+            time limit or deadline, clip it to leave this duration in seconds,
+            or the mean duration of attempts so far if longer, for one final
+            attempt. Defaults to ``None``, giving up instead
+        resume:
+            function returning keyword arguments to call a generator function,
+            or async generator function, with when restarting it after a
+            failure, e.g. a resume token or offset, given the last item it
+            yielded. Provide it to retry generator functions, which otherwise
+            are not retried, only yielding items not yielded already, and
+            can't be combined with ``retry_on_result``, ``coalesce``,
+            ``cache``, or ``bulkhead``. Providing it for any other function
+            raises a ``TypeError``
+        expose_attempt:
+            whether or not to expose the attempt in progress to the function
+            through `attempt_context`, always the case with ``endpoints``,
+            so functions that don't ask for it pay nothing for it
+        on_event_loop:
+            what to do when a function, rather than a coroutine function,
+            is about to sleep before retrying within a running event loop,
+            blocking it: ``"warn"`` with a `RuntimeWarning`, ``"raise"`` an
+            `EventLoopBlockingError`, as soon as it's called within a running
+            event loop, before calling the function, or ``"ignore"``. Use
+            `retry_to_thread` to retry a function from async code without
+            blocking the event loop.
 
     Raises:
         RetryError:
-            Raised when a retry or time limit is reached, unless ``reraise=True``
+            Raised when a retry limit, time limit, or retry budget is reached,
+            unless ``reraise=True``, or when the retry budget's circuit breaker
+            is open
 
     Returns:
         the returned object of the callable
@@ -80,6 +199,7 @@ def retry(
         kwargs = {}
     retry_config = RetryConfig(
         exceptions=exceptions,
+        retry_on_result=retry_on_result,
         retry_limit=retry_limit,
         time_limit=time_limit,
         init_backoff=init_backoff,
@@ -88,14 +208,224 @@ def retry(
         reraise=reraise,
         log_level=log_level,
         logger=logger,
+        budget=budget,
+        dead_letter=dead_letter,
+        bulkhead=bulkhead,
+        defer_to_outer=defer_to_outer,
+        endpoints=endpoints,
+        backoff_state=backoff_state,
+        slow_start=slow_start,
+        priority=priority,
+        adaptive=adaptive,
+        clear_frames=clear_frames,
+        keep_exceptions=keep_exceptions,
+        policy=policy,
+        spin_threshold=spin_threshold,
+        final_attempt_margin=final_attempt_margin,
+        resume=resume,
+        expose_attempt=expose_attempt,
+        on_event_loop=on_event_loop,
+        coalesce=False,
+        cache=None,
     )
     retry_func = _retry_factory(func, retry_config)
     return retry_func(*args, **kwargs)  # pyright: ignore [reportCallIssue]
 
 
+async def retry_to_thread(
+    func: Callable[tub_types.P, tub_types.T],
+    *,
+    exceptions: tub_types.ExceptionsArg = EXCEPTIONS_DEFAULT,
+    retry_on_result: tub_types.RetryOnResult = RETRY_ON_RESULT_DEFAULT,
+    args: tub_types.Args = None,
+    kwargs: tub_types.Kwargs = None,
+    retry_limit: tub_types.RetryLimit = RETRY_LIMIT_DEFAULT,
+    time_limit: tub_types.Duration = TIME_LIMIT_DEFAULT,
+    init_backoff: tub_types.Duration = INIT_BACKOFF_DEFAULT,
+    exponential: tub_types.Exponential = EXPONENTIAL_DEFAULT,
+    jitter: tub_types.Jitter = JITTER_DEFAULT,
+    reraise: tub_types.Reraise = RERAISE_DEFAULT,
+    log_level: tub_types.LogLevel = LOG_LEVEL_DEFAULT,
+    logger: tub_types.Logger = LOGGER_DEFAULT,
+    budget: tub_types.Budget = BUDGET_DEFAULT,
+    dead_letter: tub_types.DeadLetterSink = DEAD_LETTER_DEFAULT,
+    bulkhead: tub_types.BulkheadArg = BULKHEAD_DEFAULT,
+    defer_to_outer: tub_types.DeferToOuter = DEFER_TO_OUTER_DEFAULT,
+    endpoints: tub_types.Endpoints = ENDPOINTS_DEFAULT,
+    backoff_state: tub_types.BackoffStateArg = BACKOFF_STATE_DEFAULT,
+    slow_start: tub_types.SlowStartArg = SLOW_START_DEFAULT,
+    priority: tub_types.Priority = PRIORITY_DEFAULT,
+    adaptive: tub_types.Adaptive = ADAPTIVE_DEFAULT,
+    clear_frames: tub_types.ClearFrames = CLEAR_FRAMES_DEFAULT,
+    keep_exceptions: tub_types.KeepExceptions = KEEP_EXCEPTIONS_DEFAULT,
+    policy: tub_types.PolicyName = POLICY_DEFAULT,
+    spin_threshold: tub_types.Duration = SPIN_THRESHOLD_DEFAULT,
+    final_attempt_margin: tub_types.FinalAttemptMargin = FINAL_ATTEMPT_MARGIN_DEFAULT,
+    resume: tub_types.Resume = RESUME_DEFAULT,
+    expose_attempt: tub_types.ExposeAttempt = EXPOSE_ATTEMPT_DEFAULT,
+) -> tub_types.T:
+    r"""Call the provided callable with retry logic in a separate thread, awaiting the result.
+
+    Like `retry`, but for calling blocking functions from async code: the
+    calls and the sleeps between them run in a thread using
+    `asyncio.to_thread`, so the event loop keeps running.
+
+    Args:
+        func:
+            callable to be called
+        exceptions:
+            exceptions to be caught, resulting in a retry, or an
+            `ExceptionClassifier` for finer control, required unless the
+            ``policy`` provides them
+        retry_on_result:
+            predicate called with each object returned by the callable,
+            resulting in a retry when it returns ``True``
+        args:
+            positional arguments for the callable
+        kwargs:
+            keyword arguments for the callable
+        retry_limit:
+            number of retries to perform before raising an exception,
+            e.g. ``retry_limit=1`` results in at most two calls
+        time_limit:
+            duration in seconds after which a retry attempt will
+            be prevented by raising an exception, i.e. not a timeout
+            stopping long running calls, but rather a mechanism to prevent
+            retry attempts after a certain duration, or the `deadline` of
+            an enclosing call with retry logic, if sooner
+        init_backoff:
+            duration in seconds to sleep before the first retry
+        exponential:
+            backoff duration between retries grows by this factor with each retry
+        jitter:
+            whether or not to "jitter" the backoff duration randomly
+        reraise:
+            whether or not to re-raise the caught exception instead of
+            a `RetryError` when a retry or time limit is reached, or
+            for a retry due to ``retry_on_result``, return the last
+            returned object
+        log_level:
+            level for logging caught exceptions, defaults to `logging.WARNING`
+        logger:
+            logger to log caught exceptions with
+        budget:
+            `RetryBudget` limiting retries to a ratio of calls, and failing
+            calls fast while its circuit breaker is open
+        dead_letter:
+            `DeadLetterStore` recording calls that give up,
+            to be replayed later
+        bulkhead:
+            `Bulkhead` limiting concurrent calls of the callable,
+            and callers sleeping in backoff
+        defer_to_outer:
+            whether or not to raise caught exceptions right away, rather than
+            retrying them, when an enclosing call with retry logic retries them
+        endpoints:
+            `EndpointPool` to choose a different endpoint from for each attempt,
+            retrying right away with another endpoint when one is healthy
+        backoff_state:
+            `BackoffState` sharing backoff durations between calls
+            to the same resource, keyed by their arguments
+        slow_start:
+            `SlowStart` ramping up the share of attempts let through
+            once the dependency recovers from calls giving up
+        priority:
+            process-wide pressure of `load_shedder` at which retries are shed,
+            giving up with a `RetryError`, unless overridden with `priority`,
+            by default never
+        adaptive:
+            `AdaptiveBackoff` replacing ``init_backoff`` & ``exponential`` with
+            a backoff duration & retry concurrency adapting to the success rate
+        clear_frames:
+            whether or not to clear the local variables of the traceback frames
+            of exceptions caught on attempts that are retried, once logged,
+            so large objects they reference can be freed
+        keep_exceptions:
+            number of exceptions caught on the last attempts to keep as the
+            ``exceptions`` of the `RetryError`, raised from an `ExceptionGroup`
+            of them on Python 3.11+
+        policy:
+            name of a policy of `policy_registry` whose values override
+            those provided here, reloadable at runtime
+        spin_threshold:
+            duration in seconds at the end of each backoff of a function,
+            rather than a coroutine function, to spin-wait rather than sleep,
+            for sub-millisecond accuracy at the cost of CPU time
+        final_attempt_margin:
+            rather than giving up when the next backoff would end after the
+            time limit or deadline, clip it to leave this duration in seconds,
+            or the mean duration of attempts so far if longer, for one final
+            attempt. Defaults to ``None``, giving up instead
+        resume:
+            function returning keyword arguments to call a generator function,
+            or async generator function, with when restarting it after a
+            failure, e.g. a resume token or offset, given the last item it
+            yielded. Provide it to retry generator functions, which otherwise
+            are not retried, only yielding items not yielded already, and
+            can't be combined with ``retry_on_result``, ``coalesce``,
+            ``cache``, or ``bulkhead``. Providing it for any other function
+            raises a ``TypeError``
+        expose_attempt:
+            whether or not to expose the attempt in progress to the function
+            through `attempt_context`, always the case with ``endpoints``,
+            so functions that don't ask for it pay nothing for it
+
+    Raises:
+        RetryError:
+            Raised when a retry limit, time limit, or retry budget is reached,
+            unless ``reraise=True``, or when the retry budget's circuit breaker
+            is open
+
+    Returns:
+        the returned object of the callable
+    """
+    if args is None:
+        args = ()
+    if kwargs is None:
+        kwargs = {}
+    retry_config = RetryConfig(
+        exceptions=exceptions,
+        retry_on_result=retry_on_result,
+        retry_limit=retry_limit,
+        time_limit=time_limit,
+        init_backoff=init_backoff,
+        exponential=exponential,
+        jitter=jitter,
+        reraise=reraise,
+        log_level=log_level,
+        logger=logger,
+        budget=budget,
+        dead_letter=dead_letter,
+        bulkhead=bulkhead,
+        defer_to_outer=defer_to_outer,
+        endpoints=endpoints,
+        backoff_state=backoff_state,
+        slow_start=slow_start,
+        priority=priority,
+        adaptive=adaptive,
+        clear_frames=clear_frames,
+        keep_exceptions=keep_exceptions,
+        policy=policy,
+        spin_threshold=spin_threshold,
+        final_attempt_margin=final_attempt_margin,
+        resume=resume,
+        expose_attempt=expose_attempt,
+        on_event_loop="ignore",
+        coalesce=False,
+        cache=None,
+    )
+    retry_func = _retry_factory(func, retry_config)
+    return await asyncio.to_thread(
+        retry_func,
+        *args,  # pyright: ignore [reportCallIssue]
+        **kwargs,
+    )
+
+
 def retry_decorator(
     *,
-    exceptions: tub_types.Exceptions,
+    exceptions: tub_types.ExceptionsArg = EXCEPTIONS_DEFAULT,
+    retry_on_result: tub_types.RetryOnResult = RETRY_ON_RESULT_DEFAULT,
     retry_limit: tub_types.RetryLimit = RETRY_LIMIT_DEFAULT,
     time_limit: tub_types.Duration = TIME_LIMIT_DEFAULT,
     init_backoff: tub_types.Duration = INIT_BACKOFF_DEFAULT,
@@ -104,6 +434,25 @@ def retry_decorator(
     reraise: tub_types.Reraise = RERAISE_DEFAULT,
     log_level: tub_types.LogLevel = LOG_LEVEL_DEFAULT,
     logger: tub_types.Logger = LOGGER_DEFAULT,
+    budget: tub_types.Budget = BUDGET_DEFAULT,
+    dead_letter: tub_types.DeadLetterSink = DEAD_LETTER_DEFAULT,
+    bulkhead: tub_types.BulkheadArg = BULKHEAD_DEFAULT,
+    defer_to_outer: tub_types.DeferToOuter = DEFER_TO_OUTER_DEFAULT,
+    endpoints: tub_types.Endpoints = ENDPOINTS_DEFAULT,
+    backoff_state: tub_types.BackoffStateArg = BACKOFF_STATE_DEFAULT,
+    slow_start: tub_types.SlowStartArg = SLOW_START_DEFAULT,
+    priority: tub_types.Priority = PRIORITY_DEFAULT,
+    adaptive: tub_types.Adaptive = ADAPTIVE_DEFAULT,
+    clear_frames: tub_types.ClearFrames = CLEAR_FRAMES_DEFAULT,
+    keep_exceptions: tub_types.KeepExceptions = KEEP_EXCEPTIONS_DEFAULT,
+    policy: tub_types.PolicyName = POLICY_DEFAULT,
+    spin_threshold: tub_types.Duration = SPIN_THRESHOLD_DEFAULT,
+    final_attempt_margin: tub_types.FinalAttemptMargin = FINAL_ATTEMPT_MARGIN_DEFAULT,
+    resume: tub_types.Resume = RESUME_DEFAULT,
+    expose_attempt: tub_types.ExposeAttempt = EXPOSE_ATTEMPT_DEFAULT,
+    on_event_loop: tub_types.OnEventLoop = ON_EVENT_LOOP_DEFAULT,
+    coalesce: tub_types.Coalesce = COALESCE_DEFAULT,
+    cache: tub_types.Cache = CACHE_DEFAULT,
 ) -> Callable[[Callable[tub_types.P, tub_types.T]], Callable[tub_types.P, tub_types.T]]:
     r"""Construct a decorator function for defining a function with built-in retry logic.
 
@@ -111,7 +460,12 @@ def retry_decorator(
 
     Args:
         exceptions:
-            exceptions to be caught, resulting in a retry
+            exceptions to be caught, resulting in a retry, or an
+            `ExceptionClassifier` for finer control, required unless the
+            ``policy`` provides them
+        retry_on_result:
+            predicate called with each object returned by the callable,
+            resulting in a retry when it returns ``True``
         retry_limit:
             number of retries to perform before raising an exception,
             e.g. ``retry_limit=1`` results in at most two calls
@@ -119,7 +473,8 @@ def retry_decorator(
             duration in seconds after which a retry attempt will
             be prevented by raising an exception, i.e. not a timeout
             stopping long running calls, but rather a mechanism to prevent
-            retry attempts after a certain duration
+            retry attempts after a certain duration, or the `deadline` of
+            an enclosing call with retry logic, if sooner
         init_backoff:
             duration in seconds to sleep before the first retry
         exponential:
@@ -128,15 +483,96 @@ def retry_decorator(
             whether or not to "jitter" the backoff duration randomly
         reraise:
             whether or not to re-raise the caught exception instead of
-            a `RetryError` when a retry or time limit is reached
+            a `RetryError` when a retry or time limit is reached, or
+            for a retry due to ``retry_on_result``, return the last
+            returned object
         log_level:
             level for logging caught exceptions, defaults to `logging.WARNING`
         logger:
             logger to log caught exceptions with
+        budget:
+            `RetryBudget` limiting retries to a ratio of calls, and failing
+            calls fast while its circuit breaker is open
+        dead_letter:
+            `DeadLetterStore` recording calls that give up,
+            to be replayed later
+        bulkhead:
+            `Bulkhead` limiting concurrent calls of the callable,
+            and callers sleeping in backoff
+        defer_to_outer:
+            whether or not to raise caught exceptions right away, rather than
+            retrying them, when an enclosing call with retry logic retries them
+        endpoints:
+            `EndpointPool` to choose a different endpoint from for each attempt,
+            retrying right away with another endpoint when one is healthy
+        backoff_state:
+            `BackoffState` sharing backoff durations between calls
+            to the same resource, keyed by their arguments
+        slow_start:
+            `SlowStart` ramping up the share of attempts let through
+            once the dependency recovers from calls giving up
+        priority:
+            process-wide pressure of `load_shedder` at which retries are shed,
+            giving up with a `RetryError`, unless overridden with `priority`,
+            by default never
+        adaptive:
+            `AdaptiveBackoff` replacing ``init_backoff`` & ``exponential`` with
+            a backoff duration & retry concurrency adapting to the success rate
+        clear_frames:
+            whether or not to clear the local variables of the traceback frames
+            of exceptions caught on attempts that are retried, once logged,
+            so large objects they reference can be freed
+        keep_exceptions:
+            number of exceptions caught on the last attempts to keep as the
+            ``exceptions`` of the `RetryError`, raised from an `ExceptionGroup`
+            of them on Python 3.11+
+        policy:
+            name of a policy of `policy_registry` whose values override
+            those provided here, reloadable at runtime
+        spin_threshold:
+            duration in seconds at the end of each backoff of a function,
+            rather than a coroutine function, to spin-wait rather than sleep,
+            for sub-millisecond accuracy at the cost of CPU time
+        final_attempt_margin:
+            rather than giving up when the next backoff would end after the
+            time limit or deadline, clip it to leave this duration in seconds,
+            or the mean duration of attempts so far if longer, for one final
+            attempt. Defaults to ``None``, giving up instead
+        resume:
+            function returning keyword arguments to call a generator function,
+            or async generator function, with when restarting it after a
+            failure, e.g. a resume token or offset, given the last item it
+            yielded. Provide it to retry generator functions, which otherwise
+            are not retried, only yielding items not yielded already, and
+            can't be combined with ``retry_on_result``, ``coalesce``,
+            ``cache``, or ``bulkhead``. Providing it for any other function
+            raises a ``TypeError``
+        expose_attempt:
+            whether or not to expose the attempt in progress to the function
+            through `attempt_context`, always the case with ``endpoints``,
+            so functions that don't ask for it pay nothing for it
+        on_event_loop:
+            what to do when a function, rather than a coroutine function,
+            is about to sleep before retrying within a running event loop,
+            blocking it: ``"warn"`` with a `RuntimeWarning`, ``"raise"`` an
+            `EventLoopBlockingError`, as soon as it's called within a running
+            event loop, before calling the function, or ``"ignore"``. Use
+            `retry_to_thread` to retry a function from async code without
+            blocking the event loop.
+        coalesce:
+            whether or not concurrent calls with equal arguments, which must
+            be hashable, share a single execution with retry logic, all
+            receiving its returned object or raised exception, or a function
+            called with each call's arguments returning its key
+        cache:
+            `ResultCache` returning recently returned objects without calling
+            the callable, and returning stale ones when retries give up
 
     Raises:
         RetryError:
-            Raised when a retry or time limit is reached, unless ``reraise=True``
+            Raised when a retry limit, time limit, or retry budget is reached,
+            unless ``reraise=True``, or when the retry budget's circuit breaker
+            is open
 
     Returns:
         a decorator function that, when used as such,
@@ -149,6 +585,7 @@ def retry_decorator(
     ) -> Callable[tub_types.P, tub_types.T]:
         retry_config = RetryConfig(
             exceptions=exceptions,
+            retry_on_result=retry_on_result,
             retry_limit=retry_limit,
             time_limit=time_limit,
             init_backoff=init_backoff,
@@ -157,6 +594,25 @@ def retry_decorator(
             reraise=reraise,
             log_level=log_level,
             logger=logger,
+            budget=budget,
+            dead_letter=dead_letter,
+            bulkhead=bulkhead,
+            defer_to_outer=defer_to_outer,
+            endpoints=endpoints,
+            backoff_state=backoff_state,
+            slow_start=slow_start,
+            priority=priority,
+            adaptive=adaptive,
+            clear_frames=clear_frames,
+            keep_exceptions=keep_exceptions,
+            policy=policy,
+            spin_threshold=spin_threshold,
+            final_attempt_margin=final_attempt_margin,
+            resume=resume,
+            expose_attempt=expose_attempt,
+            on_event_loop=on_event_loop,
+            coalesce=coalesce,
+            cache=cache,
         )
         return _retry_factory(func, retry_config)
 
@@ -166,7 +622,8 @@ def retry_decorator(
 def retry_factory(
     func: Callable[tub_types.P, tub_types.T],
     *,
-    exceptions: tub_types.Exceptions,
+    exceptions: tub_types.ExceptionsArg = EXCEPTIONS_DEFAULT,
+    retry_on_result: tub_types.RetryOnResult = RETRY_ON_RESULT_DEFAULT,
     retry_limit: tub_types.RetryLimit = RETRY_LIMIT_DEFAULT,
     time_limit: tub_types.Duration = TIME_LIMIT_DEFAULT,
     init_backoff: tub_types.Duration = INIT_BACKOFF_DEFAULT,
@@ -175,6 +632,25 @@ def retry_factory(
     reraise: tub_types.Reraise = RERAISE_DEFAULT,
     log_level: tub_types.LogLevel = LOG_LEVEL_DEFAULT,
     logger: tub_types.Logger = LOGGER_DEFAULT,
+    budget: tub_types.Budget = BUDGET_DEFAULT,
+    dead_letter: tub_types.DeadLetterSink = DEAD_LETTER_DEFAULT,
+    bulkhead: tub_types.BulkheadArg = BULKHEAD_DEFAULT,
+    defer_to_outer: tub_types.DeferToOuter = DEFER_TO_OUTER_DEFAULT,
+    endpoints: tub_types.Endpoints = ENDPOINTS_DEFAULT,
+    backoff_state: tub_types.BackoffStateArg = BACKOFF_STATE_DEFAULT,
+    slow_start: tub_types.SlowStartArg = SLOW_START_DEFAULT,
+    priority: tub_types.Priority = PRIORITY_DEFAULT,
+    adaptive: tub_types.Adaptive = ADAPTIVE_DEFAULT,
+    clear_frames: tub_types.ClearFrames = CLEAR_FRAMES_DEFAULT,
+    keep_exceptions: tub_types.KeepExceptions = KEEP_EXCEPTIONS_DEFAULT,
+    policy: tub_types.PolicyName = POLICY_DEFAULT,
+    spin_threshold: tub_types.Duration = SPIN_THRESHOLD_DEFAULT,
+    final_attempt_margin: tub_types.FinalAttemptMargin = FINAL_ATTEMPT_MARGIN_DEFAULT,
+    resume: tub_types.Resume = RESUME_DEFAULT,
+    expose_attempt: tub_types.ExposeAttempt = EXPOSE_ATTEMPT_DEFAULT,
+    on_event_loop: tub_types.OnEventLoop = ON_EVENT_LOOP_DEFAULT,
+    coalesce: tub_types.Coalesce = COALESCE_DEFAULT,
+    cache: tub_types.Cache = CACHE_DEFAULT,
 ) -> Callable[tub_types.P, tub_types.T]:
     r"""Construct a function with built-in retry logic given a callable to retry.
 
@@ -184,7 +660,12 @@ def retry_factory(
         func:
             callable to be called
         exceptions:
-            exceptions to be caught, resulting in a retry
+            exceptions to be caught, resulting in a retry, or an
+            `ExceptionClassifier` for finer control, required unless the
+            ``policy`` provides them
+        retry_on_result:
+            predicate called with each object returned by the callable,
+            resulting in a retry when it returns ``True``
         retry_limit:
             number of retries to perform before raising an exception,
             e.g. ``retry_limit=1`` results in at most two calls
@@ -192,7 +673,8 @@ def retry_factory(
             duration in seconds after which a retry attempt will
             be prevented by raising an exception, i.e. not a timeout
             stopping long running calls, but rather a mechanism to prevent
-            retry attempts after a certain duration
+            retry attempts after a certain duration, or the `deadline` of
+            an enclosing call with retry logic, if sooner
         init_backoff:
             duration in seconds to sleep before the first retry
         exponential:
@@ -201,15 +683,96 @@ def retry_factory(
             whether or not to "jitter" the backoff duration randomly
         reraise:
             whether or not to re-raise the caught exception instead of
-            a `RetryError` when a retry or time limit is reached
+            a `RetryError` when a retry or time limit is reached, or
+            for a retry due to ``retry_on_result``, return the last
+            returned object
         log_level:
             level for logging caught exceptions, defaults to `logging.WARNING`
         logger:
             logger to log caught exceptions with
+        budget:
+            `RetryBudget` limiting retries to a ratio of calls, and failing
+            calls fast while its circuit breaker is open
+        dead_letter:
+            `DeadLetterStore` recording calls that give up,
+            to be replayed later
+        bulkhead:
+            `Bulkhead` limiting concurrent calls of the callable,
+            and callers sleeping in backoff
+        defer_to_outer:
+            whether or not to raise caught exceptions right away, rather than
+            retrying them, when an enclosing call with retry logic retries them
+        endpoints:
+            `EndpointPool` to choose a different endpoint from for each attempt,
+            retrying right away with another endpoint when one is healthy
+        backoff_state:
+            `BackoffState` sharing backoff durations between calls
+            to the same resource, keyed by their arguments
+        slow_start:
+            `SlowStart` ramping up the share of attempts let through
+            once the dependency recovers from calls giving up
+        priority:
+            process-wide pressure of `load_shedder` at which retries are shed,
+            giving up with a `RetryError`, unless overridden with `priority`,
+            by default never
+        adaptive:
+            `AdaptiveBackoff` replacing ``init_backoff`` & ``exponential`` with
+            a backoff duration & retry concurrency adapting to the success rate
+        clear_frames:
+            whether or not to clear the local variables of the traceback frames
+            of exceptions caught on attempts that are retried, once logged,
+            so large objects they reference can be freed
+        keep_exceptions:
+            number of exceptions caught on the last attempts to keep as the
+            ``exceptions`` of the `RetryError`, raised from an `ExceptionGroup`
+            of them on Python 3.11+
+        policy:
+            name of a policy of `policy_registry` whose values override
+            those provided here, reloadable at runtime
+        spin_threshold:
+            duration in seconds at the end of each backoff of a function,
+            rather than a coroutine function, to spin-wait rather than sleep,
+            for sub-millisecond accuracy at the cost of CPU time
+        final_attempt_margin:
+            rather than giving up when the next backoff would end after the
+            time limit or deadline, clip it to leave this duration in seconds,
+            or the mean duration of attempts so far if longer, for one final
+            attempt. Defaults to ``None``, giving up instead
+        resume:
+            function returning keyword arguments to call a generator function,
+            or async generator function, with when restarting it after a
+            failure, e.g. a resume token or offset, given the last item it
+            yielded. Provide it to retry generator functions, which otherwise
+            are not retried, only yielding items not yielded already, and
+            can't be combined with ``retry_on_result``, ``coalesce``,
+            ``cache``, or ``bulkhead``. Providing it for any other function
+            raises a ``TypeError``
+        expose_attempt:
+            whether or not to expose the attempt in progress to the function
+            through `attempt_context`, always the case with ``endpoints``,
+            so functions that don't ask for it pay nothing for it
+        on_event_loop:
+            what to do when a function, rather than a coroutine function,
+            is about to sleep before retrying within a running event loop,
+            blocking it: ``"warn"`` with a `RuntimeWarning`, ``"raise"`` an
+            `EventLoopBlockingError`, as soon as it's called within a running
+            event loop, before calling the function, or ``"ignore"``. Use
+            `retry_to_thread` to retry a function from async code without
+            blocking the event loop.
+        coalesce:
+            whether or not concurrent calls with equal arguments, which must
+            be hashable, share a single execution with retry logic, all
+            receiving its returned object or raised exception, or a function
+            called with each call's arguments returning its key
+        cache:
+            `ResultCache` returning recently returned objects without calling
+            the callable, and returning stale ones when retries give up
 
     Raises:
         RetryError:
-            Raised when a retry or time limit is reached, unless ``reraise=True``
+            Raised when a retry limit, time limit, or retry budget is reached,
+            unless ``reraise=True``, or when the retry budget's circuit breaker
+            is open
 
     Returns:
         a function that looks like the callable provided,
@@ -217,6 +780,7 @@ def retry_factory(
     """
     retry_config = RetryConfig(
         exceptions=exceptions,
+        retry_on_result=retry_on_result,
         retry_limit=retry_limit,
         time_limit=time_limit,
         init_backoff=init_backoff,
@@ -225,5 +789,181 @@ def retry_factory(
         reraise=reraise,
         log_level=log_level,
         logger=logger,
+        budget=budget,
+        dead_letter=dead_letter,
+        bulkhead=bulkhead,
+        defer_to_outer=defer_to_outer,
+        endpoints=endpoints,
+        backoff_state=backoff_state,
+        slow_start=slow_start,
+        priority=priority,
+        adaptive=adaptive,
+        clear_frames=clear_frames,
+        keep_exceptions=keep_exceptions,
+        policy=policy,
+        spin_threshold=spin_threshold,
+        final_attempt_margin=final_attempt_margin,
+        resume=resume,
+        expose_attempt=expose_attempt,
+        on_event_loop=on_event_loop,
+        coalesce=coalesce,
+        cache=cache,
     )
     return _retry_factory(func, retry_config)
+
+
+def retrying(
+    *,
+    exceptions: tub_types.ExceptionsArg = EXCEPTIONS_DEFAULT,
+    retry_limit: tub_types.RetryLimit = RETRY_LIMIT_DEFAULT,
+    time_limit: tub_types.Duration = TIME_LIMIT_DEFAULT,
+    init_backoff: tub_types.Duration = INIT_BACKOFF_DEFAULT,
+    exponential: tub_types.Exponential = EXPONENTIAL_DEFAULT,
+    jitter: tub_types.Jitter = JITTER_DEFAULT,
+    reraise: tub_types.Reraise = RERAISE_DEFAULT,
+    log_level: tub_types.LogLevel = LOG_LEVEL_DEFAULT,
+    logger: tub_types.Logger = LOGGER_DEFAULT,
+    budget: tub_types.Budget = BUDGET_DEFAULT,
+    defer_to_outer: tub_types.DeferToOuter = DEFER_TO_OUTER_DEFAULT,
+    endpoints: tub_types.Endpoints = ENDPOINTS_DEFAULT,
+    backoff_state: tub_types.BackoffStateArg = BACKOFF_STATE_DEFAULT,
+    slow_start: tub_types.SlowStartArg = SLOW_START_DEFAULT,
+    priority: tub_types.Priority = PRIORITY_DEFAULT,
+    adaptive: tub_types.Adaptive = ADAPTIVE_DEFAULT,
+    clear_frames: tub_types.ClearFrames = CLEAR_FRAMES_DEFAULT,
+    keep_exceptions: tub_types.KeepExceptions = KEEP_EXCEPTIONS_DEFAULT,
+    policy: tub_types.PolicyName = POLICY_DEFAULT,
+    spin_threshold: tub_types.Duration = SPIN_THRESHOLD_DEFAULT,
+    final_attempt_margin: tub_types.FinalAttemptMargin = FINAL_ATTEMPT_MARGIN_DEFAULT,
+    expose_attempt: tub_types.ExposeAttempt = EXPOSE_ATTEMPT_DEFAULT,
+    on_event_loop: tub_types.OnEventLoop = ON_EVENT_LOOP_DEFAULT,
+) -> Retrying:
+    r"""Construct an iterable of attempts of a block of code with built-in retry logic.
+
+    For usage examples, see `here <index.html#usage>`__.
+
+    Args:
+        exceptions:
+            exceptions to be caught, resulting in a retry, or an
+            `ExceptionClassifier` for finer control, required unless the
+            ``policy`` provides them
+        retry_limit:
+            number of retries to perform before raising an exception,
+            e.g. ``retry_limit=1`` results in at most two calls
+        time_limit:
+            duration in seconds after which a retry attempt will
+            be prevented by raising an exception, i.e. not a timeout
+            stopping long running calls, but rather a mechanism to prevent
+            retry attempts after a certain duration, or the `deadline` of
+            an enclosing call with retry logic, if sooner
+        init_backoff:
+            duration in seconds to sleep before the first retry
+        exponential:
+            backoff duration between retries grows by this factor with each retry
+        jitter:
+            whether or not to "jitter" the backoff duration randomly
+        reraise:
+            whether or not to re-raise the caught exception instead of
+            a `RetryError` when a retry or time limit is reached
+        log_level:
+            level for logging caught exceptions, defaults to `logging.WARNING`
+        logger:
+            logger to log caught exceptions with
+        budget:
+            `RetryBudget` limiting retries to a ratio of calls, and failing
+            calls fast while its circuit breaker is open
+        defer_to_outer:
+            whether or not to raise caught exceptions right away, rather than
+            retrying them, when an enclosing call with retry logic retries them
+        endpoints:
+            `EndpointPool` to choose a different endpoint from for each attempt,
+            read with `attempt_context`, retrying right away with another
+            endpoint when one is healthy
+        backoff_state:
+            `BackoffState` sharing backoff durations with other code
+            calling the same resource
+        slow_start:
+            `SlowStart` ramping up the share of attempts let through
+            once the dependency recovers from calls giving up
+        priority:
+            process-wide pressure of `load_shedder` at which retries are shed,
+            giving up with a `RetryError`, unless overridden with `priority`,
+            by default never
+        adaptive:
+            `AdaptiveBackoff` replacing ``init_backoff`` & ``exponential`` with
+            a backoff duration & retry concurrency adapting to the success rate
+        clear_frames:
+            whether or not to clear the local variables of the traceback frames
+            of exceptions caught on attempts that are retried, once logged,
+            so large objects they reference can be freed
+        keep_exceptions:
+            number of exceptions caught on the last attempts to keep as the
+            ``exceptions`` of the `RetryError`, raised from an `ExceptionGroup`
+            of them on Python 3.11+
+        policy:
+            name of a policy of `policy_registry` whose values override
+            those provided here, reloadable at runtime
+        spin_threshold:
+            duration in seconds at the end of each backoff when iterating with
+            ``for``, rather than ``async for``, to spin-wait rather than sleep,
+            for sub-millisecond accuracy at the cost of CPU time
+        final_attempt_margin:
+            rather than giving up when the next backoff would end after the
+            time limit or deadline, clip it to leave this duration in seconds,
+            or the mean duration of attempts so far if longer, for one final
+            attempt. Defaults to ``None``, giving up instead
+        expose_attempt:
+            whether or not to expose the attempt in progress to the block of code
+            through `attempt_context`, always the case with ``endpoints``,
+            so blocks that don't ask for it pay nothing for it
+        on_event_loop:
+            what to do when iterating with ``for``, rather than ``async for``,
+            is about to sleep before retrying within a running event loop,
+            blocking it: ``"warn"`` with a `RuntimeWarning`, ``"raise"`` an
+            `EventLoopBlockingError`, or ``"ignore"``. Use ``async for`` to retry
+            a block of code from async code without blocking the event loop.
+
+    Raises:
+        RetryError:
+            Raised when a retry limit, time limit, or retry budget is reached,
+            unless ``reraise=True``, or when the retry budget's circuit breaker
+            is open
+
+    Returns:
+        an iterable of attempts, to iterate over with ``for``, or ``async for``
+        from a coroutine, entering each attempt with ``with`` around the block
+        of code to retry
+    """
+    return Retrying._from_config(
+        RetryConfig(
+            exceptions=exceptions,
+            retry_on_result=None,
+            retry_limit=retry_limit,
+            time_limit=time_limit,
+            init_backoff=init_backoff,
+            exponential=exponential,
+            jitter=jitter,
+            reraise=reraise,
+            log_level=log_level,
+            logger=logger,
+            budget=budget,
+            dead_letter=None,
+            bulkhead=None,
+            defer_to_outer=defer_to_outer,
+            endpoints=endpoints,
+            backoff_state=backoff_state,
+            slow_start=slow_start,
+            priority=priority,
+            adaptive=adaptive,
+            clear_frames=clear_frames,
+            keep_exceptions=keep_exceptions,
+            policy=policy,
+            spin_threshold=spin_threshold,
+            final_attempt_margin=final_attempt_margin,
+            resume=None,
+            expose_attempt=expose_attempt,
+            on_event_loop=on_event_loop,
+            coalesce=False,
+            cache=None,
+        )
+    )
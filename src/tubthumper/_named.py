@@ -0,0 +1,32 @@
+"""Module defining the named function, sharing instances by name across the process"""
+
+import threading
+from typing import Any, Dict, Tuple, Type
+
+from tubthumper import _types as tub_types
+
+_instances: Dict[Tuple[type, str], Any] = {}
+_lock = threading.Lock()
+
+
+def named(cls: Type[tub_types.T], name: str, **config: Any) -> tub_types.T:
+    """
+    Return the instance of the class shared under this name, creating it
+    with the config provided, other than None, if it doesn't exist yet,
+    raising a ValueError if it exists with a different config
+    """
+    config = {key: value for key, value in config.items() if value is not None}
+    with _lock:
+        try:
+            instance = _instances[cls, name]
+        except KeyError:
+            instance = _instances[cls, name] = cls(**config)
+            return instance
+    for key, value in config.items():
+        current = getattr(instance, key)
+        if current != value:
+            raise ValueError(
+                f"{cls.__name__} {name!r} already exists with {key}={current!r}, "
+                f"not {value!r}"
+            )
+    return instance
@@ -0,0 +1,202 @@
+"""Module defining the PolicyRegistry class"""
+
+import dataclasses
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import weakref
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Tuple, Type, Union
+
+from tubthumper import _types as tub_types
+from tubthumper._classifier import ExceptionClassifier
+
+if sys.version_info >= (3, 11):
+    import tomllib
+
+_FIELDS = {
+    "retry_limit": (int, float),
+    "time_limit": (int, float),
+    "init_backoff": (int, float),
+    "exponential": (int, float),
+    "jitter": (bool,),
+    "reraise": (bool,),
+    "log_level": (int,),
+}
+
+
+class _Slot:
+    """
+    Overrides of a named policy, swapped as a whole on reload,
+    and the fields calls rely on it to provide
+    """
+
+    __slots__ = ("overrides", "requirements")
+
+    overrides: Mapping[str, Any]
+    requirements: "weakref.WeakKeyDictionary[Callable[[], Any], Tuple[str, ...]]"
+
+    def __init__(self) -> None:
+        self.overrides = MappingProxyType({})
+        self.requirements = weakref.WeakKeyDictionary()
+
+    def missing(self, overrides: Mapping[str, Any]) -> List[str]:
+        """Fields calls rely on the policy to provide missing from these overrides"""
+        required = {field for fields in self.requirements.values() for field in fields}
+        return sorted(required.difference(overrides))
+
+
+class PolicyRegistry:
+    r"""Registry of named policies, reloadable at runtime
+
+    Provide the name of a policy as the ``policy`` argument of any of
+    ``tubthumper``'s interfaces to override the ``exceptions``,
+    ``retry_limit``, ``time_limit``, ``init_backoff``, ``exponential``,
+    ``jitter``, ``reraise``, and ``log_level`` of the function with retry
+    logic with the values of the policy in the process-wide registry,
+    `policy_registry`, the ``exceptions`` argument being optional when
+    the policy provides them. Reloading the policies with `update` or
+    `load` applies to calls already wrapped, each call seeing either all
+    of the old or all of the new values of its policy, at the cost of a
+    single attribute read. Reloading raises a ``ValueError``, keeping the
+    policies as they were, if a policy stops providing the ``exceptions``
+    of functions relying on it for them.
+
+    A policy's ``exceptions`` are an exception class, an `ExceptionClassifier`,
+    or a list of exception classes or their qualified names, e.g.
+    ``["ConnectionError", "urllib.error.URLError"]`` in a JSON or TOML file.
+    """
+
+    _slots: Dict[str, _Slot]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def policies(self) -> Dict[str, Dict[str, Any]]:
+        """Values of each policy"""
+        with self._lock:
+            return {name: dict(slot.overrides) for name, slot in self._slots.items()}
+
+    def update(self, policies: Mapping[str, Mapping[str, Any]]) -> None:
+        """
+        Replace the policies with these, e.g. fetched from an API, validating
+        all of them first, and resetting policies missing from them
+        """
+        validated = {
+            name: MappingProxyType(_validate(name, values))
+            for name, values in policies.items()
+        }
+        with self._lock:
+            for name, slot in self._slots.items():
+                missing = slot.missing(validated.get(name, {}))
+                if missing:
+                    raise ValueError(
+                        f"Policy {name!r} doesn't provide the {', '.join(missing)} "
+                        "of functions relying on it"
+                    )
+            for name, slot in self._slots.items():
+                if name not in validated:
+                    slot.overrides = MappingProxyType({})
+            for name, overrides in validated.items():
+                self._slot(name).overrides = overrides
+
+    def load(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """
+        Replace the policies with those of a JSON file, or TOML file on Python 3.11+,
+        with a table of values per policy
+        """
+        if sys.version_info >= (3, 11) and os.fspath(path).endswith(".toml"):
+            with open(path, "rb") as file:
+                policies = tomllib.load(file)
+        else:
+            with open(path, encoding="utf-8") as file:
+                policies = json.load(file)
+        self.update(policies)
+
+    def resolver(
+        self, name: str, config: tub_types.T, requires: Tuple[str, ...] = ()
+    ) -> Callable[[], tub_types.T]:
+        """
+        Return a function returning the config, a dataclass, with
+        the current values of the policy, rebuilt only when they change,
+        reloads having to keep providing the fields it requires
+        """
+        with self._lock:
+            slot = self._slot(name)
+        cached = (slot.overrides, dataclasses.replace(config, **slot.overrides))  # type: ignore
+
+        def resolve() -> tub_types.T:
+            nonlocal cached
+            overrides = slot.overrides
+            current = cached
+            if current[0] is not overrides:
+                current = cached = (
+                    overrides,
+                    dataclasses.replace(config, **overrides),  # type: ignore
+                )
+            return current[1]
+
+        if requires:
+            with self._lock:
+                slot.requirements[resolve] = requires
+        return resolve
+
+    def _slot(self, name: str) -> _Slot:
+        """Return the slot of the policy, creating it if it doesn't exist yet"""
+        try:
+            return self._slots[name]
+        except KeyError:
+            slot = self._slots[name] = _Slot()
+            return slot
+
+
+def _validate(name: str, values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return the values of a policy, raising a ValueError if any is invalid"""
+    validated: Dict[str, Any] = {}
+    for field, value in values.items():
+        if field == "exceptions":
+            validated[field] = _exceptions(name, value)
+            continue
+        types = _FIELDS.get(field)
+        if types is None:
+            raise ValueError(f"Unknown field {field!r} of policy {name!r}")
+        if field == "log_level" and isinstance(value, str):
+            validated[field] = logging.getLevelName(value.upper())
+        else:
+            validated[field] = value
+        if not isinstance(validated[field], types) or (
+            isinstance(value, bool) and bool not in types
+        ):
+            raise ValueError(f"Invalid {field} {value!r} of policy {name!r}")
+    return validated
+
+
+def _exceptions(name: str, value: Any) -> ExceptionClassifier:
+    """Return the exceptions of a policy as a classifier, importing those named"""
+    if isinstance(value, ExceptionClassifier):
+        return value
+    items: Any = value if isinstance(value, (list, tuple)) else (value,)
+    return ExceptionClassifier(tuple(_exception(name, item) for item in items))
+
+
+def _exception(name: str, value: Any) -> Type[Exception]:
+    """Return an exception class of a policy, importing it if given its qualified name"""
+    if isinstance(value, str):
+        module, _, attribute = value.rpartition(".")
+        try:
+            value = getattr(importlib.import_module(module or "builtins"), attribute)
+        except (ImportError, AttributeError):
+            raise ValueError(
+                f"Unknown exception {value!r} of policy {name!r}"
+            ) from None
+    if not isinstance(value, type) or not issubclass(value, Exception):
+        raise ValueError(f"Invalid exceptions {value!r} of policy {name!r}")
+    return value
+
+
+policy_registry = PolicyRegistry()
@@ -1,24 +1,146 @@
 """Module defining the retry_factory function"""
 
 import asyncio
+import builtins
+import contextvars
+import inspect
+import logging
+import os
 import random
+import sys
 import time
-from dataclasses import dataclass
+import traceback
+import warnings
+from collections import deque
+from dataclasses import dataclass, field
 from functools import update_wrapper
-from typing import Awaitable, Callable, overload
+from types import FrameType, TracebackType
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Hashable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    NoReturn,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    overload,
+)
 
 from tubthumper import _types as tub_types
+from tubthumper._cache import async_cached, sync_cached
+from tubthumper._classifier import (
+    DEFAULT_POLICY,
+    ExceptionClassifier,
+    ExceptionPolicy,
+    as_classifier,
+)
+from tubthumper._context import AttemptContext, Scope, call_priority, scope
+from tubthumper._dead_letter import DeadLetter, qualified_name
+from tubthumper._endpoints import EndpointPool
+from tubthumper._in_flight import RetryLoop, in_flight
+from tubthumper._policies import policy_registry
+from tubthumper._shedding import load_shedder
+from tubthumper._singleflight import async_coalesce, key_function, sync_coalesce
+
+MAX_RECORDS = 128
+RETRYING_QUALNAME = "tubthumper.retrying"
+_PACKAGE_DIR = os.path.dirname(__file__) + os.sep
+
+
+class AttemptRecord(NamedTuple):
+    """Compact record of a failed attempt of a call with retry logic"""
+
+    duration: tub_types.Duration
+    """duration in seconds of the attempt"""
+    backoff: tub_types.Duration
+    """duration in seconds slept after the attempt, 0 for the last one"""
+    exception: Optional[Type[BaseException]]
+    """class of the exception caught, or ``None`` for a retried result"""
 
 
 class RetryError(Exception):
-    """Exception raised when a retry or time limit is reached"""
+    r"""Exception raised when a retry or time limit is reached
+
+    Args:
+        message:
+            why the call gave up
+        attempts:
+            number of attempts made
+        elapsed:
+            duration in seconds from the start of the call until it gave up
+        slept:
+            total duration in seconds slept in backoff
+        limits:
+            configured ``retry_limit`` & ``time_limit`` of the call
+        records:
+            `AttemptRecord` of each failed attempt, up to the last 128
+        exceptions:
+            exceptions caught on the last attempts, as many as the
+            ``keep_exceptions`` argument of the function with retry logic
+    """
+
+    __slots__ = ("attempts", "elapsed", "exceptions", "limits", "records", "slept")
+
+    attempts: int
+    elapsed: tub_types.Duration
+    slept: tub_types.Duration
+    limits: Dict[str, float]
+    records: Tuple[AttemptRecord, ...]
+    exceptions: Tuple[Exception, ...]
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        attempts: int = 0,
+        elapsed: tub_types.Duration = 0.0,
+        slept: tub_types.Duration = 0.0,
+        limits: Optional[Dict[str, float]] = None,
+        records: Tuple[AttemptRecord, ...] = (),
+        exceptions: Tuple[Exception, ...] = (),
+    ):
+        super().__init__(message)
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.slept = slept
+        self.limits = {} if limits is None else limits
+        self.records = records
+        self.exceptions = exceptions
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Keep the slots when pickling or copying, which only keep args by default"""
+        return (
+            type(self),
+            self.args,
+            {name: getattr(self, name) for name in RetryError.__slots__},
+        )
+
+
+class EventLoopBlockingError(RuntimeError):
+    r"""Exception raised when a function with retry logic would block a running event loop
+
+    Raised with ``on_event_loop="raise"`` as soon as the function is called
+    within a running event loop, before calling it. Use `retry_to_thread` to
+    retry a function from async code without blocking the event loop.
+    """
 
 
 @dataclass(frozen=True)
 class RetryConfig:
     """Config class for retry logic"""
 
-    exceptions: tub_types.Exceptions
+    exceptions: tub_types.ExceptionsArg
+    retry_on_result: tub_types.RetryOnResult
     retry_limit: tub_types.RetryLimit
     time_limit: tub_types.Duration
     init_backoff: tub_types.Duration
@@ -27,72 +149,574 @@ class RetryConfig:
     reraise: tub_types.Reraise
     log_level: tub_types.LogLevel
     logger: tub_types.Logger
+    budget: tub_types.Budget
+    dead_letter: tub_types.DeadLetterSink
+    on_event_loop: tub_types.OnEventLoop
+    coalesce: tub_types.Coalesce
+    cache: tub_types.Cache
+    bulkhead: tub_types.BulkheadArg
+    defer_to_outer: tub_types.DeferToOuter
+    endpoints: tub_types.Endpoints
+    backoff_state: tub_types.BackoffStateArg
+    slow_start: tub_types.SlowStartArg
+    priority: tub_types.Priority
+    adaptive: tub_types.Adaptive
+    clear_frames: tub_types.ClearFrames
+    keep_exceptions: tub_types.KeepExceptions
+    policy: tub_types.PolicyName
+    spin_threshold: tub_types.Duration
+    final_attempt_margin: tub_types.FinalAttemptMargin
+    resume: tub_types.Resume
+    expose_attempt: tub_types.ExposeAttempt
+    classifier: Optional[ExceptionClassifier] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.exceptions is None and self.policy is None:
+            raise TypeError("exceptions are required without a policy providing them")
+        classifier = None if self.exceptions is None else as_classifier(self.exceptions)
+        object.__setattr__(self, "classifier", classifier)
+
+
+class _Backoff:
+    """Class tracking the retry count and backoff duration of a policy within a call"""
+
+    __slots__ = ("count", "exponential", "jitter", "retry_limit", "unjittered_backoff")
+
+    count: int
+    retry_limit: tub_types.RetryLimit
+    unjittered_backoff: tub_types.Duration
+    exponential: tub_types.Exponential
+    jitter: tub_types.Jitter
+
+    def __init__(self, retry_config: RetryConfig, policy: ExceptionPolicy):
+        self.count = 0
+        self.retry_limit = _override(policy.retry_limit, retry_config.retry_limit)
+        self.unjittered_backoff = _override(
+            policy.init_backoff, retry_config.init_backoff
+        )
+        self.exponential = _override(policy.exponential, retry_config.exponential)
+        self.jitter = _override(policy.jitter, retry_config.jitter)
 
+    def increment(self) -> tub_types.Duration:
+        """Increment the count and backoff duration, returning the backoff to sleep"""
+        self.count += 1
+        backoff = self.unjittered_backoff
+        if self.jitter:
+            backoff *= random.random()
+        self.unjittered_backoff *= self.exponential
+        return backoff
 
-class _RetryHandler:
-    """Class for handling exceptions to be retried"""
 
-    exceptions: tub_types.Exceptions
+class _RetryHandler(Scope):
+    """
+    Class for handling exceptions to be retried within a call,
+    serving as the scope of calls made within it
+    """
+
+    __slots__ = (
+        "_adaptive",
+        "_args",
+        "_attempt_began",
+        "_attempt_start",
+        "_backoff",
+        "_backoff_state",
+        "_backoffs",
+        "_budget",
+        "_bulkhead",
+        "_clipped",
+        "_clock",
+        "_count",
+        "_endpoint",
+        "_endpoints",
+        "_exception",
+        "_failed_at",
+        "_history",
+        "_inherited",
+        "_kwargs",
+        "_loop",
+        "_qualname",
+        "_records",
+        "_retry_config",
+        "_slept",
+        "_slow_start",
+        "_start",
+        "_state_key",
+        "_timeout",
+        "_tried",
+        "classifier",
+    )
+
     _retry_config: RetryConfig
+    classifier: ExceptionClassifier
+    _clock: Callable[[], float]
+    _budget: tub_types.Budget
+    _clipped: bool
+    _bulkhead: tub_types.BulkheadArg
+    _endpoints: tub_types.Endpoints
+    _endpoint: int
+    _tried: Set[int]
+    _backoff_state: tub_types.BackoffStateArg
+    _state_key: Hashable
+    _slow_start: tub_types.SlowStartArg
+    _adaptive: tub_types.Adaptive
+    _attempt_start: float
+    _qualname: str
+    _args: Tuple[Any, ...]
+    _kwargs: Dict[str, Any]
+    _start: float
     _timeout: tub_types.Duration
+    _inherited: bool
     _count: int
+    _exception: Optional[Exception]
+    _history: Optional[Deque[Exception]]
+    _records: Deque[AttemptRecord]
+    _loop: Optional[RetryLoop]
+    _slept: tub_types.Duration
+    _attempt_began: float
+    _failed_at: float
     _backoff: tub_types.Duration
-    _unjittered_backoff: tub_types.Duration
+    _backoffs: Dict[ExceptionPolicy, _Backoff]
 
-    def __init__(self, retry_config: RetryConfig):
-        self.exceptions = retry_config.exceptions
+    def __init__(
+        self,
+        retry_config: RetryConfig,
+        clock: Callable[[], float],
+        qualname: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ):
+        if retry_config.classifier is None:
+            raise ValueError(
+                f"Policy {retry_config.policy!r} doesn't provide the exceptions to retry"
+            )
         self._retry_config = retry_config
+        self.classifier = retry_config.classifier
+        self._clock = clock
+        self._budget = retry_config.budget
+        self._bulkhead = retry_config.bulkhead
+        self._endpoints = retry_config.endpoints
+        if self._endpoints is not None:
+            self._tried = set()
+        self._backoff_state = retry_config.backoff_state
+        if self._backoff_state is not None:
+            self._state_key = self._backoff_state.key(*args, **kwargs)
+        self._slow_start = retry_config.slow_start
+        self._adaptive = retry_config.adaptive
+        self._qualname = qualname
+        self._args = args
+        self._kwargs = kwargs
+        self._count = 0
+        self._exception = None
 
-        self._calc_backoff: Callable[[], tub_types.Duration]
-        if self._retry_config.jitter:
-            self._calc_backoff = lambda: self._unjittered_backoff * random.random()
-        else:
-            self._calc_backoff = lambda: self._unjittered_backoff
+    def start(self) -> "contextvars.Token[Optional[Scope]]":
+        """
+        Start the retry handler's timer, failing fast if the circuit breaker is open,
+        and enter the scope of calls made within the call, returning its token
+        """
+        self._start = self._attempt_began = self._clock()
+        self._timeout = self._start + self._retry_config.time_limit
+        if self._budget is not None and not self._budget.start():
+            if self._slow_start is not None:
+                self._slow_start.trip()
+            self._give_up(None, False, "Circuit breaker open")
+        # scope deadlines are in monotonic time, e.g. not in the event loop's time
+        offset = (
+            0.0 if self._clock is time.monotonic else self._start - time.monotonic()
+        )
+        parent = self.parent = scope.get()
+        self._inherited = (
+            parent is not None and parent.deadline + offset < self._timeout
+        )
+        if parent is not None and self._inherited:
+            self._timeout = parent.deadline + offset
+        self.deadline = self._timeout - offset
+        self.classify = self.classifier.classify
+        expose = self._retry_config.expose_attempt or self._endpoints is not None
+        self.attempt = self.snapshot if expose else None
+        return scope.set(self)
 
-    def start(self) -> None:
-        """Initialize the retry handler's timeout, count, and backoff"""
-        self._timeout = time.perf_counter() + self._retry_config.time_limit
-        self._count = 0
-        self._unjittered_backoff = self._retry_config.init_backoff
+    def enter(self) -> "contextvars.Token[Optional[Scope]]":
+        """Enter the scope of calls made within the call again, returning its token"""
+        return scope.set(self)
 
-    def handle(self, exc: Exception) -> tub_types.Duration:
+    def leave(self, token: "Optional[contextvars.Token[Optional[Scope]]]") -> None:
+        """Exit the scope of calls made within the call, if in it"""
+        if token is not None:
+            scope.reset(token)
+
+    def finish(self, token: "Optional[contextvars.Token[Optional[Scope]]]") -> None:
+        """Exit the scope of calls made within the call, if in it, and the retry loops in flight"""
+        self.leave(token)
+        if self._count and self._loop is not None:
+            in_flight.unregister(self._loop)
+
+    def snapshot(self) -> AttemptContext:
+        """Snapshot of the attempt in progress"""
+        now = self._clock()
+        return AttemptContext(
+            number=self._count + 1,
+            elapsed=now - self._start,
+            remaining=self._timeout - now,
+            exception=self._exception,
+            endpoint=(
+                None
+                if self._endpoints is None
+                else self._endpoints.endpoints[self._endpoint]
+            ),
+        )
+
+    def before_attempt(self) -> None:
+        """
+        Give up if the slow start ramp doesn't let the next attempt through,
+        otherwise choose its endpoint, starting its timer
+        """
+        if self._slow_start is not None and not self._slow_start.admit():
+            self._give_up(None, False, "Slow start ramping up")
+        if self._endpoints is not None:
+            self._endpoint = self._endpoints.choose(self._tried)
+            self._tried.add(self._endpoint)
+            self._attempt_start = self._clock()
+
+    def succeed(self) -> None:
+        """Record the call returning successfully"""
+        if self._endpoints is not None:
+            self.record_endpoint(self._endpoints, ok=True)
+        if self._backoff_state is not None:
+            self._backoff_state.recover(
+                self._state_key, self._retry_config.init_backoff
+            )
+        if self._slow_start is not None:
+            self._slow_start.recover()
+        if self._adaptive is not None:
+            self._adaptive.record_success()
+
+    def record_endpoint(self, endpoints: EndpointPool, ok: bool) -> None:
+        """Record the latency & outcome of the attempt with the chosen endpoint"""
+        endpoints.record(self._endpoint, self._clock() - self._attempt_start, ok)
+
+    def handle(self, exc: Exception, policy: ExceptionPolicy) -> tub_types.Duration:
         """
         Handles the exception, either:
         (a) raising a RetryError (or the exception provided), or
         (b) returning a backoff duration to sleep, logging the caught exception
         """
-        self._increment()
-        self._check_retry_limit(exc)
-        self._check_time_limit(exc)
+        if (
+            self._retry_config.defer_to_outer
+            and self.parent is not None
+            and self.parent.retries(exc)
+        ):
+            raise exc
+        self._exception = exc
+        backoff = self._increment(policy)
+        if self._history is not None:
+            self._history.append(exc)
+        message = self._check_limits(backoff)
+        self._record(type(exc), message is None)
+        if message is not None:
+            self._give_up(
+                exc, _override(policy.reraise, self._retry_config.reraise), message
+            )
         self._retry_config.logger.log(
-            self._retry_config.log_level,
+            _override(policy.log_level, self._retry_config.log_level),
             f"Function threw exception below on try {self._count}, "
             f"retrying in {self._backoff:n} seconds",
             exc_info=True,
         )
+        if self._retry_config.clear_frames:
+            traceback.clear_frames(exc.__traceback__)
+        return self._backoff
+
+    def handle_result(self, result: object) -> Optional[tub_types.Duration]:
+        """
+        Handles a result to be retried, either:
+        (a) raising a RetryError,
+        (b) returning None when the result should be returned instead, or
+        (c) returning a backoff duration to sleep, logging the result
+        """
+        self._exception = None
+        backoff = self._increment(DEFAULT_POLICY)
+        message = self._check_limits(backoff)
+        self._record(None, message is None)
+        if message is not None:
+            if self._retry_config.reraise:
+                return None
+            self._give_up(None, False, message)
+        self._retry_config.logger.log(
+            self._retry_config.log_level,
+            f"Function returned {result!r} on try {self._count}, "
+            f"retrying in {self._backoff:n} seconds",
+            exc_info=False,
+        )
         return self._backoff
 
-    def _increment(self) -> None:
-        """Increment the retry handler's count and backoff duration"""
+    async def sleep_async(self) -> None:
+        """
+        Sleep in backoff without blocking the event loop, waking up
+        at the loop time of the next attempt
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        handle = loop.call_at(self._attempt_began, _wake_up, future)
+        try:
+            await future
+        finally:
+            handle.cancel()
+            self.end_backoff()
+
+    def sleep(self, backoff: tub_types.Duration) -> None:
+        """Sleep in backoff, warning or raising first if it would block a running event loop"""
+        try:
+            on_event_loop = self._retry_config.on_event_loop
+            if on_event_loop != "ignore" and backoff:
+                _check_event_loop(on_event_loop)
+            spin_threshold = self._retry_config.spin_threshold
+            if spin_threshold:
+                _precise_sleep(backoff, spin_threshold)
+            else:
+                time.sleep(backoff)
+        finally:
+            self.end_backoff()
+
+    def end_backoff(self) -> None:
+        """Count the caller done sleeping in backoff"""
+        load_shedder.end_backoff()
+        if self._bulkhead is not None:
+            self._bulkhead.end_backoff()
+        if self._adaptive is not None:
+            self._adaptive.end_backoff()
+
+    def reject(self, message: str) -> NoReturn:
+        """Give up on the call without attempting it again"""
+        self._give_up(None, False, message)
+
+    def _record(self, exception: Optional[Type[BaseException]], retrying: bool) -> None:
+        """Record the failed attempt, and the backoff to sleep if retrying"""
+        now = self._failed_at
+        backoff = self._backoff if retrying else 0
+        self._records.append(
+            AttemptRecord(now - self._attempt_began, backoff, exception)
+        )
+        self._slept += backoff
+        self._attempt_began = now + backoff
+        if retrying:
+            if self._loop is None:
+                self._loop = in_flight.register(
+                    self._qualname, time.time() - (now - self._start)
+                )
+            self._loop.update(self._count, exception, backoff)
+
+    def _increment(self, policy: ExceptionPolicy) -> _Backoff:
+        """Increment the retry handler's count and the policy's backoff duration"""
+        self._failed_at = self._clock()
+        if not self._count:
+            self._first_failure()
         self._count += 1
-        self._backoff = self._calc_backoff()
-        self._unjittered_backoff *= self._retry_config.exponential
+        if self._budget is not None:
+            self._budget.record_failure()
+        try:
+            backoff = self._backoffs[policy]
+        except KeyError:
+            backoff = self._backoffs[policy] = _Backoff(self._retry_config, policy)
+            if self._backoff_state is not None:
+                backoff.unjittered_backoff = max(
+                    backoff.unjittered_backoff,
+                    self._backoff_state.level(self._state_key),
+                )
+        self._backoff = backoff.increment()
+        if self._adaptive is not None:
+            self._backoff = self._adaptive.delay
+            if backoff.jitter:
+                self._backoff *= random.random()
+            self._adaptive.record_failure()
+        if self._backoff_state is not None:
+            self._backoff_state.escalate(self._state_key, backoff.unjittered_backoff)
+        if self._endpoints is not None:
+            self.record_endpoint(self._endpoints, ok=False)
+            if self._endpoints.has_healthy(self._endpoint):
+                self._backoff = 0
+        return backoff
 
-    def _check_retry_limit(self, exc: Exception) -> None:
-        if self._count > self._retry_config.retry_limit:
-            if self._retry_config.reraise:
-                raise exc
-            raise RetryError(
-                f"Retry limit {self._retry_config.retry_limit} reached"
-            ) from exc
+    def _first_failure(self) -> None:
+        """Set up the state of failed attempts, left out of calls that never fail"""
+        keep_exceptions = self._retry_config.keep_exceptions
+        self._history = deque(maxlen=keep_exceptions) if keep_exceptions else None
+        self._records = deque(maxlen=MAX_RECORDS)
+        self._backoffs = {}
+        self._loop = None
+        self._slept = 0.0
+        self._clipped = False
+
+    def _check_limits(self, backoff: _Backoff) -> Optional[str]:
+        """
+        Return why no more retries are allowed, if they aren't, tripping the ramp
+        when giving up on failures downstream rather than refused locally
+        """
+        priority = call_priority.get()
+        if priority is None:
+            priority = self._retry_config.priority
+        if priority is not None and load_shedder.shed(priority):
+            return "Retry shed under load"
+        message = self._limit_reached(backoff)
+        if message is not None:
+            if self._slow_start is not None:
+                self._slow_start.trip()
+            return message
+        return self._start_backoff()
+
+    def _limit_reached(self, backoff: _Backoff) -> Optional[str]:
+        """Return which limit on retries is reached, if any"""
+        if backoff.count > backoff.retry_limit:
+            return f"Retry limit {backoff.retry_limit} reached"
+        if (self._failed_at + self._backoff) > self._timeout and not self._clip():
+            if self._inherited:
+                return "Deadline exceeded"
+            return f"Time limit {self._retry_config.time_limit} exceeded"
+        if self._budget is not None and not self._budget.acquire_retry():
+            return "Retry budget exhausted"
+        return None
+
+    def _clip(self) -> bool:
+        """
+        Clip the backoff to leave time for one final attempt before the time limit,
+        returning whether or not it was
+        """
+        margin = self._retry_config.final_attempt_margin
+        if margin is None or self._clipped:
+            return False
+        mean_attempt = (self._failed_at - self._start - self._slept) / self._count
+        backoff = self._timeout - self._failed_at - max(margin, mean_attempt)
+        if backoff < 0:
+            return False
+        self._backoff = backoff
+        self._clipped = True
+        return True
+
+    def _start_backoff(self) -> Optional[str]:
+        """Count the caller sleeping in backoff, returning why it's rejected, if it is"""
+        if self._bulkhead is not None and not self._bulkhead.start_backoff():
+            return "Bulkhead full"
+        if self._adaptive is not None and not self._adaptive.start_backoff():
+            if self._bulkhead is not None:
+                self._bulkhead.end_backoff()
+            return "Adaptive retry concurrency reached"
+        load_shedder.start_backoff()
+        return None
+
+    def _give_up(
+        self, exc: Optional[Exception], reraise: bool, message: str
+    ) -> NoReturn:
+        """Record the call to the dead-letter store, if any, and raise"""
+        elapsed = self._clock() - self._start
+        failed = self._count > 0
+        error = RetryError(
+            message,
+            attempts=self._count,
+            elapsed=elapsed,
+            slept=self._slept if failed else 0.0,
+            limits={
+                "retry_limit": self._retry_config.retry_limit,
+                "time_limit": self._retry_config.time_limit,
+            },
+            records=tuple(self._records) if failed else (),
+            exceptions=(
+                tuple(self._history) if failed and self._history is not None else ()
+            ),
+        )
+        cause: Optional[BaseException] = exc
+        if error.exceptions and sys.version_info >= (3, 11):
+            cause = builtins.ExceptionGroup(
+                f"Exceptions caught on the last {len(error.exceptions)} attempts",
+                error.exceptions,
+            )
+        dead_letter = self._retry_config.dead_letter
+        if dead_letter is not None:
+            try:
+                dead_letter.record(
+                    DeadLetter.from_call(
+                        self._qualname,
+                        self._args,
+                        self._kwargs,
+                        exc=error if exc is None else exc,
+                        elapsed=elapsed,
+                        attempts=self._count,
+                    )
+                )
+            except Exception:
+                self._retry_config.logger.log(
+                    logging.ERROR,
+                    "Failed to record the call to the dead-letter store",
+                    exc_info=True,
+                )
+        if reraise and exc is not None:
+            raise exc
+        raise error from cause
+
+
+def _check_event_loop(on_event_loop: tub_types.OnEventLoop) -> None:
+    """Warn or raise if sleeping would block a running event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    message = (
+        "Sleeping before retrying a function would block the running event loop, "
+        "use retry_to_thread instead"
+    )
+    if on_event_loop == "raise":
+        raise EventLoopBlockingError(message)
+    warnings.warn(message, RuntimeWarning, stacklevel=_caller_stacklevel())
+
+
+def _caller_stacklevel() -> int:
+    """
+    Stack level of the first frame outside of the package, for warnings to point
+    at the caller of the function with retry logic, whichever interface it used
+    """
+    frame: Optional[FrameType] = sys._getframe(1)
+    level = 1
+    while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+        frame = frame.f_back
+        level += 1
+    return level
+
+
+def _refuse_event_loop(
+    func: Callable[tub_types.P, tub_types.T],
+) -> Callable[tub_types.P, tub_types.T]:
+    """
+    Wrap a function with retry logic to raise an EventLoopBlockingError within
+    a running event loop before calling it, rather than once about to sleep
+    """
+
+    def refusing_func(*args: tub_types.P.args, **kwargs: tub_types.P.kwargs) -> Any:
+        _check_event_loop("raise")
+        return func(*args, **kwargs)
+
+    return refusing_func
 
-    def _check_time_limit(self, exc: Exception) -> None:
-        if (time.perf_counter() + self._backoff) > self._timeout:
-            if self._retry_config.reraise:
-                raise exc
-            raise RetryError(
-                f"Time limit {self._retry_config.time_limit} exceeded"
-            ) from exc
+
+def _wake_up(future: "asyncio.Future[None]") -> None:
+    """Wake up a coroutine sleeping in backoff, unless it was cancelled"""
+    if not future.done():
+        future.set_result(None)
+
+
+def _precise_sleep(
+    duration: tub_types.Duration, spin_threshold: tub_types.Duration
+) -> None:
+    """Sleep until within the spin threshold of the end of the duration, then spin"""
+    end = time.perf_counter() + duration
+    if duration > spin_threshold:
+        time.sleep(duration - spin_threshold)
+    while time.perf_counter() < end:
+        pass
+
+
+def _override(value: Optional[tub_types.T], default: tub_types.T) -> tub_types.T:
+    """Return the policy's override of a config value, if any"""
+    return default if value is None else value
 
 
 @overload
@@ -114,46 +738,467 @@ def retry_factory(func, retry_config):  # type: ignore
     Function that produces a retry_function given a function to retry,
     and config to determine retry logic.
     """
-    retry_hanlder = _RetryHandler(retry_config)
-    if asyncio.iscoroutinefunction(func):
-        retry_func = _async_retry_factory(func, retry_hanlder)
+    if retry_config.resume is not None:
+        retry_func = _retry_generator_factory(func, retry_config, retry_config.resume)
+    elif asyncio.iscoroutinefunction(func):
+        retry_func = _async_retry_factory(func, retry_config)
+        if retry_config.coalesce:
+            retry_func = async_coalesce(retry_func, key_function(retry_config.coalesce))
+        if retry_config.cache is not None:
+            retry_func = async_cached(
+                retry_func, retry_config.cache, *_cache_args(func, retry_config)
+            )
     else:
-        retry_func = _sync_retry_factory(func, retry_hanlder)
+        retry_func = _sync_retry_factory(func, retry_config)
+        if retry_config.on_event_loop == "raise":
+            retry_func = _refuse_event_loop(retry_func)
+        if retry_config.coalesce:
+            retry_func = sync_coalesce(retry_func, key_function(retry_config.coalesce))
+        if retry_config.cache is not None:
+            retry_func = sync_cached(
+                retry_func, retry_config.cache, *_cache_args(func, retry_config)
+            )
     update_wrapper(retry_func, func)
     return retry_func
 
 
+def _retry_generator_factory(
+    func: Callable[..., Any],
+    retry_config: RetryConfig,
+    resume: Callable[[Any], Mapping[str, Any]],
+) -> Callable[..., Any]:
+    """
+    Wrap a generator function, or async generator function, with retry logic
+    restarting it with the keyword arguments to resume it with, raising a
+    TypeError for any other function
+    """
+    if inspect.isasyncgenfunction(func):
+        return _async_retry_generator_factory(func, retry_config, resume)
+    if not inspect.isgeneratorfunction(func):
+        raise TypeError(
+            f"resume only applies to generator functions, not {qualified_name(func)}"
+        )
+    retry_func = _sync_retry_generator_factory(func, retry_config, resume)
+    if retry_config.on_event_loop == "raise":
+        return _refuse_event_loop(retry_func)
+    return retry_func
+
+
+def _cache_args(
+    func: Callable[..., object], retry_config: RetryConfig
+) -> Tuple[str, Callable[[Exception], bool], tub_types.RetryOnResult]:
+    """Arguments for wrapping a function with retry logic with a result cache"""
+    resolve = _resolver(retry_config)
+
+    def serve_stale(exc: Exception) -> bool:
+        """Whether or not the exception means retries gave up"""
+        if isinstance(exc, RetryError):
+            return True
+        classifier = (retry_config if resolve is None else resolve()).classifier
+        return classifier is not None and classifier.classify(exc) is not None
+
+    return qualified_name(func), serve_stale, retry_config.retry_on_result
+
+
+def _resolver(retry_config: RetryConfig) -> Optional[Callable[[], RetryConfig]]:
+    """Return a function returning the config with the current values of its policy, if any"""
+    if retry_config.policy is None:
+        return None
+    return policy_registry.resolver(
+        retry_config.policy,
+        retry_config,
+        requires=("exceptions",) if retry_config.exceptions is None else (),
+    )
+
+
 def _async_retry_factory(
     func: Callable[tub_types.P, Awaitable[tub_types.T]],
-    retry_handler: _RetryHandler,
+    retry_config: RetryConfig,
 ) -> Callable[tub_types.P, Awaitable[tub_types.T]]:
+    retry_on_result = retry_config.retry_on_result
+    qualname = qualified_name(func)
+    bulkhead = retry_config.bulkhead
+    resolve = _resolver(retry_config)
+    before_attempt = (
+        retry_config.slow_start is not None or retry_config.endpoints is not None
+    )
+    track_success = (
+        before_attempt
+        or retry_config.backoff_state is not None
+        or retry_config.adaptive is not None
+    )
+
     async def retry_func(
         *args: tub_types.P.args, **kwargs: tub_types.P.kwargs
     ) -> tub_types.T:
-        retry_handler.start()
-        while True:
-            try:
-                return await func(*args, **kwargs)
-            except retry_handler.exceptions as exc:
-                backoff = retry_handler.handle(exc)
-            await asyncio.sleep(backoff)
+        retry_handler = _RetryHandler(
+            retry_config if resolve is None else resolve(),
+            asyncio.get_running_loop().time,
+            qualname,
+            args,
+            kwargs,
+        )
+        token = retry_handler.start()
+        try:
+            while True:
+                if before_attempt:
+                    retry_handler.before_attempt()
+                if bulkhead is not None and not await bulkhead.acquire_async():
+                    retry_handler.reject("Bulkhead full")
+                try:
+                    result = await func(*args, **kwargs)
+                except retry_handler.classifier.include as exc:
+                    policy = retry_handler.classifier.classify(exc)
+                    if policy is None:
+                        raise
+                    backoff = retry_handler.handle(exc, policy)
+                else:
+                    if retry_on_result is None or not retry_on_result(result):
+                        if track_success:
+                            retry_handler.succeed()
+                        return result
+                    backoff = retry_handler.handle_result(result)
+                    if backoff is None:
+                        return result
+                finally:
+                    if bulkhead is not None:
+                        bulkhead.release()
+                await retry_handler.sleep_async()
+        finally:
+            retry_handler.finish(token)
 
     return retry_func
 
 
 def _sync_retry_factory(
     func: Callable[tub_types.P, tub_types.T],
-    retry_handler: _RetryHandler,
+    retry_config: RetryConfig,
 ) -> Callable[tub_types.P, tub_types.T]:
+    retry_on_result = retry_config.retry_on_result
+    qualname = qualified_name(func)
+    bulkhead = retry_config.bulkhead
+    resolve = _resolver(retry_config)
+    before_attempt = (
+        retry_config.slow_start is not None or retry_config.endpoints is not None
+    )
+    track_success = (
+        before_attempt
+        or retry_config.backoff_state is not None
+        or retry_config.adaptive is not None
+    )
+
     def retry_func(
         *args: tub_types.P.args, **kwargs: tub_types.P.kwargs
     ) -> tub_types.T:
-        retry_handler.start()
-        while True:
-            try:
-                return func(*args, **kwargs)
-            except retry_handler.exceptions as exc:
-                backoff = retry_handler.handle(exc)
-            time.sleep(backoff)
+        retry_handler = _RetryHandler(
+            retry_config if resolve is None else resolve(),
+            time.monotonic,
+            qualname,
+            args,
+            kwargs,
+        )
+        token = retry_handler.start()
+        try:
+            while True:
+                if before_attempt:
+                    retry_handler.before_attempt()
+                if bulkhead is not None and not bulkhead.acquire():
+                    retry_handler.reject("Bulkhead full")
+                try:
+                    result = func(*args, **kwargs)
+                except retry_handler.classifier.include as exc:
+                    policy = retry_handler.classifier.classify(exc)
+                    if policy is None:
+                        raise
+                    backoff = retry_handler.handle(exc, policy)
+                else:
+                    if retry_on_result is None or not retry_on_result(result):
+                        if track_success:
+                            retry_handler.succeed()
+                        return result
+                    backoff = retry_handler.handle_result(result)
+                    if backoff is None:
+                        return result
+                finally:
+                    if bulkhead is not None:
+                        bulkhead.release()
+                retry_handler.sleep(backoff)
+        finally:
+            retry_handler.finish(token)
 
     return retry_func
+
+
+def _async_retry_generator_factory(
+    func: Callable[..., AsyncGenerator[tub_types.T, None]],
+    retry_config: RetryConfig,
+    resume: Callable[[Any], Mapping[str, Any]],
+) -> Callable[..., AsyncGenerator[tub_types.T, None]]:
+    _check_generator(retry_config)
+    qualname = qualified_name(func)
+    resolve = _resolver(retry_config)
+
+    async def retry_gen(*args: Any, **kwargs: Any) -> AsyncGenerator[tub_types.T, None]:
+        retry_handler = _RetryHandler(
+            retry_config if resolve is None else resolve(),
+            asyncio.get_running_loop().time,
+            qualname,
+            args,
+            kwargs,
+        )
+        retry_handler.leave(retry_handler.start())
+        call_kwargs, last, delivered = kwargs, None, False
+        try:
+            while True:
+                retry_handler.before_attempt()
+                generator = func(*args, **call_kwargs)
+                try:
+                    while True:
+                        token = retry_handler.enter()
+                        try:
+                            item = await generator.__anext__()
+                        except StopAsyncIteration:
+                            retry_handler.succeed()
+                            return
+                        except retry_handler.classifier.include as exc:
+                            policy = retry_handler.classifier.classify(exc)
+                            if policy is None:
+                                raise
+                            retry_handler.handle(exc, policy)
+                            break
+                        finally:
+                            retry_handler.leave(token)
+                        yield item
+                        last, delivered = item, True
+                finally:
+                    await generator.aclose()
+                await retry_handler.sleep_async()
+                if delivered:
+                    call_kwargs = {**kwargs, **resume(last)}
+        finally:
+            retry_handler.finish(None)
+
+    return retry_gen
+
+
+def _sync_retry_generator_factory(
+    func: Callable[..., Generator[tub_types.T, None, None]],
+    retry_config: RetryConfig,
+    resume: Callable[[Any], Mapping[str, Any]],
+) -> Callable[..., Generator[tub_types.T, None, None]]:
+    _check_generator(retry_config)
+    qualname = qualified_name(func)
+    resolve = _resolver(retry_config)
+
+    def retry_gen(*args: Any, **kwargs: Any) -> Generator[tub_types.T, None, None]:
+        retry_handler = _RetryHandler(
+            retry_config if resolve is None else resolve(),
+            time.monotonic,
+            qualname,
+            args,
+            kwargs,
+        )
+        retry_handler.leave(retry_handler.start())
+        call_kwargs, last, delivered = kwargs, None, False
+        try:
+            while True:
+                retry_handler.before_attempt()
+                generator = func(*args, **call_kwargs)
+                try:
+                    while True:
+                        token = retry_handler.enter()
+                        try:
+                            item = next(generator)
+                        except StopIteration:
+                            retry_handler.succeed()
+                            return
+                        except retry_handler.classifier.include as exc:
+                            policy = retry_handler.classifier.classify(exc)
+                            if policy is None:
+                                raise
+                            backoff = retry_handler.handle(exc, policy)
+                            break
+                        finally:
+                            retry_handler.leave(token)
+                        yield item
+                        last, delivered = item, True
+                finally:
+                    generator.close()
+                retry_handler.sleep(backoff)
+                if delivered:
+                    call_kwargs = {**kwargs, **resume(last)}
+        finally:
+            retry_handler.finish(None)
+
+    return retry_gen
+
+
+def _check_generator(retry_config: RetryConfig) -> None:
+    """Raise a ValueError if the config uses features generator functions don't support"""
+    unsupported = [
+        name
+        for name, used in (
+            ("retry_on_result", retry_config.retry_on_result is not None),
+            ("coalesce", bool(retry_config.coalesce)),
+            ("cache", retry_config.cache is not None),
+            ("bulkhead", retry_config.bulkhead is not None),
+        )
+        if used
+    ]
+    if unsupported:
+        raise ValueError(
+            f"Generator functions can't be retried with {', '.join(unsupported)}"
+        )
+
+
+class Attempt:
+    r"""An attempt of a block of code with retry logic, reused for each attempt
+
+    Returned by iterating over `retrying`, with ``for`` or ``async for``,
+    entering it with ``with`` around the block of code to attempt. Exceptions
+    to be retried are caught on exiting it, and the next iteration sleeps in
+    backoff before returning the same object for the next attempt, until an
+    attempt succeeds, or retries give up, raising a `RetryError`. Leaving
+    the loop early, with ``break``, ``return`` or an exception raised after
+    the attempt, ends the retry loop, along with its backoff if any.
+    """
+
+    __slots__ = (
+        "_backoff",
+        "_done",
+        "_handler",
+        "_number",
+        "_token",
+    )
+
+    _handler: _RetryHandler
+    _number: int
+    _backoff: Optional[tub_types.Duration]
+    _done: bool
+    _token: "Optional[contextvars.Token[Optional[Scope]]]"
+
+    @classmethod
+    def _start(cls, retry_config: RetryConfig, clock: Callable[[], float]) -> "Attempt":
+        """Start a retry loop, returning the attempt to reuse for each of its attempts"""
+        self = cls.__new__(cls)
+        self._handler = _RetryHandler(retry_config, clock, RETRYING_QUALNAME, (), {})
+        self._handler.leave(self._handler.start())
+        self._number = 0
+        self._backoff = None
+        self._done = False
+        return self
+
+    @property
+    def number(self) -> int:
+        """Number of the attempt, starting from 1"""
+        return self._number
+
+    def __enter__(self) -> "Attempt":
+        self._token = self._handler.enter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> bool:
+        self._handler.leave(self._token)
+        if exc is None:
+            self._succeed()
+            self._finish()
+            return False
+        classifier = self._handler.classifier
+        if not isinstance(exc, classifier.include):
+            self._finish()
+            return False
+        policy = classifier.classify(exc)
+        if policy is None:
+            self._finish()
+            return False
+        try:
+            self._backoff = self._handler.handle(exc, policy)
+        except BaseException:
+            self._finish()
+            raise
+        return True
+
+    def _begin(self) -> "Attempt":
+        """Begin the next attempt"""
+        self._number += 1
+        self._handler.before_attempt()
+        return self
+
+    def _loop(self) -> Generator["Attempt", None, None]:
+        """Attempts of the retry loop, finishing it once left, even early"""
+        try:
+            while True:
+                yield self._begin()
+                backoff, self._backoff = self._backoff, None
+                if backoff is None:
+                    self._succeed()
+                    return
+                self._handler.sleep(backoff)
+        finally:
+            self._finish()
+
+    async def _loop_async(self) -> AsyncGenerator["Attempt", None]:
+        """Attempts of the retry loop sleeping without blocking the event loop"""
+        try:
+            while True:
+                yield self._begin()
+                backoff, self._backoff = self._backoff, None
+                if backoff is None:
+                    self._succeed()
+                    return
+                await self._handler.sleep_async()
+        finally:
+            self._finish()
+
+    def _succeed(self) -> None:
+        """Record the attempt succeeding, if not already recorded on exiting it"""
+        if not self._done:
+            self._handler.succeed()
+
+    def _finish(self) -> None:
+        """Finish the retry loop, ending its backoff if left during it"""
+        if self._done:
+            return
+        self._done = True
+        if self._backoff is not None:
+            self._backoff = None
+            self._handler.end_backoff()
+        self._handler.finish(None)
+
+
+class Retrying:
+    r"""Iterable of attempts of a block of code with retry logic
+
+    Returned by `retrying`, iterating over it with ``for``, or ``async for``
+    from a coroutine to sleep without blocking the event loop, returns an
+    `Attempt` to enter with ``with`` around each attempt.
+    """
+
+    __slots__ = ("_resolve", "_retry_config")
+
+    _retry_config: RetryConfig
+    _resolve: Optional[Callable[[], RetryConfig]]
+
+    @classmethod
+    def _from_config(cls, retry_config: RetryConfig) -> "Retrying":
+        """Create the iterable of attempts with the config"""
+        self = cls.__new__(cls)
+        self._retry_config = retry_config
+        self._resolve = _resolver(retry_config)
+        return self
+
+    def __iter__(self) -> Iterator[Attempt]:
+        return Attempt._start(self._config(), time.monotonic)._loop()
+
+    def __aiter__(self) -> AsyncIterator[Attempt]:
+        attempt = Attempt._start(self._config(), asyncio.get_running_loop().time)
+        return attempt._loop_async()
+
+    def _config(self) -> RetryConfig:
+        """Config with the current values of the policy, if any"""
+        return self._retry_config if self._resolve is None else self._resolve()
@@ -0,0 +1,68 @@
+"""Module defining the LoadShedder class"""
+
+import threading
+from typing import Dict
+
+
+class LoadShedder:
+    r"""Process-wide pressure from callers backing off, shedding low-priority retries
+
+    Every call with retry logic counts towards the pressure while sleeping
+    in backoff, as a share of ``max_backoffs``. Calls with a ``priority``,
+    either from the ``priority`` argument of any of ``tubthumper``'s
+    interfaces or the `priority` context manager, give up with a
+    `RetryError` rather than retrying once the pressure reaches it, so
+    downstream capacity goes to calls that matter most. Calls without a
+    priority are never shed.
+
+    Use the process-wide instance, `load_shedder`, tuning its
+    ``max_backoffs`` to the capacity of the process.
+
+    Args:
+        max_backoffs:
+            number of callers backing off at once at which the pressure is 1
+    """
+
+    max_backoffs: int
+    _lock: threading.Lock
+    _backing_off: int
+    _shed: int
+
+    def __init__(self, max_backoffs: int = 100):
+        self.max_backoffs = max_backoffs
+        self._lock = threading.Lock()
+        self._backing_off = self._shed = 0
+
+    def pressure(self) -> float:
+        """Share of ``max_backoffs`` callers backing off, read without locking"""
+        return self._backing_off / self.max_backoffs
+
+    def stats(self) -> Dict[str, float]:
+        """Callers backing off, pressure, and retries shed so far"""
+        with self._lock:
+            return {
+                "backing_off": self._backing_off,
+                "pressure": self.pressure(),
+                "shed": self._shed,
+            }
+
+    def shed(self, priority: float) -> bool:
+        """Whether or not to shed a retry of this priority, counting it if so"""
+        if self.pressure() < priority:
+            return False
+        with self._lock:
+            self._shed += 1
+        return True
+
+    def start_backoff(self) -> None:
+        """Count a caller sleeping in backoff"""
+        with self._lock:
+            self._backing_off += 1
+
+    def end_backoff(self) -> None:
+        """Count a caller done sleeping in backoff"""
+        with self._lock:
+            self._backing_off -= 1
+
+
+load_shedder = LoadShedder()
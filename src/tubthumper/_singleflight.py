@@ -0,0 +1,111 @@
+"""Module coalescing concurrent calls with equal keys into a single execution"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from tubthumper import _types as tub_types
+
+
+def default_key(*args: Any, **kwargs: Any) -> Hashable:
+    """Key calls by their arguments, which must then be hashable"""
+    return args, tuple(sorted(kwargs.items()))
+
+
+def key_function(coalesce: tub_types.Coalesce) -> Callable[..., Hashable]:
+    """Coerce the coalesce argument of the public interfaces into a key function"""
+    if callable(coalesce):
+        return coalesce
+    return default_key
+
+
+class _Abandoned(Exception):
+    """Exception shared with followers when the leader of their execution is cancelled"""
+
+
+class _Flight:
+    """Single execution shared by concurrent threads calling with equal keys"""
+
+    __slots__ = ("done", "exc", "result")
+
+    done: threading.Event
+    result: Any
+    exc: Optional[BaseException]
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exc = None
+
+
+def sync_coalesce(
+    func: Callable[tub_types.P, tub_types.T], key: Callable[..., Hashable]
+) -> Callable[tub_types.P, tub_types.T]:
+    """Wrap a function so concurrent calls with equal keys share one execution"""
+    lock = threading.Lock()
+    flights: Dict[Hashable, _Flight] = {}
+
+    def coalesced_func(*args: tub_types.P.args, **kwargs: tub_types.P.kwargs) -> Any:
+        call_key = key(*args, **kwargs)
+        with lock:
+            flight = flights.get(call_key)
+            leader = flight is None
+            if flight is None:
+                flight = flights[call_key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.exc is not None:
+                raise flight.exc
+            return flight.result
+        try:
+            flight.result = func(*args, **kwargs)
+        except BaseException as exc:
+            flight.exc = exc
+            raise
+        finally:
+            with lock:
+                del flights[call_key]
+            flight.done.set()
+        return flight.result
+
+    return coalesced_func
+
+
+def async_coalesce(
+    func: Callable[tub_types.P, Awaitable[tub_types.T]],
+    key: Callable[..., Hashable],
+) -> Callable[tub_types.P, Awaitable[tub_types.T]]:
+    """
+    Wrap a coroutine function so concurrent calls with equal keys share one execution,
+    the first of the followers taking over as leader if the leader is cancelled
+    """
+    flights: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future[Any]] = {}
+
+    async def coalesced_func(
+        *args: tub_types.P.args, **kwargs: tub_types.P.kwargs
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        call_key = loop, key(*args, **kwargs)
+        future = flights.get(call_key)
+        while future is not None:
+            try:
+                return await asyncio.shield(future)
+            except _Abandoned:
+                future = flights.get(call_key)
+        future = flights[call_key] = loop.create_future()
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.set_exception(_Abandoned())
+            future.exception()  # retrieved, in case nobody else was waiting
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # retrieved, in case nobody else was waiting
+            raise
+        finally:
+            del flights[call_key]
+        future.set_result(result)
+        return result
+
+    return coalesced_func
@@ -0,0 +1,102 @@
+"""Module defining the SlowStart class"""
+
+import random
+import threading
+import time
+from typing import Optional
+
+from tubthumper import _types as tub_types
+from tubthumper._named import named
+
+
+class SlowStart:
+    r"""Ramp gradually letting calls through once a dependency recovers
+
+    Provide an instance of this class as the ``slow_start`` argument of any
+    of ``tubthumper``'s interfaces so callers don't all pile in on a
+    dependency as soon as it comes back. Once a call gives up on retries
+    failing downstream, e.g. when reaching its retry limit, or because a
+    retry budget's circuit breaker is open, only ``min_share`` of attempts
+    are let through until the next call returning successfully starts a
+    ramp, over which the share of attempts let through grows linearly to
+    all of them within ``window`` seconds. Attempts not let through raise
+    a `RetryError` right away. Retries refused locally, e.g. by a bulkhead
+    or under load, don't trip it.
+
+    Share an instance between wrappers calling the same dependency, or use
+    `SlowStart.named` to share one by name, across all callers in the process.
+
+    Args:
+        window:
+            duration in seconds over which the share of attempts
+            let through grows to all of them
+        min_share:
+            share of attempts let through at the start of the ramp
+    """
+
+    window: tub_types.Duration
+    min_share: float
+    _lock: threading.Lock
+    _tripped: bool
+    _ramp_start: Optional[float]
+
+    def __init__(self, window: tub_types.Duration = 30, *, min_share: float = 0.1):
+        self.window = window
+        self.min_share = min_share
+        self._lock = threading.Lock()
+        self._tripped = False
+        self._ramp_start = None
+
+    @classmethod
+    def named(
+        cls,
+        name: str,
+        window: Optional[tub_types.Duration] = None,
+        *,
+        min_share: Optional[float] = None,
+    ) -> "SlowStart":
+        """
+        Return the ramp shared under this name, creating it with
+        the provided window, or the defaults, if it doesn't exist yet,
+        raising a ValueError if it exists with a different one
+        """
+        return named(cls, name, window=window, min_share=min_share)
+
+    def share(self) -> float:
+        """Share of attempts currently let through, the minimum until recovering"""
+        if self._tripped:
+            return self.min_share
+        ramp_start = self._ramp_start
+        if ramp_start is None:
+            return 1.0
+        ramped = (time.monotonic() - ramp_start) / self.window
+        if ramped >= 1:
+            self._end_ramp(ramp_start)
+            return 1.0
+        return max(self.min_share, ramped)
+
+    def admit(self) -> bool:
+        """Whether or not to let an attempt through, at random while tripped or ramping"""
+        if not self._tripped and self._ramp_start is None:
+            return True
+        return random.random() < self.share()
+
+    def trip(self) -> None:
+        """Record a call giving up, holding attempts back until the next successful call starts the ramp"""
+        with self._lock:
+            self._tripped = True
+            self._ramp_start = None
+
+    def recover(self) -> None:
+        """Record a call returning successfully, starting the ramp if tripped"""
+        if not self._tripped:
+            return
+        with self._lock:
+            self._tripped = False
+            self._ramp_start = time.monotonic()
+
+    def _end_ramp(self, ramp_start: float) -> None:
+        """End the ramp, unless another one started since"""
+        with self._lock:
+            if self._ramp_start == ramp_start:
+                self._ramp_start = None
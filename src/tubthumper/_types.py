@@ -1,15 +1,40 @@
 """Module of types used in tubthumper"""
 
 import sys
-from typing import Any, Iterable, Mapping, Optional, Tuple, Type, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 if sys.version_info < (3, 10):
     from typing_extensions import ParamSpec, Protocol, TypeAlias
 else:
     from typing import ParamSpec, Protocol, TypeAlias
 
+if TYPE_CHECKING:
+    from tubthumper._adaptive import AdaptiveBackoff
+    from tubthumper._backoff_state import BackoffState
+    from tubthumper._budget import RetryBudget
+    from tubthumper._bulkhead import Bulkhead
+    from tubthumper._cache import ResultCache
+    from tubthumper._classifier import ExceptionClassifier
+    from tubthumper._dead_letter import DeadLetterStore
+    from tubthumper._endpoints import EndpointPool
+    from tubthumper._slow_start import SlowStart
 
-Exceptions: TypeAlias = Union[Type[Exception], Tuple[Type[Exception], ...]]
+ExceptionTypes: TypeAlias = Union[Type[Exception], Tuple[Type[Exception], ...]]
+Exceptions: TypeAlias = Union[ExceptionTypes, "ExceptionClassifier"]
+ExceptionsArg: TypeAlias = Optional[Exceptions]
 Args: TypeAlias = Optional[Iterable[Any]]
 Kwargs: TypeAlias = Optional[Mapping[str, Any]]
 RetryLimit: TypeAlias = float
@@ -18,6 +43,26 @@ Jitter: TypeAlias = bool
 Reraise: TypeAlias = bool
 LogLevel: TypeAlias = int
 Duration: TypeAlias = float
+ExceptionPredicate: TypeAlias = Callable[[Any], bool]
+RetryOnResult: TypeAlias = Optional[Callable[[Any], bool]]
+Budget: TypeAlias = Optional["RetryBudget"]
+DeadLetterSink: TypeAlias = Optional["DeadLetterStore"]
+Coalesce: TypeAlias = Union[bool, Callable[..., Hashable]]
+Cache: TypeAlias = Optional["ResultCache"]
+BulkheadArg: TypeAlias = Optional["Bulkhead"]
+DeferToOuter: TypeAlias = bool
+Endpoints: TypeAlias = Optional["EndpointPool"]
+BackoffStateArg: TypeAlias = Optional["BackoffState"]
+SlowStartArg: TypeAlias = Optional["SlowStart"]
+Priority: TypeAlias = Optional[float]
+Adaptive: TypeAlias = Optional["AdaptiveBackoff"]
+ClearFrames: TypeAlias = bool
+KeepExceptions: TypeAlias = int
+PolicyName: TypeAlias = Optional[str]
+FinalAttemptMargin: TypeAlias = Optional[float]
+Resume: TypeAlias = Optional[Callable[[Any], Mapping[str, Any]]]
+ExposeAttempt: TypeAlias = bool
+OnEventLoop: TypeAlias = Literal["ignore", "warn", "raise"]
 
 T = TypeVar("T")
 P = ParamSpec("P")
@@ -32,7 +77,7 @@ class Logger(Protocol):
     """
 
     def log(self, level: int, msg: str, *args: object, exc_info: bool) -> None:
-        r"""We call this method to log at the configured level with ``exc_info=True``
+        r"""We call this method to log at the configured level, with ``exc_info=True`` for caught exceptions
 
         Args:
             level:
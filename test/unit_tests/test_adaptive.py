@@ -0,0 +1,127 @@
+"""Unit tests for the class AdaptiveBackoff"""
+
+import logging
+import unittest
+
+from mock import AsyncMock, Mock, patch
+
+from tubthumper import AdaptiveBackoff, Bulkhead, RetryError, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestAdaptiveBackoff(unittest.TestCase):
+    """Test case for the adaptive backoff"""
+
+    def test_failure(self):
+        """Test failures grow the delay & shrink the concurrency multiplicatively"""
+        adaptive = AdaptiveBackoff(
+            min_delay=1, max_delay=5, max_concurrency=8, min_concurrency=3
+        )
+        adaptive.record_failure()
+        self.assertEqual(adaptive.stats()["delay"], 2)
+        self.assertEqual(adaptive.stats()["concurrency"], 4)
+        adaptive.record_failure()
+        adaptive.record_failure()
+        self.assertEqual(adaptive.delay, 5)
+        self.assertEqual(adaptive.stats()["concurrency"], 3)
+        self.assertLess(adaptive.stats()["success_rate"], 1)
+
+    def test_success(self):
+        """Test successes shrink the delay & grow the concurrency additively"""
+        adaptive = AdaptiveBackoff(min_delay=1, step=0.5, max_concurrency=8)
+        adaptive.record_failure()
+        adaptive.record_success()
+        self.assertEqual(adaptive.delay, 1.5)
+        self.assertEqual(adaptive.stats()["concurrency"], 5)
+        adaptive.record_success()
+        adaptive.record_success()
+        adaptive.record_success()
+        adaptive.record_success()
+        self.assertEqual(adaptive.delay, 1)
+        self.assertEqual(adaptive.stats()["concurrency"], 8)
+
+    def test_concurrency(self):
+        """Test callers beyond the concurrency are rejected"""
+        adaptive = AdaptiveBackoff(max_concurrency=1)
+        self.assertTrue(adaptive.start_backoff())
+        self.assertFalse(adaptive.start_backoff())
+        adaptive.end_backoff()
+        self.assertEqual(
+            adaptive.stats(),
+            {
+                "delay": 0.1,
+                "concurrency": 1,
+                "backing_off": 0,
+                "rejected": 1,
+                "success_rate": 1,
+            },
+        )
+
+
+class TestAdaptiveBackoffRetryAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying coroutines with an adaptive backoff"""
+
+    async def test_delay(self):
+        """Test a coroutine sleeps for the adaptive delay"""
+        adaptive = AdaptiveBackoff(min_delay=0.001)
+        func = AsyncMock(side_effect=[constants.TestException, 1])
+        logger = Mock()
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            jitter=False,
+            adaptive=adaptive,
+            logger=logger,
+        )
+        self.assertEqual(await wrapped_func(), 1)
+        self.assertIn("retrying in 0.001 seconds", logger.log.call_args.args[1])
+        self.assertEqual(adaptive.delay, 0.001)
+        self.assertEqual(adaptive.stats()["backing_off"], 0)
+
+    async def test_concurrency(self):
+        """Test a caller beyond the concurrency gives up rather than retrying"""
+        adaptive = AdaptiveBackoff(max_concurrency=0, min_concurrency=0)
+        func = AsyncMock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, adaptive=adaptive
+        )
+        with self.assertRaisesRegex(RetryError, "Adaptive retry concurrency"):
+            await wrapped_func()
+        self.assertEqual(adaptive.stats()["rejected"], 1)
+
+
+class TestAdaptiveBackoffRetry(unittest.TestCase):
+    """Test case for retrying functions with an adaptive backoff"""
+
+    def test_delay(self):
+        """Test a function sleeps for the jittered adaptive delay, which grows"""
+        adaptive = AdaptiveBackoff(min_delay=1)
+        func = Mock(side_effect=[constants.TestException, constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, adaptive=adaptive
+        )
+        with patch("tubthumper._retry_factory.time.sleep") as sleep:
+            with patch("tubthumper._retry_factory.random.random", return_value=0.5):
+                self.assertEqual(wrapped_func(), 1)
+        self.assertEqual([call.args for call in sleep.call_args_list], [(0.5,), (1,)])
+        self.assertEqual(adaptive.delay, 3.9)
+
+    def test_concurrency_bulkhead(self):
+        """Test a caller beyond the concurrency leaves the bulkhead's backoff"""
+        adaptive = AdaptiveBackoff(max_concurrency=0, min_concurrency=0)
+        bulkhead = Bulkhead()
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            adaptive=adaptive,
+            bulkhead=bulkhead,
+        )
+        with self.assertRaisesRegex(RetryError, "Adaptive retry concurrency"):
+            wrapped_func()
+        func.assert_called_once_with()
+        self.assertEqual(bulkhead.stats()["backing_off"], 0)
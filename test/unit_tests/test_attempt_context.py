@@ -0,0 +1,143 @@
+"""Unit tests for the attempt context exposed to functions being retried"""
+
+import logging
+import unittest
+from typing import List, Optional
+
+from tubthumper import AttemptContext, attempt_context, deadline, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestAttemptContextAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for the attempt context with coroutines"""
+
+    async def test_attempts(self):
+        """Test a coroutine sees the attempt it's on & the previous exception"""
+        attempts: List[Optional[AttemptContext]] = []
+        exc = constants.TestException()
+
+        async def func() -> int:
+            attempts.append(attempt_context())
+            if len(attempts) == 1:
+                raise exc
+            return 1
+
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            expose_attempt=True,
+        )
+        self.assertEqual(await wrapped_func(), 1)
+        first, second = attempts
+        assert first is not None and second is not None
+        self.assertEqual(first.number, 1)
+        self.assertIsNone(first.exception)
+        self.assertEqual(second.number, 2)
+        self.assertIs(second.exception, exc)
+
+
+class TestAttemptContext(unittest.TestCase):
+    """Test case for the attempt context with functions"""
+
+    def test_outside(self):
+        """Test there's no attempt outside of calls with retry logic"""
+        self.assertIsNone(attempt_context())
+        with deadline(60):
+            self.assertIsNone(attempt_context())
+
+    def test_attempts(self):
+        """Test a function sees the attempt it's on & its timing"""
+        attempts: List[Optional[AttemptContext]] = []
+
+        def func() -> None:
+            attempts.append(attempt_context())
+            if len(attempts) < 3:
+                raise constants.TestException
+
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            time_limit=60,
+            expose_attempt=True,
+        )
+        wrapped_func()
+        self.assertEqual(
+            [attempt.number for attempt in attempts if attempt is not None], [1, 2, 3]
+        )
+        last = attempts[-1]
+        assert last is not None
+        self.assertIsInstance(last.exception, constants.TestException)
+        self.assertGreaterEqual(last.elapsed, 0)
+        self.assertLessEqual(last.remaining, 60)
+        self.assertGreater(last.remaining, 0)
+
+    def test_result(self):
+        """Test there's no previous exception after a retried result"""
+        attempts: List[Optional[AttemptContext]] = []
+
+        def func() -> int:
+            attempts.append(attempt_context())
+            return len(attempts)
+
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result < 2,
+            init_backoff=0,
+            expose_attempt=True,
+        )
+        self.assertEqual(wrapped_func(), 2)
+        last = attempts[-1]
+        assert last is not None
+        self.assertEqual(last.number, 2)
+        self.assertIsNone(last.exception)
+
+    def test_not_exposed(self):
+        """Test the attempt isn't exposed unless asked for, skipping such calls"""
+        attempts: List[Optional[AttemptContext]] = []
+
+        def func() -> None:
+            attempts.append(attempt_context())
+
+        retry_factory(func, exceptions=constants.TestException)()
+        outer = retry_factory(
+            retry_factory(func, exceptions=constants.TestException),
+            exceptions=ValueError,
+            expose_attempt=True,
+        )
+        outer()
+        first, second = attempts
+        self.assertIsNone(first)
+        assert second is not None
+        self.assertEqual(second.number, 1)
+
+    def test_innermost(self):
+        """Test the innermost call's attempt is returned, even within a deadline"""
+        attempts: List[Optional[AttemptContext]] = []
+
+        def inner() -> None:
+            with deadline(60):
+                attempts.append(attempt_context())
+            if len(attempts) == 1:
+                raise constants.TestException
+
+        outer = retry_factory(
+            retry_factory(
+                inner,
+                exceptions=constants.TestException,
+                init_backoff=0,
+                expose_attempt=True,
+            ),
+            exceptions=ValueError,
+            expose_attempt=True,
+        )
+        outer()
+        last = attempts[-1]
+        assert last is not None
+        self.assertEqual(last.number, 2)
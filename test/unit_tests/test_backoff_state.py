@@ -0,0 +1,122 @@
+"""Unit tests for the class BackoffState"""
+
+import logging
+import unittest
+
+from mock import AsyncMock, Mock, patch
+
+from tubthumper import BackoffState, RetryError, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+def _host(host: str) -> str:
+    """Key of calls to a host"""
+    return host
+
+
+class TestBackoffState(unittest.TestCase):
+    """Test case for the backoff state"""
+
+    def test_escalate(self):
+        """Test a key's backoff duration only grows when escalated"""
+        state = BackoffState()
+        self.assertEqual(state.level("key"), 0)
+        state.escalate("key", 4)
+        state.escalate("key", 2)
+        self.assertEqual(state.level("key"), 4)
+
+    def test_recover(self):
+        """Test a key's backoff duration decays, until forgotten at the floor"""
+        state = BackoffState(decay=0.5)
+        state.recover("key", 1)
+        state.escalate("key", 4)
+        state.recover("key", 1)
+        self.assertEqual(state.level("key"), 2)
+        state.recover("key", 1)
+        self.assertEqual(state.levels(), {})
+
+    def test_lru(self):
+        """Test the least recently used key is forgotten once full"""
+        state = BackoffState(max_keys=2)
+        state.escalate("a", 1)
+        state.escalate("b", 1)
+        state.escalate("a", 1)
+        state.escalate("c", 1)
+        self.assertEqual(list(state.levels()), ["a", "c"])
+
+
+class TestBackoffStateRetryAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying coroutines with a backoff state"""
+
+    async def test_escalate(self):
+        """Test retries of a call giving up raise the shared backoff duration"""
+        state = BackoffState()
+        wrapped_func = retry_factory(
+            AsyncMock(side_effect=constants.TestException),
+            exceptions=constants.TestException,
+            retry_limit=2,
+            init_backoff=0.001,
+            exponential=2,
+            jitter=False,
+            backoff_state=state,
+        )
+        with self.assertRaises(RetryError):
+            await wrapped_func(*constants.ARGS)
+        self.assertEqual(state.level((constants.ARGS, ())), 0.008)
+
+
+class TestBackoffStateRetry(unittest.TestCase):
+    """Test case for retrying functions with a backoff state"""
+
+    def test_inherit(self):
+        """Test a new call starts backing off from the shared backoff duration"""
+        state = BackoffState(key=_host)
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=1,
+            exponential=2,
+            jitter=False,
+            backoff_state=state,
+        )
+        state.escalate("db-1", 8)
+        with patch("tubthumper._retry_factory.time.sleep") as sleep:
+            self.assertEqual(wrapped_func("db-1"), 1)
+        sleep.assert_called_once_with(8)
+        self.assertEqual(state.level("db-1"), 8)
+
+    def test_escalate(self):
+        """Test retries raise the shared backoff duration"""
+        state = BackoffState()
+        func = Mock(side_effect=[constants.TestException, constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0.001,
+            exponential=2,
+            jitter=False,
+            backoff_state=state,
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(state.levels(), {((), ()): 0.002})
+
+    def test_recover(self):
+        """Test calls returning successfully shrink the shared backoff duration"""
+        state = BackoffState()
+        wrapped_func = retry_factory(
+            Mock(return_value=1),
+            exceptions=constants.TestException,
+            init_backoff=1,
+            backoff_state=state,
+        )
+        state.escalate(((), ()), 8)
+        wrapped_func()
+        self.assertEqual(state.level(((), ())), 4)
+        wrapped_func()
+        wrapped_func()
+        self.assertEqual(state.levels(), {})
@@ -0,0 +1,241 @@
+"""Unit tests for the class Bulkhead"""
+
+import asyncio
+import logging
+import threading
+import unittest
+
+from mock import AsyncMock, Mock
+
+from tubthumper import Bulkhead, RetryError, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestBulkhead(unittest.TestCase):
+    """Test case for the bulkhead"""
+
+    def test_fast_reject(self):
+        """Test a call beyond the concurrency limit is rejected right away by default"""
+        bulkhead = Bulkhead(2)
+        self.assertTrue(bulkhead.acquire())
+        self.assertTrue(bulkhead.acquire())
+        self.assertFalse(bulkhead.acquire())
+        bulkhead.release()
+        self.assertTrue(bulkhead.acquire())
+        self.assertEqual(
+            bulkhead.stats(),
+            {
+                "in_flight": 2,
+                "queued": 0,
+                "backing_off": 0,
+                "rejected": 1,
+                "rejected_backoff": 0,
+            },
+        )
+
+    def test_queue(self):
+        """Test a queued call proceeds once a call in flight finishes"""
+        bulkhead = Bulkhead(1, queue_timeout=60)
+        bulkhead.acquire()
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(bulkhead.acquire()))
+        thread.start()
+        while not bulkhead.stats()["queued"]:
+            pass
+        bulkhead.release()
+        thread.join()
+        self.assertEqual(acquired, [True])
+
+    def test_spurious_wakeup(self):
+        """Test a queued call woken without a free slot queues up again"""
+        bulkhead = Bulkhead(1, queue_timeout=60)
+        bulkhead.acquire()
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(bulkhead.acquire()))
+        thread.start()
+        while not bulkhead.stats()["queued"]:
+            pass
+        with bulkhead._lock:
+            bulkhead._waiters.popleft()()
+        while not bulkhead.stats()["queued"]:
+            pass
+        bulkhead.release()
+        thread.join()
+        self.assertEqual(acquired, [True])
+
+    def test_queue_timeout(self):
+        """Test a queued call is rejected after the queue timeout"""
+        bulkhead = Bulkhead(1, queue_timeout=0.01)
+        bulkhead.acquire()
+        self.assertFalse(bulkhead.acquire())
+        self.assertEqual(bulkhead.stats()["queued"], 0)
+        self.assertEqual(bulkhead.stats()["rejected"], 1)
+
+    def test_backoff(self):
+        """Test callers beyond the limit on backing off are rejected"""
+        bulkhead = Bulkhead(max_waiting=1)
+        self.assertTrue(bulkhead.start_backoff())
+        self.assertFalse(bulkhead.start_backoff())
+        bulkhead.end_backoff()
+        self.assertTrue(bulkhead.start_backoff())
+        self.assertEqual(bulkhead.stats()["rejected_backoff"], 1)
+
+    def test_named(self):
+        """Test a named bulkhead is shared"""
+        bulkhead = Bulkhead.named("test_named", 3)
+        self.assertIs(Bulkhead.named("test_named"), bulkhead)
+        self.assertIs(Bulkhead.named("test_named", 3), bulkhead)
+        self.assertEqual(bulkhead.max_concurrent, 3)
+        self.assertEqual(bulkhead.queue_timeout, 0)
+
+    def test_named_mismatch(self):
+        """Test a named bulkhead can't be asked for with different limits"""
+        Bulkhead.named("test_named_mismatch", 3)
+        with self.assertRaisesRegex(ValueError, "max_concurrent=3, not 4"):
+            Bulkhead.named("test_named_mismatch", 4)
+
+    def test_woken_timing_out(self):
+        """Test a caller woken while timing out passes the wakeup on"""
+        bulkhead = Bulkhead()
+        wake = Mock()
+        bulkhead._waiters.append(wake)
+        bulkhead._stop_waiting(Mock(), timed_out=True)
+        wake.assert_called_once_with()
+        self.assertEqual(bulkhead.stats()["queued"], 0)
+        self.assertEqual(bulkhead.stats()["rejected"], 1)
+        bulkhead._stop_waiting(Mock(), timed_out=False)
+        self.assertEqual(bulkhead.stats()["rejected"], 1)
+
+
+class TestBulkheadAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for the bulkhead with coroutines"""
+
+    async def test_queue(self):
+        """Test a queued coroutine proceeds once a call in flight finishes"""
+        bulkhead = Bulkhead(1, queue_timeout=60)
+        await bulkhead.acquire_async()
+        asyncio.get_running_loop().call_later(0.01, bulkhead.release)
+        self.assertTrue(await bulkhead.acquire_async())
+
+    async def test_spurious_wakeup(self):
+        """Test a queued coroutine woken without a free slot queues up again"""
+        bulkhead = Bulkhead(1, queue_timeout=60)
+        await bulkhead.acquire_async()
+        task = asyncio.ensure_future(bulkhead.acquire_async())
+        while not bulkhead.stats()["queued"]:
+            await asyncio.sleep(0)
+        bulkhead._waiters.popleft()()
+        while not bulkhead.stats()["queued"]:
+            await asyncio.sleep(0)
+        bulkhead.release()
+        self.assertTrue(await task)
+
+    async def test_queue_timeout(self):
+        """Test a queued coroutine is rejected after the queue timeout"""
+        bulkhead = Bulkhead(1, queue_timeout=0.01)
+        await bulkhead.acquire_async()
+        self.assertFalse(await bulkhead.acquire_async())
+        self.assertEqual(bulkhead.stats()["queued"], 0)
+
+    async def test_woken_cancelled(self):
+        """Test a coroutine cancelled once woken passes the wakeup on"""
+        bulkhead = Bulkhead(1, queue_timeout=60)
+        await bulkhead.acquire_async()
+        first = asyncio.ensure_future(bulkhead.acquire_async())
+        second = asyncio.ensure_future(bulkhead.acquire_async())
+        while bulkhead.stats()["queued"] < 2:
+            await asyncio.sleep(0)
+        bulkhead.release()
+        first.cancel()
+        self.assertTrue(await asyncio.wait_for(second, 1))
+        self.assertTrue(first.cancelled())
+
+    async def test_cancelled(self):
+        """Test a coroutine cancelled while queued isn't queued anymore"""
+        bulkhead = Bulkhead(1, queue_timeout=60)
+        await bulkhead.acquire_async()
+        task = asyncio.ensure_future(bulkhead.acquire_async())
+        while not bulkhead.stats()["queued"]:
+            await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(bulkhead.stats()["queued"], 0)
+
+    async def test_full(self):
+        """Test a coroutine isn't awaited while the bulkhead is full"""
+        bulkhead = Bulkhead(1)
+        bulkhead.acquire()
+        func = AsyncMock()
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, bulkhead=bulkhead
+        )
+        with self.assertRaisesRegex(RetryError, "Bulkhead full"):
+            await wrapped_func()
+        func.assert_not_awaited()
+
+    async def test_released(self):
+        """Test slots are released after each attempt & backoff"""
+        bulkhead = Bulkhead(1)
+        func = AsyncMock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0, bulkhead=bulkhead
+        )
+        self.assertEqual(await wrapped_func(), 1)
+        self.assertEqual(bulkhead.stats()["in_flight"], 0)
+        self.assertEqual(bulkhead.stats()["backing_off"], 0)
+
+
+class TestBulkheadRetry(unittest.TestCase):
+    """Test case for retrying functions with a bulkhead"""
+
+    def test_full(self):
+        """Test a function isn't called while the bulkhead is full"""
+        bulkhead = Bulkhead(1)
+        bulkhead.acquire()
+        func = Mock()
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, bulkhead=bulkhead
+        )
+        with self.assertRaisesRegex(RetryError, "Bulkhead full"):
+            wrapped_func()
+        func.assert_not_called()
+
+    def test_backoff_full(self):
+        """Test a caller is rejected rather than retried when too many are backing off"""
+        bulkhead = Bulkhead(max_waiting=0)
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, bulkhead=bulkhead
+        )
+        with self.assertRaisesRegex(RetryError, "Bulkhead full"):
+            wrapped_func()
+        func.assert_called_once_with()
+        self.assertEqual(bulkhead.stats()["in_flight"], 0)
+
+    def test_released(self):
+        """Test slots are released after each attempt & backoff"""
+        bulkhead = Bulkhead(1)
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0, bulkhead=bulkhead
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(bulkhead.stats()["in_flight"], 0)
+        self.assertEqual(bulkhead.stats()["backing_off"], 0)
+
+    def test_released_not_retried(self):
+        """Test a slot is released when an exception isn't retried"""
+        bulkhead = Bulkhead(1)
+        wrapped_func = retry_factory(
+            Mock(side_effect=ValueError),
+            exceptions=constants.TestException,
+            bulkhead=bulkhead,
+        )
+        with self.assertRaises(ValueError):
+            wrapped_func()
+        self.assertEqual(bulkhead.stats()["in_flight"], 0)
@@ -0,0 +1,184 @@
+"""Unit tests for coalescing concurrent calls with equal keys"""
+
+import asyncio
+import logging
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from mock import Mock
+
+from tubthumper import RetryError, retry_decorator, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+CALLERS = 5
+
+
+class TestCoalesceAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for coalescing concurrent calls of coroutines"""
+
+    async def test_shared_result(self):
+        """Test concurrent calls with equal arguments share one execution's result"""
+        calls = 0
+
+        @retry_decorator(exceptions=constants.TestException, coalesce=True)
+        async def func(*args: Any, **kwargs: Any) -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(
+            *(func(*constants.ARGS, **constants.KWARGS) for _ in range(CALLERS))
+        )
+        self.assertEqual(results, [1] * CALLERS)
+        self.assertEqual(await func(*constants.ARGS, **constants.KWARGS), 2)
+
+    async def test_shared_exception(self):
+        """Test concurrent calls with equal arguments share one execution's exception"""
+        calls = 0
+
+        @retry_decorator(
+            exceptions=constants.TestException,
+            retry_limit=1,
+            init_backoff=0,
+            coalesce=True,
+        )
+        async def func() -> None:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise constants.TestException
+
+        results = await asyncio.gather(
+            *(func() for _ in range(CALLERS)), return_exceptions=True
+        )
+        for result in results:
+            self.assertIsInstance(result, RetryError)
+        self.assertEqual(calls, 2)
+
+    async def test_key(self):
+        """Test calls are coalesced by the provided key function"""
+        calls = []
+
+        def parity(number: int) -> int:
+            return number % 2
+
+        @retry_decorator(exceptions=constants.TestException, coalesce=parity)
+        async def func(number: int) -> int:
+            calls.append(number)
+            await asyncio.sleep(0.01)
+            return number
+
+        results = await asyncio.gather(func(1), func(2), func(3))
+        self.assertEqual(results, [1, 2, 1])
+        self.assertEqual(calls, [1, 2])
+
+    async def test_leader_cancelled(self):
+        """Test a follower takes over the execution when the leader is cancelled"""
+        calls = 0
+
+        @retry_decorator(exceptions=constants.TestException, coalesce=True)
+        async def func() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        leader = asyncio.ensure_future(func())
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(func()) for _ in range(CALLERS)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        self.assertEqual(await asyncio.gather(*followers), [2] * CALLERS)
+        self.assertTrue(leader.cancelled())
+
+    async def test_follower_cancelled(self):
+        """Test cancelling a follower leaves the shared execution running"""
+
+        @retry_decorator(exceptions=constants.TestException, coalesce=True)
+        async def func() -> int:
+            await asyncio.sleep(0.01)
+            return 1
+
+        leader = asyncio.ensure_future(func())
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(func())
+        await asyncio.sleep(0)
+        follower.cancel()
+        self.assertEqual(await leader, 1)
+        self.assertTrue(follower.cancelled())
+
+
+class TestCoalesce(unittest.TestCase):
+    """Test case for coalescing concurrent calls of functions"""
+
+    def test_shared_result(self):
+        """Test concurrent calls with equal arguments share one execution's result"""
+        release = threading.Event()
+
+        def side_effect(*args: Any, **kwargs: Any) -> int:
+            release.wait()
+            return 1
+
+        func = Mock(side_effect=side_effect)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, coalesce=True
+        )
+        with ThreadPoolExecutor(CALLERS) as executor:
+            futures = [
+                executor.submit(wrapped_func, *constants.ARGS, **constants.KWARGS)
+                for _ in range(CALLERS)
+            ]
+            time.sleep(0.1)
+            release.set()
+            results = [future.result() for future in futures]
+        self.assertEqual(results, [1] * CALLERS)
+        func.assert_called_once_with(*constants.ARGS, **constants.KWARGS)
+
+    def test_shared_exception(self):
+        """Test concurrent calls with equal arguments share one execution's exception"""
+        release = threading.Event()
+
+        def side_effect() -> None:
+            release.wait()
+            raise constants.TestException
+
+        func = Mock(side_effect=side_effect)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            coalesce=True,
+        )
+        with ThreadPoolExecutor(CALLERS) as executor:
+            futures = [executor.submit(wrapped_func) for _ in range(CALLERS)]
+            time.sleep(0.1)
+            release.set()
+            for future in futures:
+                self.assertIsInstance(future.exception(), RetryError)
+        func.assert_called_once_with()
+
+    def test_sequential(self):
+        """Test calls that don't overlap aren't coalesced"""
+        func = Mock(return_value=1)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, coalesce=True
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(func.call_count, 2)
+
+    def test_unhashable(self):
+        """Test the default key requires hashable arguments"""
+        wrapped_func = retry_factory(
+            Mock(), exceptions=constants.TestException, coalesce=True
+        )
+        with self.assertRaises(TypeError):
+            wrapped_func([])
@@ -0,0 +1,417 @@
+"""Unit tests for the dead-letter stores"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+import weakref
+from typing import Any, List
+
+from mock import DEFAULT, AsyncMock, Mock, patch
+
+from tubthumper import (
+    DeadLetter,
+    DeadLetterStore,
+    FileDeadLetterStore,
+    RetryBudget,
+    RetryError,
+    SQLiteDeadLetterStore,
+    retry_factory,
+)
+from tubthumper._budget import _lock_file, _unlock_file
+from tubthumper._dead_letter import _flush_open_stores, qualified_name
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestDeadLetter(unittest.TestCase):
+    """Test case for dead-letter records"""
+
+    def test_from_call(self):
+        """Test a dead letter records the call's arguments and exception chain"""
+        try:
+            try:
+                raise ValueError("inner")
+            except ValueError as inner:
+                raise KeyError("outer") from inner
+        except KeyError as exc:
+            letter = DeadLetter.from_call(
+                "module.func",
+                constants.ARGS,
+                constants.KWARGS,
+                exc=exc,
+                elapsed=1.5,
+                attempts=2,
+            )
+        self.assertEqual(letter.qualname, "module.func")
+        self.assertEqual(letter.args, constants.ARGS)
+        self.assertEqual(letter.kwargs, constants.KWARGS)
+        self.assertTrue(letter.replayable)
+        self.assertEqual(
+            letter.exceptions,
+            (("builtins.KeyError", "'outer'"), ("builtins.ValueError", "inner")),
+        )
+        self.assertEqual(letter.elapsed, 1.5)
+        self.assertEqual(letter.attempts, 2)
+        self.assertLess(letter.started, time.time() - 1.5 + 1)
+
+    def test_unserializable(self):
+        """Test a call with arguments that can't be serialized isn't replayable"""
+        letter = DeadLetter.from_call(
+            "module.func",
+            (object(),),
+            {"a": {1, 2}},
+            exc=KeyError(),
+            elapsed=0,
+            attempts=1,
+        )
+        self.assertFalse(letter.replayable)
+        self.assertRegex(letter.args[0], "^<object object at")
+        self.assertEqual(letter.kwargs, {"a": "{1, 2}"})
+
+    def test_json(self):
+        """Test a dead letter survives a round trip through JSON"""
+        letter = DeadLetter.from_call(
+            "module.func",
+            constants.ARGS,
+            constants.KWARGS,
+            exc=KeyError(),
+            elapsed=0,
+            attempts=1,
+        )
+        self.assertEqual(DeadLetter.from_json(letter.to_json()), letter)
+
+
+class _TestStore:
+    """Tests shared by each dead-letter store implementation"""
+
+    assertEqual: Any
+    assertTrue: Any
+    addCleanup: Any
+
+    def _store(self, path: str, **kwargs: Any) -> DeadLetterStore:
+        raise NotImplementedError
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "dead_letters")
+
+    def _letter(self, qualname: str = "module.func") -> DeadLetter:
+        return DeadLetter.from_call(
+            qualname, constants.ARGS, {}, exc=KeyError(), elapsed=0, attempts=1
+        )
+
+    def test_batch(self):
+        """Test records are written once the batch is full"""
+        store = self._store(self.path, batch_size=2, flush_interval=60)
+        first = self._letter()
+        store.record(first)
+        self.assertEqual(store.read(), [])
+        second = self._letter()
+        store.record(second)
+        self.assertEqual(store.read(), [first, second])
+        store.close()
+
+    def test_flush_interval(self):
+        """Test records are written after the flush interval"""
+        store = self._store(self.path, flush_interval=0.01)
+        letter = self._letter()
+        store.record(letter)
+        time.sleep(0.2)
+        self.assertEqual(store.read(), [letter])
+        store.close()
+
+    def test_durable(self):
+        """Test buffered records are written on close, and read by a new store"""
+        store = self._store(self.path)
+        letter = self._letter()
+        store.record(letter)
+        store.close()
+        other_store = self._store(self.path)
+        self.assertEqual(other_store.read(), [letter])
+        other_store.close()
+
+    def test_exit(self):
+        """Test buffered records of open stores are written as the interpreter exits"""
+        store = self._store(self.path, flush_interval=60)
+        letter = self._letter()
+        store.record(letter)
+        _flush_open_stores()
+        self.assertEqual(store.read(), [letter])
+        store.close()
+
+    def test_replay(self):
+        """Test replaying deletes the records of calls that succeed"""
+        func = Mock(side_effect=[1, constants.TestException])
+        store = self._store(self.path)
+        letters = [self._letter(), self._letter()]
+        other_letter = self._letter("module.other_func")
+        for letter in [*letters, other_letter]:
+            store.record(DeadLetter.from_json(letter.to_json()))
+        store.flush()
+        store.close()
+        # replaying from a new store, with a function of the same name
+        store = self._store(self.path)
+        func.__module__ = "module"
+        func.__qualname__ = "func"
+        self.assertEqual(store.replay(func), 1)
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(store.read(), [letters[1], other_letter])
+        store.close()
+
+
+class TestSQLiteDeadLetterStore(_TestStore, unittest.TestCase):
+    """Test case for the SQLite dead-letter store"""
+
+    def _store(self, path: str, **kwargs: Any) -> DeadLetterStore:
+        return SQLiteDeadLetterStore(path, **kwargs)
+
+
+class TestFileDeadLetterStore(_TestStore, unittest.TestCase):
+    """Test case for the file dead-letter store"""
+
+    def _store(self, path: str, **kwargs: Any) -> DeadLetterStore:
+        return FileDeadLetterStore(path, **kwargs)
+
+    def test_missing_file(self):
+        """Test a store whose file doesn't exist yet has no records"""
+        store = self._store(self.path)
+        self.assertEqual(store.read(), [])
+        self.assertEqual(store.replay(Mock()), 0)
+        store.close()
+
+    def test_locked(self):
+        """Test writes wait for the lock on the file held by another process"""
+        store = self._store(self.path)
+        store.record(self._letter())
+        fileno = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT)
+        self.addCleanup(os.close, fileno)
+        _lock_file(fileno)
+        try:
+            thread = threading.Thread(target=store.flush)
+            thread.start()
+            thread.join(0.1)
+            self.assertTrue(thread.is_alive())
+            self.assertFalse(os.path.exists(self.path))
+        finally:
+            _unlock_file(fileno)
+        thread.join()
+        self.assertEqual(len(store.read()), 1)
+        store.close()
+
+    def test_not_kept_alive(self):
+        """Test a store isn't kept alive to be flushed as the interpreter exits"""
+        store = self._store(self.path)
+        ref = weakref.ref(store)
+        del store
+        self.assertIsNone(ref())
+
+
+class TestDeadLetterRetryAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for recording & replaying coroutines that give up"""
+
+    async def test_replay(self):
+        """Test a coroutine that gave up is replayed through the same retry logic"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SQLiteDeadLetterStore(os.path.join(tmp_dir, "dead_letters"))
+            func = AsyncMock(side_effect=[constants.TestException] * 3 + [1])
+            wrapped_func = retry_factory(
+                func,
+                exceptions=constants.TestException,
+                retry_limit=1,
+                init_backoff=0,
+                dead_letter=store,
+            )
+            with self.assertRaises(RetryError):
+                await wrapped_func(*constants.ARGS, **constants.KWARGS)
+            self.assertEqual(await store.replay_async(wrapped_func), 1)
+            func.assert_awaited_with(*constants.ARGS, **constants.KWARGS)
+            self.assertEqual(func.await_count, 4)
+            self.assertEqual(store.read(), [])
+            store.close()
+
+    async def test_replay_in_thread(self):
+        """Test dead letters are read and deleted without blocking the event loop"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = FileDeadLetterStore(os.path.join(tmp_dir, "dead_letters"))
+            wrapped_func = retry_factory(
+                AsyncMock(return_value=1),
+                exceptions=constants.TestException,
+                dead_letter=store,
+            )
+            store.record(
+                DeadLetter.from_call(
+                    qualified_name(wrapped_func),
+                    (),
+                    {},
+                    exc=KeyError(),
+                    elapsed=0,
+                    attempts=1,
+                )
+            )
+            threads: List[int] = []
+
+            def side_effect(*args: Any) -> Any:
+                threads.append(threading.get_ident())
+                return DEFAULT
+
+            with (
+                patch.object(store, "read", wraps=store.read, side_effect=side_effect),
+                patch.object(
+                    store, "_delete", wraps=store._delete, side_effect=side_effect
+                ),
+            ):
+                self.assertEqual(await store.replay_async(wrapped_func), 1)
+            self.assertEqual(len(threads), 2)
+            self.assertNotIn(threading.get_ident(), threads)
+            self.assertEqual(store.read(), [])
+            store.close()
+
+    async def test_replay_failure(self):
+        """Test a coroutine that fails again when replayed is kept"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SQLiteDeadLetterStore(os.path.join(tmp_dir, "dead_letters"))
+            func = AsyncMock(side_effect=constants.TestException)
+            wrapped_func = retry_factory(
+                func,
+                exceptions=constants.TestException,
+                retry_limit=0,
+                dead_letter=store,
+            )
+            with self.assertRaises(RetryError):
+                await wrapped_func()
+            self.assertEqual(await store.replay_async(wrapped_func), 0)
+            self.assertEqual(func.await_count, 2)
+            self.assertEqual(len(store.read()), 1)
+            store.close()
+
+
+class TestDeadLetterRetry(unittest.TestCase):
+    """Test case for recording & replaying functions that give up"""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.store = FileDeadLetterStore(os.path.join(tmp_dir.name, "dead_letters"))
+        self.addCleanup(self.store.close)
+
+    def test_retry_limit(self):
+        """Test a call reaching its retry limit is recorded"""
+        func = Mock(side_effect=constants.TestException("nope"))
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=1,
+            init_backoff=0,
+            reraise=True,
+            dead_letter=self.store,
+        )
+        with self.assertRaises(constants.TestException):
+            wrapped_func(*constants.ARGS, **constants.KWARGS)
+        self.store.flush()
+        (letter,) = self.store.read()
+        self.assertEqual(letter.args, constants.ARGS)
+        self.assertEqual(letter.kwargs, constants.KWARGS)
+        self.assertEqual(letter.exceptions, (("builtins.KeyError", "'nope'"),))
+        self.assertEqual(letter.attempts, 2)
+
+    def test_success(self):
+        """Test a call that succeeds isn't recorded"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            dead_letter=self.store,
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.store.flush()
+        self.assertEqual(self.store.read(), [])
+
+    def test_result(self):
+        """Test a call giving up on its returned object is recorded"""
+        func = Mock(return_value=None)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            retry_limit=0,
+            dead_letter=self.store,
+        )
+        with self.assertRaises(RetryError):
+            wrapped_func()
+        self.store.flush()
+        (letter,) = self.store.read()
+        self.assertEqual(
+            letter.exceptions,
+            (("tubthumper._retry_factory.RetryError", "Retry limit 0 reached"),),
+        )
+
+    def test_circuit_breaker_open(self):
+        """Test a call failed fast by an open circuit breaker is recorded"""
+        budget = RetryBudget(min_attempts=1, failure_threshold=0)
+        self.addCleanup(budget.close)
+        budget.start()
+        budget.record_failure()
+        wrapped_func = retry_factory(
+            Mock(),
+            exceptions=constants.TestException,
+            budget=budget,
+            dead_letter=self.store,
+        )
+        with self.assertRaisesRegex(RetryError, "Circuit breaker open"):
+            wrapped_func()
+        self.store.flush()
+        (letter,) = self.store.read()
+        self.assertEqual(letter.attempts, 0)
+
+    def test_replay_failure(self):
+        """Test a replay that fails again is kept as is, rather than recorded again"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            dead_letter=self.store,
+        )
+        with self.assertRaises(RetryError):
+            wrapped_func()
+        self.assertEqual(self.store.replay(wrapped_func), 0)
+        self.store.flush()
+        self.assertEqual(len(self.store.read()), 1)
+
+    def test_record_failure(self):
+        """Test a failure to record the call is logged, not raised instead"""
+        store = Mock(spec=DeadLetterStore)
+        store.record.side_effect = OSError("disk full")
+        wrapped_func = retry_factory(
+            Mock(side_effect=constants.TestException),
+            exceptions=constants.TestException,
+            retry_limit=0,
+            dead_letter=store,
+        )
+        with self.assertLogs(tubthumper_logger, logging.ERROR) as logs:
+            with self.assertRaisesRegex(RetryError, "Retry limit 0 reached"):
+                wrapped_func()
+        self.assertIn("disk full", logs.output[0])
+
+    def test_not_replayable(self):
+        """Test a call with arguments that can't be serialized isn't replayed"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            dead_letter=self.store,
+        )
+        with self.assertRaises(RetryError):
+            wrapped_func(object())
+        func.reset_mock()
+        self.assertEqual(self.store.replay(wrapped_func), 0)
+        func.assert_not_called()
@@ -0,0 +1,226 @@
+"""Unit tests for deadlines & retries propagated through nested calls with retry logic"""
+
+import asyncio
+import itertools
+import logging
+import time
+import unittest
+
+from mock import AsyncMock, Mock, patch
+
+from tubthumper import RetryError, deadline, retry_factory, retry_to_thread
+from tubthumper._retry_factory import _wake_up
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestDeadlineAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for deadlines with coroutines"""
+
+    async def test_nested(self):
+        """Test an inner coroutine's retries are limited by the outer time limit"""
+        inner_func = AsyncMock(side_effect=constants.TestException)
+        inner = retry_factory(
+            inner_func,
+            exceptions=constants.TestException,
+            init_backoff=60,
+            jitter=False,
+        )
+        outer = retry_factory(inner, exceptions=ValueError, time_limit=30)
+        with self.assertRaisesRegex(RetryError, "Deadline exceeded"):
+            await outer()
+        inner_func.assert_awaited_once_with()
+
+    async def test_task(self):
+        """Test a deadline propagates to tasks created within it"""
+        func = AsyncMock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=60, jitter=False
+        )
+        with deadline(30):
+            task = asyncio.ensure_future(wrapped_func())
+        with self.assertRaisesRegex(RetryError, "Deadline exceeded"):
+            await task
+
+    async def test_thread(self):
+        """Test a deadline propagates to retry_to_thread"""
+        func = Mock(side_effect=constants.TestException)
+        with deadline(30), self.assertRaisesRegex(RetryError, "Deadline exceeded"):
+            await retry_to_thread(
+                func, exceptions=constants.TestException, init_backoff=60, jitter=False
+            )
+
+    async def test_loop_time(self):
+        """Test a coroutine's time limit is measured with the event loop's clock"""
+        loop = asyncio.get_running_loop()
+        func = AsyncMock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0, time_limit=10
+        )
+        clock = itertools.chain([0.0], itertools.repeat(20.0))
+        with patch.object(loop, "time", side_effect=lambda: next(clock)):
+            with self.assertRaisesRegex(RetryError, "Time limit 10 exceeded"):
+                await wrapped_func()
+        func.assert_awaited_once_with()
+
+    async def test_loop_clock_inherited(self):
+        """Test a coroutine inherits a deadline converted to the event loop's clock"""
+        loop = asyncio.get_running_loop()
+        func = AsyncMock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0
+        )
+        with patch.object(loop, "time", side_effect=lambda: time.monotonic() + 1000):
+            with deadline(30):
+                self.assertEqual(await wrapped_func(), 1)
+
+    async def test_loop_clock_published(self):
+        """Test a coroutine's time limit is converted from the event loop's clock for calls within it"""
+        loop = asyncio.get_running_loop()
+        func = Mock(side_effect=[constants.TestException, 1])
+        inner = retry_factory(func, exceptions=constants.TestException, init_backoff=0)
+
+        async def outer_func() -> int:
+            return inner()
+
+        outer = retry_factory(outer_func, exceptions=ValueError, time_limit=30)
+        with patch.object(loop, "time", side_effect=lambda: time.monotonic() - 1000):
+            self.assertEqual(await outer(), 1)
+
+    async def test_wake_up_at(self):
+        """Test a coroutine sleeping in backoff wakes up at the loop time of its next attempt"""
+        loop = asyncio.get_running_loop()
+        func = AsyncMock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0.01, jitter=False
+        )
+        with patch.object(loop, "call_at", wraps=loop.call_at) as call_at:
+            start = loop.time()
+            self.assertEqual(await wrapped_func(), 1)
+        (when, *_), _ = call_at.call_args
+        self.assertGreaterEqual(when, start + 0.01)
+        self.assertGreaterEqual(loop.time(), when)
+
+    async def test_wake_up_cancelled(self):
+        """Test waking up a coroutine cancelled while sleeping in backoff does nothing"""
+        future = asyncio.get_running_loop().create_future()
+        future.cancel()
+        _wake_up(future)
+        self.assertTrue(future.cancelled())
+
+
+class TestDeadline(unittest.TestCase):
+    """Test case for deadlines with functions"""
+
+    def setUp(self):
+        self.func = Mock(side_effect=constants.TestException)
+        self.wrapped_func = retry_factory(
+            self.func, exceptions=constants.TestException, init_backoff=60, jitter=False
+        )
+
+    def test_deadline(self):
+        """Test retries that would end after the deadline are prevented"""
+        with deadline(30), self.assertRaisesRegex(RetryError, "Deadline exceeded"):
+            self.wrapped_func()
+        self.func.assert_called_once_with()
+
+    def test_tightest_wins(self):
+        """Test the tightest of nested deadlines wins"""
+        with deadline(30), deadline(3600):
+            with self.assertRaisesRegex(RetryError, "Deadline exceeded"):
+                self.wrapped_func()
+        with deadline(3600), deadline(30):
+            with self.assertRaisesRegex(RetryError, "Deadline exceeded"):
+                self.wrapped_func()
+
+    def test_time_limit_wins(self):
+        """Test a time limit tighter than the deadline is reported as such"""
+        wrapped_func = retry_factory(
+            self.func,
+            exceptions=constants.TestException,
+            time_limit=30,
+            init_backoff=60,
+            jitter=False,
+        )
+        with deadline(3600), self.assertRaisesRegex(RetryError, "Time limit 30"):
+            wrapped_func()
+
+    def test_reset(self):
+        """Test the deadline no longer applies after leaving it"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0.01
+        )
+        with deadline(0):
+            pass
+        self.assertEqual(wrapped_func(), 1)
+
+
+class TestDeferToOuter(unittest.TestCase):
+    """Test case for deferring retries to enclosing calls with retry logic"""
+
+    def test_defer(self):
+        """Test an inner call raises exceptions the outer call retries right away"""
+        inner_func = Mock(side_effect=constants.TestException)
+        inner = retry_factory(
+            inner_func,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            defer_to_outer=True,
+        )
+        outer = retry_factory(
+            inner, exceptions=constants.TestException, retry_limit=1, init_backoff=0
+        )
+        with deadline(3600), self.assertRaisesRegex(RetryError, "Retry limit 1"):
+            outer()
+        self.assertEqual(inner_func.call_count, 2)
+
+    def test_created_within_outer(self):
+        """Test an inner call created within the outer call defers to it on the first call"""
+        leaf = Mock(side_effect=constants.TestException)
+
+        def func() -> None:
+            inner = retry_factory(
+                leaf,
+                exceptions=constants.TestException,
+                retry_limit=3,
+                init_backoff=0,
+                defer_to_outer=True,
+            )
+            inner()
+
+        outer = retry_factory(
+            func, exceptions=constants.TestException, retry_limit=1, init_backoff=0
+        )
+        for _ in range(2):
+            leaf.reset_mock()
+            with self.assertRaisesRegex(RetryError, "Retry limit 1"):
+                outer()
+            self.assertEqual(leaf.call_count, 2)
+
+    def test_not_retried_by_outer(self):
+        """Test an inner call retries exceptions the outer call doesn't"""
+        inner_func = Mock(side_effect=[constants.TestException, 1])
+        inner = retry_factory(
+            inner_func,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            defer_to_outer=True,
+        )
+        outer = retry_factory(inner, exceptions=ValueError)
+        self.assertEqual(outer(), 1)
+        self.assertEqual(inner_func.call_count, 2)
+
+    def test_no_outer(self):
+        """Test a call retries as usual without an enclosing call with retry logic"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            defer_to_outer=True,
+        )
+        self.assertEqual(wrapped_func(), 1)
@@ -0,0 +1,144 @@
+"""Unit tests for the class EndpointPool"""
+
+import logging
+import unittest
+from typing import Any, List
+
+from mock import patch
+
+from tubthumper import EndpointPool, attempt_context, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+def _endpoint() -> Any:
+    """Endpoint chosen for the attempt in progress"""
+    attempt = attempt_context()
+    assert attempt is not None
+    return attempt.endpoint
+
+
+class TestEndpointPool(unittest.TestCase):
+    """Test case for the endpoint pool"""
+
+    def test_empty(self):
+        """Test a pool needs at least one endpoint"""
+        with self.assertRaises(ValueError):
+            EndpointPool([])
+
+    def test_ejection(self):
+        """Test a failing endpoint is ejected, then chosen again after a while"""
+        pool = EndpointPool(["a", "b"], decay=0.4, ejection_time=10)
+        with patch("tubthumper._endpoints.time") as time:
+            time.monotonic.return_value = 0.0
+            pool.record(0, 0.1, ok=False)
+            self.assertFalse(pool.stats()[0]["ejected"])
+            pool.record(0, 0.1, ok=False)
+            self.assertTrue(pool.stats()[0]["ejected"])
+            self.assertEqual({pool.choose() for _ in range(20)}, {1})
+            self.assertFalse(pool.has_healthy(1))
+            time.monotonic.return_value = 10.0
+            self.assertTrue(pool.has_healthy(1))
+
+    def test_all_ejected(self):
+        """Test the endpoint ejected the soonest is chosen when all are"""
+        pool = EndpointPool(["a", "b"], max_error_rate=0)
+        pool.record(1, 0.1, ok=False)
+        pool.record(0, 0.1, ok=False)
+        self.assertEqual(pool.choose(), 1)
+
+    def test_not_tried(self):
+        """Test endpoints not yet tried in a call are preferred"""
+        pool = EndpointPool(["a", "b", "c"])
+        self.assertEqual(pool.choose(tried={0, 2}), 1)
+        self.assertIn(pool.choose(tried={0, 1, 2}), {0, 1, 2})
+
+    def test_weighted(self):
+        """Test faster endpoints are chosen more often"""
+        pool = EndpointPool(["slow", "fast"], decay=1)
+        pool.record(0, 1, ok=True)
+        pool.record(1, 0.001, ok=True)
+        choices = [pool.choose() for _ in range(100)]
+        self.assertGreater(choices.count(1), choices.count(0))
+        self.assertEqual(pool.stats()[1]["latency"], 0.001)
+        self.assertEqual(pool.stats()[1]["error_rate"], 0)
+
+
+class TestEndpointPoolRetryAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying coroutines with an endpoint pool"""
+
+    async def test_failover(self):
+        """Test a coroutine is retried right away with another endpoint"""
+        endpoints: List[str] = []
+
+        async def func() -> str:
+            endpoints.append(_endpoint())
+            if len(endpoints) == 1:
+                raise constants.TestException
+            return "ok"
+
+        pool = EndpointPool(["a", "b"])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=60,
+            jitter=False,
+            endpoints=pool,
+        )
+        self.assertEqual(await wrapped_func(), "ok")
+        self.assertEqual(sorted(endpoints), ["a", "b"])
+
+
+class TestEndpointPoolRetry(unittest.TestCase):
+    """Test case for retrying functions with an endpoint pool"""
+
+    def test_failover(self):
+        """Test a function is retried right away with another endpoint"""
+        endpoints: List[str] = []
+
+        def func() -> str:
+            endpoints.append(_endpoint())
+            if len(endpoints) == 1:
+                raise constants.TestException
+            return "ok"
+
+        pool = EndpointPool(["a", "b"])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=60,
+            jitter=False,
+            endpoints=pool,
+        )
+        self.assertEqual(wrapped_func(), "ok")
+        self.assertEqual(sorted(endpoints), ["a", "b"])
+        failed, succeeded = (
+            pool.stats()[["a", "b"].index(endpoint)] for endpoint in endpoints
+        )
+        self.assertGreater(failed["error_rate"], 0)
+        self.assertEqual(succeeded["error_rate"], 0)
+
+    def test_backoff(self):
+        """Test a function sleeps before retrying its only endpoint"""
+        pool = EndpointPool(["a"])
+        wrapped_func = retry_factory(
+            _endpoint,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result == "a",
+            retry_limit=1,
+            init_backoff=0.01,
+            reraise=True,
+            endpoints=pool,
+        )
+        self.assertEqual(wrapped_func(), "a")
+        self.assertGreater(pool.stats()[0]["error_rate"], 0)
+
+    def test_no_endpoint(self):
+        """Test there's no endpoint without an endpoint pool"""
+        wrapped_func = retry_factory(
+            _endpoint, exceptions=constants.TestException, expose_attempt=True
+        )
+        self.assertIsNone(wrapped_func())
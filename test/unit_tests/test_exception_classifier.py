@@ -0,0 +1,282 @@
+"""Unit tests for the class ExceptionClassifier"""
+
+import dataclasses
+import errno
+import logging
+import unittest
+from typing import cast
+
+from mock import AsyncMock, Mock
+
+from tubthumper import ExceptionClassifier, ExceptionPolicy, RetryError, retry_factory
+
+from . import constants, util
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestExceptionClassifier(unittest.TestCase):
+    """Test case for classifying exceptions"""
+
+    def test_include(self):
+        """Test an included exception, or subclass thereof, is retried"""
+        classifier = ExceptionClassifier(OSError)
+        self.assertIsNotNone(classifier.classify(OSError()))
+        self.assertIsNotNone(classifier.classify(ConnectionError()))
+
+    def test_not_included(self):
+        """Test an exception that isn't included is not retried"""
+        classifier = ExceptionClassifier((OSError, ValueError))
+        self.assertIsNone(classifier.classify(constants.TestException()))
+
+    def test_exclude(self):
+        """Test an excluded subclass of an included exception is not retried"""
+        classifier = ExceptionClassifier(OSError, exclude=PermissionError)
+        self.assertIsNone(classifier.classify(PermissionError()))
+        self.assertIsNotNone(classifier.classify(ConnectionError()))
+
+    def test_most_specific_wins(self):
+        """Test an included subclass of an excluded exception is retried"""
+        classifier = ExceptionClassifier(ConnectionResetError, exclude=OSError)
+        self.assertIsNotNone(classifier.classify(ConnectionResetError()))
+        self.assertIsNone(classifier.classify(ConnectionRefusedError()))
+
+    def test_predicate(self):
+        """Test a predicate on an exception's attributes decides whether it is retried"""
+        classifier = ExceptionClassifier(
+            OSError,
+            predicates={OSError: lambda exc: exc.errno == errno.ECONNRESET},
+        )
+        self.assertIsNotNone(classifier.classify(OSError(errno.ECONNRESET, "reset")))
+        self.assertIsNone(classifier.classify(OSError(errno.ENOENT, "missing")))
+
+    def test_most_specific_predicate(self):
+        """Test the predicate of the most specific class is used"""
+        classifier = ExceptionClassifier(
+            OSError,
+            predicates={
+                OSError: lambda exc: False,
+                ConnectionError: lambda exc: True,
+            },
+        )
+        self.assertIsNone(classifier.classify(OSError()))
+        self.assertIsNotNone(classifier.classify(ConnectionResetError()))
+
+    def test_default_policy(self):
+        """Test an exception without a policy falls back to the wrapper's config"""
+        classifier = ExceptionClassifier(OSError)
+        policy = cast(ExceptionPolicy, classifier.classify(OSError()))
+        self.assertEqual(
+            dataclasses.astuple(policy), dataclasses.astuple(ExceptionPolicy())
+        )
+
+    def test_policy(self):
+        """Test the policy of the most specific class is used"""
+        policy = ExceptionPolicy(reraise=True)
+        classifier = ExceptionClassifier(
+            OSError,
+            policies={OSError: ExceptionPolicy(), ConnectionError: policy},
+        )
+        self.assertIs(classifier.classify(ConnectionResetError()), policy)
+
+    def test_cached_decision(self):
+        """Test the decision for an exception type is only computed once"""
+        classifier = ExceptionClassifier(OSError, exclude=PermissionError)
+        decide = Mock(wraps=classifier._decide)
+        classifier._decide = decide
+        for _ in range(3):
+            classifier.classify(ConnectionError())
+            classifier.classify(PermissionError())
+        self.assertEqual(decide.call_count, 2)
+
+
+class TestExceptionClassifierRetryAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying coroutines with an exception classifier"""
+
+    async def test_exclude(self):
+        """Test an excluded exception is raised without retrying or logging"""
+        func = AsyncMock(side_effect=PermissionError)
+        logger = Mock()
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(OSError, exclude=PermissionError),
+            init_backoff=0,
+            logger=logger,
+        )
+        with self.assertRaises(PermissionError):
+            await wrapped_func()
+        logger.log.assert_not_called()
+        func.assert_awaited_once_with()
+
+    async def test_include(self):
+        """Test an included exception is retried"""
+        func = AsyncMock(side_effect=ConnectionError)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(OSError, exclude=PermissionError),
+            retry_limit=1,
+            init_backoff=0,
+        )
+        with self.assertRaises(RetryError):
+            await wrapped_func()
+        self.assertEqual(func.await_count, 2)
+
+    async def test_policy_backoff(self):
+        """Test a policy overriding the backoff for a class of exceptions"""
+        init_backoff = 0.01
+        func = util.timed_mock(
+            async_mock=True,
+            side_effect=[ConnectionResetError, TimeoutError, ConnectionResetError, 1],
+        )
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(
+                OSError,
+                policies={TimeoutError: ExceptionPolicy(init_backoff=init_backoff)},
+            ),
+            init_backoff=0,
+            jitter=False,
+        )
+        self.assertEqual(await wrapped_func(), 1)
+        util.assert_time(self, func.call_times[1] - func.call_times[0], 0)
+        util.assert_time(self, func.call_times[2] - func.call_times[1], init_backoff)
+        util.assert_time(self, func.call_times[3] - func.call_times[2], 0)
+
+
+class TestExceptionClassifierRetry(unittest.TestCase):
+    """Test case for retrying functions with an exception classifier"""
+
+    def test_exclude(self):
+        """Test an excluded exception is raised without retrying or logging"""
+        func = Mock(side_effect=PermissionError)
+        logger = Mock()
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(OSError, exclude=PermissionError),
+            init_backoff=0,
+            logger=logger,
+        )
+        with self.assertRaises(PermissionError):
+            wrapped_func()
+        logger.log.assert_not_called()
+        func.assert_called_once_with()
+
+    def test_predicate(self):
+        """Test an exception rejected by a predicate is raised without retrying"""
+        exc = OSError(errno.ENOENT, "missing")
+        func = Mock(side_effect=exc)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(
+                OSError,
+                predicates={OSError: lambda exc: exc.errno == errno.ECONNRESET},
+            ),
+            init_backoff=0,
+        )
+        with self.assertRaises(OSError) as context:
+            wrapped_func()
+        self.assertIs(context.exception, exc)
+        func.assert_called_once_with()
+
+    def test_policy_reraise(self):
+        """Test a policy overriding reraise for a class of exceptions"""
+        func = Mock(side_effect=TimeoutError)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(
+                OSError, policies={TimeoutError: ExceptionPolicy(reraise=True)}
+            ),
+            retry_limit=0,
+        )
+        with self.assertRaises(TimeoutError):
+            wrapped_func()
+        func.assert_called_once_with()
+
+    def test_policy_log_level(self):
+        """Test a policy overriding the log level for a class of exceptions"""
+        func = Mock(side_effect=[ConnectionResetError, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(
+                OSError,
+                policies={ConnectionError: ExceptionPolicy(log_level=logging.ERROR)},
+            ),
+            init_backoff=0,
+        )
+        with self.assertLogs(logger=tubthumper_logger, level=logging.ERROR):
+            self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(func.call_count, 2)
+
+    def test_policy_retry_limit(self):
+        """Test each policy has its own retry count"""
+        func = Mock(
+            side_effect=[TimeoutError, ConnectionResetError] * 2 + [1],
+        )
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(
+                OSError, policies={TimeoutError: ExceptionPolicy(retry_limit=2)}
+            ),
+            retry_limit=2,
+            init_backoff=0,
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(func.call_count, 5)
+
+    def test_policy_retry_limit_reached(self):
+        """Test reaching a policy's retry limit raises a RetryError"""
+        func = Mock(side_effect=[ConnectionResetError, TimeoutError, TimeoutError])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(
+                OSError, policies={TimeoutError: ExceptionPolicy(retry_limit=1)}
+            ),
+            init_backoff=0,
+        )
+        with self.assertRaisesRegex(RetryError, "Retry limit 1 reached"):
+            wrapped_func()
+        self.assertEqual(func.call_count, 3)
+
+    def test_policy_backoff(self):
+        """Test a policy overriding the backoff for a class of exceptions"""
+        init_backoff = 0.01
+        exponential = 3
+        func = util.timed_mock(
+            side_effect=[TimeoutError, ConnectionResetError, TimeoutError, 1],
+        )
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(
+                OSError,
+                policies={
+                    TimeoutError: ExceptionPolicy(
+                        init_backoff=init_backoff, exponential=exponential
+                    )
+                },
+            ),
+            init_backoff=0,
+            jitter=False,
+        )
+        self.assertEqual(wrapped_func(), 1)
+        util.assert_time(self, func.call_times[1] - func.call_times[0], init_backoff)
+        util.assert_time(self, func.call_times[2] - func.call_times[1], 0)
+        util.assert_time(
+            self, func.call_times[3] - func.call_times[2], exponential * init_backoff
+        )
+
+    def test_policy_shared_time_limit(self):
+        """Test the time limit is shared by all policies"""
+        func = Mock(side_effect=[ConnectionResetError, TimeoutError])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=ExceptionClassifier(
+                OSError, policies={TimeoutError: ExceptionPolicy(init_backoff=60)}
+            ),
+            init_backoff=0,
+            jitter=False,
+            time_limit=30,
+        )
+        with self.assertRaisesRegex(RetryError, "Time limit 30 exceeded"):
+            wrapped_func()
+        self.assertEqual(func.call_count, 2)
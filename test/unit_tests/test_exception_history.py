@@ -0,0 +1,114 @@
+"""Unit tests for clearing traceback frames & keeping exceptions of attempts"""
+
+import builtins
+import logging
+import sys
+import unittest
+from typing import List, Optional, Tuple
+
+from mock import AsyncMock
+
+from tubthumper import RetryError, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class _Payload:
+    """Large object referenced by the local variables of a failing function"""
+
+
+def _failing(exceptions: List[Exception]):
+    """Create a function raising exceptions while referencing a payload"""
+
+    def func() -> None:
+        payload = _Payload()  # noqa: F841
+        exc = constants.TestException()
+        exceptions.append(exc)
+        raise exc
+
+    return func
+
+
+class TestExceptionHistoryAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for keeping exceptions of coroutines' attempts"""
+
+    async def test_keep(self):
+        """Test the exceptions of the last attempts are kept"""
+        excs = [constants.TestException() for _ in range(4)]
+        wrapped_func = retry_factory(
+            AsyncMock(side_effect=excs),
+            exceptions=constants.TestException,
+            retry_limit=3,
+            init_backoff=0,
+            keep_exceptions=2,
+        )
+        with self.assertRaises(RetryError) as context:
+            await wrapped_func()
+        self.assertEqual(context.exception.exceptions, tuple(excs[2:]))
+
+
+class TestExceptionHistory(unittest.TestCase):
+    """Test case for clearing traceback frames & keeping exceptions of functions' attempts"""
+
+    def test_default(self):
+        """Test no exceptions are kept, and the last one is the cause, by default"""
+        exceptions: List[Exception] = []
+        wrapped_func = retry_factory(
+            _failing(exceptions),
+            exceptions=constants.TestException,
+            retry_limit=1,
+            init_backoff=0,
+        )
+        with self.assertRaises(RetryError) as context:
+            wrapped_func()
+        self.assertEqual(context.exception.exceptions, ())
+        self.assertIs(context.exception.__cause__, exceptions[-1])
+        frame = exceptions[0].__traceback__.tb_next.tb_frame  # type: ignore
+        self.assertIn("payload", frame.f_locals)
+
+    def test_clear_frames(self):
+        """Test the frames of exceptions of retried attempts are cleared"""
+        exceptions: List[Exception] = []
+        wrapped_func = retry_factory(
+            _failing(exceptions),
+            exceptions=constants.TestException,
+            retry_limit=1,
+            init_backoff=0,
+            clear_frames=True,
+        )
+        with self.assertRaises(RetryError):
+            wrapped_func()
+        first, last = exceptions
+        self.assertNotIn("payload", first.__traceback__.tb_next.tb_frame.f_locals)  # type: ignore
+        self.assertIn("payload", last.__traceback__.tb_next.tb_frame.f_locals)  # type: ignore
+
+    def _cause(self) -> Tuple[Optional[BaseException], List[Exception]]:
+        """Give up retrying, returning the RetryError's cause & the kept exceptions"""
+        exceptions: List[Exception] = []
+        wrapped_func = retry_factory(
+            _failing(exceptions),
+            exceptions=constants.TestException,
+            retry_limit=2,
+            init_backoff=0,
+            keep_exceptions=5,
+        )
+        with self.assertRaises(RetryError) as context:
+            wrapped_func()
+        self.assertEqual(context.exception.exceptions, tuple(exceptions))
+        return context.exception.__cause__, exceptions
+
+    @unittest.skipIf(sys.version_info < (3, 11), "ExceptionGroup requires Python 3.11+")
+    def test_cause(self):
+        """Test the RetryError is raised from a group of the kept exceptions"""
+        cause, exceptions = self._cause()
+        assert isinstance(cause, builtins.ExceptionGroup)
+        self.assertEqual(cause.exceptions, tuple(exceptions))
+
+    @unittest.skipIf(sys.version_info >= (3, 11), "ExceptionGroup is available")
+    def test_cause_without_groups(self):
+        """Test the RetryError is raised from the last exception before Python 3.11"""
+        cause, exceptions = self._cause()
+        self.assertIs(cause, exceptions[-1])
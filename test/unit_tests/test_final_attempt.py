@@ -0,0 +1,92 @@
+"""Unit tests for clipping the final backoff to the time left"""
+
+import logging
+import time
+import unittest
+
+from mock import AsyncMock, Mock
+
+from tubthumper import RetryError, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestFinalAttemptAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for final attempts of coroutines"""
+
+    async def test_final_attempt(self):
+        """Test a coroutine makes a final attempt within its time limit"""
+        func = AsyncMock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=60,
+            jitter=False,
+            time_limit=0.1,
+            final_attempt_margin=0.05,
+        )
+        self.assertEqual(await wrapped_func(), 1)
+        self.assertEqual(func.await_count, 2)
+
+
+class TestFinalAttempt(unittest.TestCase):
+    """Test case for final attempts of functions"""
+
+    def test_final_attempt(self):
+        """Test a function makes a final attempt, sleeping for the time left less the margin"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=60,
+            jitter=False,
+            time_limit=0.1,
+            final_attempt_margin=0.05,
+        )
+        start = time.perf_counter()
+        self.assertEqual(wrapped_func(), 1)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(func.call_count, 2)
+
+    def test_only_one(self):
+        """Test a function makes only one final attempt before giving up"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=60,
+            jitter=False,
+            time_limit=0.1,
+            final_attempt_margin=0.05,
+        )
+        with self.assertRaisesRegex(RetryError, "Time limit 0.1 exceeded") as ctx:
+            wrapped_func()
+        self.assertEqual(func.call_count, 2)
+        self.assertLess(ctx.exception.slept, 0.05)
+
+    def test_no_time_left(self):
+        """Test a function gives up when the margin exceeds the time left"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=60,
+            time_limit=0.1,
+            final_attempt_margin=1,
+        )
+        with self.assertRaisesRegex(RetryError, "Time limit 0.1 exceeded"):
+            wrapped_func()
+        func.assert_called_once_with()
+
+    def test_disabled(self):
+        """Test a function gives up rather than clipping its backoff by default"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=60, time_limit=0.1
+        )
+        with self.assertRaisesRegex(RetryError, "Time limit 0.1 exceeded"):
+            wrapped_func()
+        func.assert_called_once_with()
@@ -0,0 +1,252 @@
+"""Unit tests for retrying generator functions, resuming after the last item yielded"""
+
+import logging
+import unittest
+from typing import Any, AsyncGenerator, Dict, Generator, List
+
+from tubthumper import (
+    Bulkhead,
+    ExceptionClassifier,
+    RetryError,
+    attempt_context,
+    policy_registry,
+    retry_factory,
+)
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+PAGES = 5
+EXCLUDING_VALUE_ERROR = ExceptionClassifier(Exception, exclude=ValueError)
+
+
+def next_offset(page: int) -> Dict[str, Any]:
+    """Resume from the page after the last one yielded"""
+    return {"offset": page + 1}
+
+
+class TestGeneratorsAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying async generator functions"""
+
+    async def test_resume(self):
+        """Test an async generator restarts after the last item yielded"""
+        failures = [0, 3]
+        offsets: List[int] = []
+
+        async def pages(offset: int = 0) -> AsyncGenerator[int, None]:
+            offsets.append(offset)
+            for page in range(offset, PAGES):
+                if failures and failures[0] == page:
+                    failures.pop(0)
+                    raise constants.TestException
+                yield page
+
+        wrapped_func = retry_factory(
+            pages,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            resume=next_offset,
+        )
+        self.assertEqual([page async for page in wrapped_func()], list(range(PAGES)))
+        self.assertEqual(offsets, [0, 0, 3])
+
+    async def test_give_up(self):
+        """Test an async generator raises a RetryError once retries give up"""
+
+        async def pages(offset: int = 0) -> AsyncGenerator[int, None]:
+            yield offset
+            raise constants.TestException
+
+        wrapped_func = retry_factory(
+            pages,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            retry_limit=2,
+            resume=next_offset,
+        )
+        received: List[int] = []
+        with self.assertRaisesRegex(RetryError, "Retry limit 2 reached"):
+            async for page in wrapped_func():
+                received.append(page)
+        self.assertEqual(received, [0, 1, 2])
+
+    async def test_not_retried(self):
+        """Test exceptions not retried propagate from an async generator"""
+
+        async def pages(offset: int = 0) -> AsyncGenerator[int, None]:
+            yield offset
+            raise ValueError
+
+        wrapped_func = retry_factory(
+            pages, exceptions=EXCLUDING_VALUE_ERROR, resume=next_offset
+        )
+        with self.assertRaises(ValueError):
+            async for _ in wrapped_func():
+                pass
+
+
+class TestGenerators(unittest.TestCase):
+    """Test case for retrying generator functions"""
+
+    def test_resume(self):
+        """Test a generator restarts after the last item yielded"""
+        failures = [0, 3]
+        offsets: List[int] = []
+
+        def pages(offset: int = 0) -> Generator[int, None, None]:
+            offsets.append(offset)
+            for page in range(offset, PAGES):
+                if failures and failures[0] == page:
+                    failures.pop(0)
+                    raise constants.TestException
+                yield page
+
+        wrapped_func = retry_factory(
+            pages,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            resume=next_offset,
+        )
+        self.assertEqual(list(wrapped_func()), list(range(PAGES)))
+        self.assertEqual(offsets, [0, 0, 3])
+
+    def test_give_up(self):
+        """Test a generator raises a RetryError once retries give up"""
+
+        def pages(offset: int = 0) -> Generator[int, None, None]:
+            yield offset
+            raise constants.TestException
+
+        wrapped_func = retry_factory(
+            pages,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            retry_limit=2,
+            resume=next_offset,
+        )
+        received: List[int] = []
+        with self.assertRaisesRegex(RetryError, "Retry limit 2 reached"):
+            for page in wrapped_func():
+                received.append(page)
+        self.assertEqual(received, [0, 1, 2])
+
+    def test_not_retried(self):
+        """Test exceptions not retried propagate from a generator"""
+
+        def pages(offset: int = 0) -> Generator[int, None, None]:
+            yield offset
+            raise ValueError
+
+        wrapped_func = retry_factory(
+            pages, exceptions=EXCLUDING_VALUE_ERROR, resume=next_offset
+        )
+        with self.assertRaises(ValueError):
+            list(wrapped_func())
+
+    def test_scope(self):
+        """Test the attempt context is only set while the generator runs"""
+        attempts: List[object] = []
+
+        def pages(offset: int = 0) -> Generator[int, None, None]:
+            attempts.append(attempt_context())
+            yield offset
+
+        wrapped_func = retry_factory(
+            pages,
+            exceptions=constants.TestException,
+            resume=next_offset,
+            expose_attempt=True,
+        )
+        for _ in wrapped_func():
+            self.assertIsNone(attempt_context())
+        self.assertIsNotNone(attempts[0])
+
+    def test_close(self):
+        """Test closing the wrapper closes the generator"""
+        closed: List[bool] = []
+
+        def pages(offset: int = 0) -> Generator[int, None, None]:
+            try:
+                yield offset
+            finally:
+                closed.append(True)
+
+        wrapped_func = retry_factory(
+            pages, exceptions=constants.TestException, resume=next_offset
+        )
+        generator = wrapped_func()
+        self.assertEqual(next(generator), 0)
+        generator.close()
+        self.assertEqual(closed, [True])
+
+    def test_no_resume(self):
+        """Test generators aren't retried without a way to resume them"""
+
+        def pages(offset: int = 0) -> Generator[int, None, None]:
+            raise constants.TestException
+            yield offset
+
+        wrapped_func = retry_factory(pages, exceptions=constants.TestException)
+        with self.assertRaises(constants.TestException):
+            list(wrapped_func())
+
+    def test_policy(self):
+        """Test a generator picks up the current values of its policy"""
+        self.addCleanup(policy_registry.update, {})
+
+        def pages(offset: int = 0) -> Generator[int, None, None]:
+            yield offset
+            raise constants.TestException
+
+        wrapped_func = retry_factory(
+            pages,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            resume=next_offset,
+            policy="pages",
+        )
+        policy_registry.update({"pages": {"retry_limit": 1}})
+        received: List[int] = []
+        with self.assertRaisesRegex(RetryError, "Retry limit 1 reached"):
+            for page in wrapped_func():
+                received.append(page)
+        self.assertEqual(received, [0, 1])
+
+    def test_unsupported(self):
+        """Test generators can't be combined with features they don't support"""
+
+        def pages(offset: int = 0) -> Generator[int, None, None]:
+            yield offset
+
+        configs: List[Dict[str, Any]] = [
+            {"retry_on_result": bool},
+            {"coalesce": True},
+            {"bulkhead": Bulkhead(1)},
+        ]
+        for config in configs:
+            with self.subTest(config=config):
+                with self.assertRaisesRegex(ValueError, next(iter(config))):
+                    retry_factory(
+                        pages,
+                        exceptions=constants.TestException,
+                        resume=next_offset,
+                        **config,
+                    )
+
+    def test_not_generator(self):
+        """Test resume can't be provided for functions other than generator functions"""
+
+        def page(offset: int = 0) -> int:
+            return offset
+
+        async def coro_page(offset: int = 0) -> int:
+            return offset
+
+        for func in (page, coro_page):
+            with self.subTest(func=func):
+                with self.assertRaisesRegex(TypeError, "generator functions"):
+                    retry_factory(
+                        func, exceptions=constants.TestException, resume=next_offset
+                    )
@@ -0,0 +1,131 @@
+"""Unit tests for the registry of retry loops in flight"""
+
+import asyncio
+import io
+import json
+import logging
+import signal
+import unittest
+from typing import Any, Dict, List
+
+from mock import Mock
+
+from tubthumper import InFlightRetries, in_flight, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestInFlightRetries(unittest.TestCase):
+    """Test case for the registry of retry loops in flight"""
+
+    def test_snapshot(self):
+        """Test the snapshot lists retry loops, longest-running first"""
+        registry = InFlightRetries()
+        late = registry.register("late", 2.0)
+        early = registry.register("early", 1.0)
+        late.update(1, None, 0)
+        early.update(3, KeyError, 60)
+        snapshot = registry.snapshot()
+        self.assertEqual([loop["function"] for loop in snapshot], ["early", "late"])
+        self.assertEqual(snapshot[0]["attempt"], 3)
+        self.assertEqual(snapshot[0]["exception"], "KeyError")
+        self.assertTrue(snapshot[0]["sleeping"])
+        self.assertIsNone(snapshot[1]["exception"])
+        self.assertFalse(snapshot[1]["sleeping"])
+        registry.unregister(early)
+        registry.unregister(early)
+        self.assertEqual(len(registry.snapshot()), 1)
+
+    def test_not_updated(self):
+        """Test a retry loop has a snapshot before its first update"""
+        registry = InFlightRetries()
+        registry.register("func", 1.0)
+        (loop,) = registry.snapshot()
+        self.assertEqual(loop["attempt"], 0)
+        self.assertEqual(loop["wake_up"], 1.0)
+        self.assertFalse(loop["sleeping"])
+        self.assertIsNone(loop["exception"])
+
+    def test_dump(self):
+        """Test the snapshot is dumped as a line of JSON"""
+        registry = InFlightRetries()
+        registry.register("func", 1.0).update(1, KeyError, 0)
+        file = io.StringIO()
+        data = json.loads(registry.dump(file))
+        self.assertEqual(json.loads(file.getvalue()), data)
+        self.assertEqual(data["retries"], registry.snapshot())
+        self.assertEqual(json.loads(registry.dump())["retries"], data["retries"])
+
+    @unittest.skipUnless(hasattr(signal, "SIGUSR1"), "requires SIGUSR1")
+    def test_dump_on_signal(self):
+        """Test the snapshot is dumped when the process receives the signal"""
+        registry = InFlightRetries()
+        file = io.StringIO()
+        self.addCleanup(signal.signal, signal.SIGUSR1, signal.getsignal(signal.SIGUSR1))
+        registry.dump_on_signal(signal.SIGUSR1, file)
+        signal.raise_signal(signal.SIGUSR1)
+        self.assertEqual(json.loads(file.getvalue())["retries"], [])
+
+
+class TestInFlightAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for retry loops of coroutines in flight"""
+
+    async def test_sleeping(self):
+        """Test a coroutine sleeping in backoff is in flight until it returns"""
+        attempts = 0
+
+        async def func() -> int:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise constants.TestException
+            return attempts
+
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0.05, jitter=False
+        )
+        task = asyncio.ensure_future(wrapped_func())
+        await asyncio.sleep(0.01)
+        (loop,) = in_flight.snapshot()
+        self.assertEqual(loop["attempt"], 1)
+        self.assertEqual(loop["exception"], "KeyError")
+        self.assertTrue(loop["sleeping"])
+        self.assertEqual(await task, 2)
+        self.assertEqual(in_flight.snapshot(), [])
+
+
+class TestInFlight(unittest.TestCase):
+    """Test case for retry loops of functions in flight"""
+
+    def test_retrying(self):
+        """Test a function is in flight after its first failed attempt until it gives up"""
+        snapshots: List[List[Dict[str, Any]]] = []
+
+        def side_effect() -> None:
+            snapshots.append(in_flight.snapshot())
+            raise constants.TestException
+
+        func = Mock(side_effect=side_effect)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=2,
+            init_backoff=0,
+            reraise=True,
+        )
+        with self.assertRaises(constants.TestException):
+            wrapped_func()
+        self.assertEqual(snapshots[0], [])
+        self.assertEqual([loop["attempt"] for (loop,) in snapshots[1:]], [1, 2])
+        self.assertFalse(snapshots[1][0]["sleeping"])
+        self.assertEqual(in_flight.snapshot(), [])
+
+    def test_no_failures(self):
+        """Test a function that never fails is never in flight"""
+        wrapped_func = retry_factory(
+            in_flight.snapshot, exceptions=constants.TestException
+        )
+        self.assertEqual(wrapped_func(), [])
@@ -0,0 +1,194 @@
+"""Unit tests for the registry of named policies"""
+
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+from mock import AsyncMock, Mock
+
+from tubthumper import (
+    ExceptionClassifier,
+    PolicyRegistry,
+    RetryError,
+    policy_registry,
+    retry_decorator,
+    retry_factory,
+)
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestPolicyRegistry(unittest.TestCase):
+    """Test case for the policy registry"""
+
+    def test_update(self):
+        """Test policies are replaced, resetting those missing"""
+        registry = PolicyRegistry()
+        registry.update({"payments": {"retry_limit": 3}, "search": {"jitter": False}})
+        registry.update({"payments": {"retry_limit": 5, "log_level": "error"}})
+        self.assertEqual(
+            registry.policies(),
+            {"payments": {"retry_limit": 5, "log_level": logging.ERROR}, "search": {}},
+        )
+
+    def test_invalid(self):
+        """Test invalid policies raise a ValueError, leaving policies unchanged"""
+        registry = PolicyRegistry()
+        registry.update({"payments": {"retry_limit": 3}})
+        for values in (
+            {"retries": 3},
+            {"retry_limit": "3"},
+            {"time_limit": True},
+            {"log_level": "loud"},
+            {"exceptions": "NoSuchError"},
+            {"exceptions": ["json.NoSuchError"]},
+            {"exceptions": "KeyboardInterrupt"},
+            {"exceptions": 3},
+        ):
+            with self.subTest(values=values):
+                with self.assertRaisesRegex(ValueError, "of policy 'payments'"):
+                    registry.update({"payments": values})
+        self.assertEqual(registry.policies(), {"payments": {"retry_limit": 3}})
+
+    def test_load_json(self):
+        """Test policies are loaded from a JSON file"""
+        registry = PolicyRegistry()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "policies.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({"payments": {"init_backoff": 0.5}}, file)
+            registry.load(path)
+        self.assertEqual(registry.policies(), {"payments": {"init_backoff": 0.5}})
+
+    def test_exceptions(self):
+        """Test the exceptions of policies are classifiers, importing those named"""
+        registry = PolicyRegistry()
+        classifier = ExceptionClassifier(KeyError)
+        registry.update(
+            {
+                "payments": {"exceptions": ["ConnectionError", "json.JSONDecodeError"]},
+                "search": {"exceptions": TimeoutError},
+                "reports": {"exceptions": classifier},
+            }
+        )
+        policies = registry.policies()
+        self.assertEqual(
+            policies["payments"]["exceptions"].include,
+            (ConnectionError, json.JSONDecodeError),
+        )
+        self.assertEqual(policies["search"]["exceptions"].include, (TimeoutError,))
+        self.assertIs(policies["reports"]["exceptions"], classifier)
+
+    @unittest.skipIf(sys.version_info < (3, 11), "tomllib requires Python 3.11+")
+    def test_load_toml(self):
+        """Test policies are loaded from a TOML file"""
+        registry = PolicyRegistry()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "policies.toml")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("[payments]\ntime_limit = 10\nreraise = true\n")
+            registry.load(path)
+        self.assertEqual(
+            registry.policies(), {"payments": {"time_limit": 10, "reraise": True}}
+        )
+
+
+class TestPoliciesAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for named policies of coroutines"""
+
+    def setUp(self):
+        self.addCleanup(policy_registry.update, {})
+        self.addCleanup(gc.collect)  # wrappers relying on policies, before resetting
+
+    async def test_reload(self):
+        """Test a wrapped coroutine picks up reloaded policies"""
+        func = AsyncMock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=5,
+            init_backoff=0,
+            policy="payments",
+        )
+        policy_registry.update({"payments": {"retry_limit": 1}})
+        with self.assertRaises(RetryError):
+            await wrapped_func()
+        self.assertEqual(func.await_count, 2)
+        policy_registry.update({"payments": {"reraise": True}})
+        with self.assertRaises(constants.TestException):
+            await wrapped_func()
+        self.assertEqual(func.await_count, 8)
+
+
+class TestPolicies(unittest.TestCase):
+    """Test case for named policies of functions"""
+
+    def setUp(self):
+        self.addCleanup(policy_registry.update, {})
+        self.addCleanup(gc.collect)  # wrappers relying on policies, before resetting
+
+    def test_reload(self):
+        """Test a wrapped function picks up reloaded policies"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=5,
+            init_backoff=0,
+            policy="payments",
+        )
+        policy_registry.update({"payments": {"retry_limit": 1}})
+        with self.assertRaises(RetryError):
+            wrapped_func()
+        self.assertEqual(func.call_count, 2)
+        policy_registry.update({"payments": {"reraise": True}})
+        with self.assertRaises(constants.TestException):
+            wrapped_func()
+        self.assertEqual(func.call_count, 8)
+
+    def test_exceptions(self):
+        """Test a wrapped function retries the exceptions of its policy by default"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_decorator(policy="payments", init_backoff=0)(func)
+        with self.assertRaisesRegex(ValueError, "Policy 'payments' doesn't provide"):
+            wrapped_func()
+        policy_registry.update({"payments": {"exceptions": constants.TestException}})
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(func.call_count, 2)
+
+    def test_exceptions_removed(self):
+        """Test reloading a policy without the exceptions functions rely on it for raises a ValueError"""
+        policy_registry.update({"payments": {"exceptions": constants.TestException}})
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_decorator(policy="payments", init_backoff=0)(func)
+        for policies in ({"payments": {"retry_limit": 1}}, {}):
+            with self.subTest(policies=policies):
+                with self.assertRaisesRegex(
+                    ValueError, "doesn't provide the exceptions"
+                ):
+                    policy_registry.update(policies)
+        self.assertEqual(wrapped_func(), 1)
+        del wrapped_func
+        gc.collect()
+        policy_registry.update({"payments": {"retry_limit": 1}})
+
+    def test_no_exceptions(self):
+        """Test exceptions are required without a policy"""
+        with self.assertRaisesRegex(TypeError, "exceptions are required"):
+            retry_factory(Mock())
+
+    def test_unchanged(self):
+        """Test a wrapped function reuses its config while policies are unchanged"""
+        func = Mock(return_value=1)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, policy="search"
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(wrapped_func(), 1)
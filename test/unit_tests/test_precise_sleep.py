@@ -0,0 +1,45 @@
+"""Unit tests for spin-waiting at the end of backoffs"""
+
+import logging
+import time
+import unittest
+
+from mock import Mock, patch
+
+from tubthumper import retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestPreciseSleep(unittest.TestCase):
+    """Test case for spin-waiting at the end of backoffs of functions"""
+
+    def _retry_once(self, init_backoff: float) -> Mock:
+        """Retry a function failing once, returning the mocked sleep"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=init_backoff,
+            jitter=False,
+            spin_threshold=0.002,
+        )
+        with patch("time.sleep", wraps=time.sleep) as sleep:
+            start = time.perf_counter()
+            self.assertEqual(wrapped_func(), 1)
+            self.assertGreaterEqual(time.perf_counter() - start, init_backoff)
+        return sleep
+
+    def test_spin(self):
+        """Test backoffs within the spin threshold don't sleep at all"""
+        sleep = self._retry_once(0.0002)
+        sleep.assert_not_called()
+
+    def test_sleep_then_spin(self):
+        """Test longer backoffs sleep until within the spin threshold"""
+        sleep = self._retry_once(0.01)
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args.args[0], 0.008)
@@ -0,0 +1,236 @@
+"""Unit tests for the class ResultCache"""
+
+import logging
+import unittest
+from typing import Any
+
+from mock import AsyncMock, Mock, patch
+
+from tubthumper import ResultCache, RetryError, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class _TimeMixin:
+    """Mixin patching the cache's clock"""
+
+    addCleanup: Any
+
+    def setUp(self):
+        patcher = patch("tubthumper._cache.time")
+        self.time = patcher.start()
+        self.time.monotonic.return_value = 0.0
+        self.addCleanup(patcher.stop)
+
+
+class TestResultCache(_TimeMixin, unittest.TestCase):
+    """Test case for the result cache"""
+
+    def test_fresh(self):
+        """Test an object is fresh until its TTL has passed"""
+        cache = ResultCache(ttl=10)
+        cache.set("key", 1)
+        self.time.monotonic.return_value = 9.9
+        self.assertEqual(cache.get_fresh("key"), 1)
+        self.time.monotonic.return_value = 10
+        self.assertIsNot(cache.get_fresh("key"), 1)
+
+    def test_stale(self):
+        """Test an object is served stale until its stale TTL has passed"""
+        cache = ResultCache(ttl=10, stale_ttl=100)
+        cache.set("key", 1)
+        self.time.monotonic.return_value = 99.9
+        self.assertEqual(cache.get_stale("key"), 1)
+        self.time.monotonic.return_value = 100
+        self.assertIsNot(cache.get_stale("key"), 1)
+
+    def test_lru(self):
+        """Test the least recently used object is evicted once full"""
+        cache = ResultCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get_fresh("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get_fresh("a"), 1)
+        self.assertIsNot(cache.get_fresh("b"), 2)
+        self.assertEqual(cache.get_fresh("c"), 3)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_stats(self):
+        """Test hits, stale hits, and misses are counted"""
+        cache = ResultCache()
+        self.assertEqual(cache.stats()["hit_ratio"], 0)
+        cache.get_fresh("key")
+        cache.set("key", 1)
+        cache.get_fresh("key")
+        cache.get_fresh("key")
+        self.time.monotonic.return_value = 100
+        cache.get_fresh("key")
+        cache.get_stale("key")
+        self.assertEqual(
+            cache.stats(),
+            {
+                "size": 1,
+                "hits": 2,
+                "stale_hits": 1,
+                "misses": 2,
+                "evictions": 0,
+                "hit_ratio": 0.5,
+                "stale_hit_ratio": 0.25,
+            },
+        )
+        cache.clear()
+        self.assertEqual(cache.stats()["size"], 0)
+        self.assertEqual(cache.stats()["misses"], 0)
+
+
+class TestResultCacheRetryAsync(_TimeMixin, unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying coroutines with a result cache"""
+
+    async def test_fresh(self):
+        """Test a fresh object is returned without awaiting the coroutine"""
+        func = AsyncMock(return_value=1)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, cache=ResultCache()
+        )
+        self.assertEqual(await wrapped_func(*constants.ARGS), 1)
+        self.assertEqual(await wrapped_func(*constants.ARGS), 1)
+        func.assert_awaited_once_with(*constants.ARGS)
+
+    async def test_stale(self):
+        """Test a stale object is returned when retries give up"""
+        func = AsyncMock(side_effect=[1, constants.TestException])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            cache=ResultCache(ttl=10),
+        )
+        self.assertEqual(await wrapped_func(), 1)
+        self.time.monotonic.return_value = 10
+        self.assertEqual(await wrapped_func(), 1)
+        self.assertEqual(func.await_count, 2)
+
+    async def test_not_retried(self):
+        """Test an exception that isn't retried is raised rather than served stale"""
+        func = AsyncMock(side_effect=[1, ValueError])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            cache=ResultCache(ttl=0),
+        )
+        self.assertEqual(await wrapped_func(), 1)
+        with self.assertRaises(ValueError):
+            await wrapped_func()
+
+    async def test_too_stale(self):
+        """Test retries giving up raise once the cached object is too stale"""
+        func = AsyncMock(side_effect=[1, constants.TestException])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            cache=ResultCache(ttl=10, stale_ttl=20),
+        )
+        self.assertEqual(await wrapped_func(), 1)
+        self.time.monotonic.return_value = 20
+        with self.assertRaises(RetryError):
+            await wrapped_func()
+
+    async def test_retried_result(self):
+        """Test an object returned despite retry_on_result isn't cached"""
+        func = AsyncMock(return_value=None)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            retry_limit=0,
+            reraise=True,
+            cache=ResultCache(),
+        )
+        self.assertIsNone(await wrapped_func())
+        self.assertIsNone(await wrapped_func())
+        self.assertEqual(func.await_count, 2)
+
+
+class TestResultCacheRetry(_TimeMixin, unittest.TestCase):
+    """Test case for retrying functions with a result cache"""
+
+    def test_fresh(self):
+        """Test a fresh object is returned without calling the function"""
+        func = Mock(return_value=1)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, cache=ResultCache()
+        )
+        self.assertEqual(wrapped_func(*constants.ARGS, **constants.KWARGS), 1)
+        self.assertEqual(wrapped_func(*constants.ARGS, **constants.KWARGS), 1)
+        func.assert_called_once_with(*constants.ARGS, **constants.KWARGS)
+
+    def test_key(self):
+        """Test objects are cached per key"""
+        func = Mock(side_effect=[1, 2])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, cache=ResultCache()
+        )
+        self.assertEqual(wrapped_func(1), 1)
+        self.assertEqual(wrapped_func(2), 2)
+        self.assertEqual(wrapped_func(1), 1)
+        self.assertEqual(func.call_count, 2)
+
+    def test_stale_reraise(self):
+        """Test a stale object is returned when retries give up, with reraise=True"""
+        func = Mock(side_effect=[1, constants.TestException])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            reraise=True,
+            cache=ResultCache(ttl=10),
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.time.monotonic.return_value = 10
+        self.assertEqual(wrapped_func(), 1)
+
+    def test_not_retried(self):
+        """Test an exception that isn't retried is raised rather than served stale"""
+        func = Mock(side_effect=[1, ValueError])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            cache=ResultCache(ttl=0),
+        )
+        self.assertEqual(wrapped_func(), 1)
+        with self.assertRaises(ValueError):
+            wrapped_func()
+
+    def test_too_stale(self):
+        """Test retries giving up raise once the cached object is too stale"""
+        func = Mock(side_effect=[1, constants.TestException])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            cache=ResultCache(ttl=10, stale_ttl=20),
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.time.monotonic.return_value = 20
+        with self.assertRaises(RetryError):
+            wrapped_func()
+
+    def test_retried_result(self):
+        """Test an object returned despite retry_on_result isn't cached"""
+        func = Mock(return_value=None)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            retry_limit=0,
+            reraise=True,
+            cache=ResultCache(),
+        )
+        self.assertIsNone(wrapped_func())
+        self.assertIsNone(wrapped_func())
+        self.assertEqual(func.call_count, 2)
@@ -110,6 +110,18 @@ class TestRetryAsync(unittest.IsolatedAsyncioTestCase):
             await retry(func, time_limit=0, exceptions=constants.TestException)
         func.assert_awaited_once_with()
 
+    async def test_retry_on_result(self):
+        """Test a result matching retry_on_result is retried"""
+        func = AsyncMock(side_effect=[None, 1])
+        result = await retry(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            init_backoff=0,
+        )
+        self.assertEqual(result, 1)
+        self.assertEqual(func.await_count, 2)
+
     async def test_jitter(self):
         """Test jitter results in random variation in backoff time, predictable thanks to setting the random seed"""
         func = util.timed_mock(async_mock=True, side_effect=constants.TestException)
@@ -455,6 +467,18 @@ class TestRetry(unittest.TestCase):
             retry(func, time_limit=0, exceptions=constants.TestException)
         func.assert_called_once_with()
 
+    def test_retry_on_result(self):
+        """Test a result matching retry_on_result is retried"""
+        func = Mock(side_effect=[None, 1])
+        result = retry(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            init_backoff=0,
+        )
+        self.assertEqual(result, 1)
+        self.assertEqual(func.call_count, 2)
+
     def test_jitter(self):
         """Test jitter results in random variation in backoff time, predictable thanks to setting the random seed"""
         func = util.timed_mock(side_effect=constants.TestException)
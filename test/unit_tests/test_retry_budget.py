@@ -0,0 +1,198 @@
+"""Unit tests for the class RetryBudget"""
+
+import logging
+import os
+import tempfile
+import unittest
+from typing import Any
+
+from mock import AsyncMock, Mock, patch
+
+from tubthumper import RetryBudget, RetryError, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+NOW = 1_700_000_000.0
+
+
+class TestRetryBudget(unittest.TestCase):
+    """Test case for the retry budget & circuit breaker"""
+
+    def setUp(self):
+        patcher = patch("tubthumper._budget.time")
+        self.time = patcher.start()
+        self.time.time.return_value = NOW
+        self.addCleanup(patcher.stop)
+
+    def _budget(self, **kwargs: Any) -> RetryBudget:
+        budget = RetryBudget(**kwargs)
+        self.addCleanup(budget.close)
+        return budget
+
+    def test_min_retries(self):
+        """Test retries are allowed up to min_retries regardless of calls"""
+        budget = self._budget(min_retries=2, min_attempts=100)
+        self.assertTrue(budget.start())
+        self.assertTrue(budget.acquire_retry())
+        self.assertTrue(budget.acquire_retry())
+        self.assertFalse(budget.acquire_retry())
+
+    def test_ratio(self):
+        """Test retries are allowed up to a ratio of calls"""
+        budget = self._budget(ratio=0.5, min_retries=0, min_attempts=100)
+        for _ in range(4):
+            budget.start()
+        self.assertTrue(budget.acquire_retry())
+        self.assertTrue(budget.acquire_retry())
+        self.assertFalse(budget.acquire_retry())
+
+    def test_window(self):
+        """Test calls & retries outside the window are no longer counted"""
+        budget = self._budget(window=10, min_retries=1, min_attempts=100)
+        budget.start()
+        self.assertTrue(budget.acquire_retry())
+        self.assertFalse(budget.acquire_retry())
+        self.time.time.return_value = NOW + 11
+        self.assertTrue(budget.acquire_retry())
+        self.assertEqual(budget.stats()["calls"], 0)
+
+    def test_trip(self):
+        """Test the circuit breaker opens once enough attempts have failed"""
+        budget = self._budget(failure_threshold=0.5, min_attempts=4, cooldown=30)
+        for _ in range(4):
+            budget.start()
+        budget.record_failure()
+        self.assertFalse(budget.is_open())
+        budget.record_failure()
+        self.assertTrue(budget.is_open())
+        self.assertFalse(budget.start())
+        self.assertFalse(budget.acquire_retry())
+        self.assertEqual(budget.stats()["open_until"], NOW + 30)
+
+    def test_cooldown(self):
+        """Test the circuit breaker closes after its cooldown, starting the window over"""
+        budget = self._budget(failure_threshold=0.5, min_attempts=1, cooldown=30)
+        budget.start()
+        budget.record_failure()
+        self.assertTrue(budget.is_open())
+        self.time.time.return_value = NOW + 30
+        self.assertFalse(budget.is_open())
+        self.assertTrue(budget.start())
+        self.assertEqual(
+            budget.stats(),
+            {"calls": 1, "retries": 0, "failures": 0, "open_until": NOW + 30},
+        )
+
+    def test_shared_file(self):
+        """Test budgets using the same file share their state, which persists after closing"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "budget")
+            budget = RetryBudget(path, min_retries=1, min_attempts=100)
+            other_budget = RetryBudget(path, min_retries=1, min_attempts=100)
+            budget.start()
+            self.assertTrue(other_budget.acquire_retry())
+            self.assertFalse(budget.acquire_retry())
+            budget.close()
+            other_budget.close()
+            restarted_budget = RetryBudget(path, min_retries=1, min_attempts=100)
+            self.assertEqual(restarted_budget.stats()["retries"], 1)
+            restarted_budget.close()
+
+    def test_invalid_file(self):
+        """Test a file that doesn't hold a budget's state is reinitialized"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "budget")
+            with open(path, "wb") as file:
+                file.write(b"not a budget")
+            budget = RetryBudget(path)
+            self.assertEqual(
+                budget.stats(),
+                {"calls": 0, "retries": 0, "failures": 0, "open_until": 0.0},
+            )
+            budget.close()
+
+
+class TestRetryBudgetRetryAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying coroutines with a retry budget"""
+
+    async def test_exhausted(self):
+        """Test an exhausted retry budget results in a RetryError"""
+        budget = RetryBudget(min_retries=1, min_attempts=100)
+        self.addCleanup(budget.close)
+        func = AsyncMock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0, budget=budget
+        )
+        with self.assertRaisesRegex(RetryError, "Retry budget exhausted"):
+            await wrapped_func()
+        self.assertEqual(func.await_count, 2)
+
+
+class TestRetryBudgetRetry(unittest.TestCase):
+    """Test case for retrying functions with a retry budget"""
+
+    def setUp(self):
+        self.budget = RetryBudget(min_retries=1, min_attempts=3, cooldown=60)
+        self.addCleanup(self.budget.close)
+
+    def test_exhausted(self):
+        """Test an exhausted retry budget results in a RetryError"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            budget=self.budget,
+        )
+        with self.assertRaisesRegex(RetryError, "Retry budget exhausted"):
+            wrapped_func()
+        self.assertEqual(func.call_count, 2)
+
+    def test_exhausted_reraise(self):
+        """Test an exhausted retry budget results in the caught exception with reraise=True"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            reraise=True,
+            budget=self.budget,
+        )
+        with self.assertRaises(constants.TestException):
+            wrapped_func()
+        self.assertEqual(func.call_count, 2)
+
+    def test_exhausted_result(self):
+        """Test an exhausted retry budget results in a RetryError for retried results"""
+        func = Mock(return_value=None)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            init_backoff=0,
+            budget=self.budget,
+        )
+        with self.assertRaisesRegex(RetryError, "Retry budget exhausted"):
+            wrapped_func()
+        self.assertEqual(func.call_count, 2)
+
+    def test_circuit_breaker_open(self):
+        """Test calls fail fast without being attempted while the circuit breaker is open"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0,
+            budget=self.budget,
+        )
+        for _ in range(2):
+            with self.assertRaises(RetryError):
+                wrapped_func()
+        self.assertTrue(self.budget.is_open())
+        func.reset_mock()
+        with self.assertRaisesRegex(RetryError, "Circuit breaker open"):
+            wrapped_func()
+        func.assert_not_called()
@@ -122,6 +122,18 @@ class TestRetryDecoratorAsync(unittest.IsolatedAsyncioTestCase):
             await dec_func()
         func.assert_awaited_once_with()
 
+    async def test_retry_on_result(self):
+        """Test a result matching retry_on_result is retried"""
+        func = AsyncMock(side_effect=[None, 1])
+        dec_func = retry_decorator(
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            init_backoff=0,
+        )(func)
+        result = await dec_func()
+        self.assertEqual(result, 1)
+        self.assertEqual(func.await_count, 2)
+
     async def test_jitter(self):
         """Test jitter results in random variation in backoff time, predictable thanks to setting the random seed"""
         func = util.timed_mock(async_mock=True, side_effect=constants.TestException)
@@ -465,6 +477,18 @@ class TestRetryDecorator(unittest.TestCase):
             dec_func()
         func.assert_called_once_with()
 
+    def test_retry_on_result(self):
+        """Test a result matching retry_on_result is retried"""
+        func = Mock(side_effect=[None, 1])
+        dec_func = retry_decorator(
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            init_backoff=0,
+        )(func)
+        result = dec_func()
+        self.assertEqual(result, 1)
+        self.assertEqual(func.call_count, 2)
+
     def test_jitter(self):
         """Test jitter results in random variation in backoff time, predictable thanks to setting the random seed"""
         func = util.timed_mock(side_effect=constants.TestException)
@@ -0,0 +1,117 @@
+"""Unit tests for the attempt history & timing of the class RetryError"""
+
+import copy
+import logging
+import math
+import pickle
+import unittest
+
+from mock import AsyncMock, Mock, patch
+
+from tubthumper import AttemptRecord, Bulkhead, RetryError, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestRetryError(unittest.TestCase):
+    """Test case for the RetryError class"""
+
+    def test_defaults(self):
+        """Test a RetryError has no attempt history by default"""
+        error = RetryError("message")
+        self.assertEqual(str(error), "message")
+        self.assertEqual(error.attempts, 0)
+        self.assertEqual(error.elapsed, 0)
+        self.assertEqual(error.slept, 0)
+        self.assertEqual(error.limits, {})
+        self.assertEqual(error.records, ())
+        self.assertEqual(error.exceptions, ())
+
+    def test_slots(self):
+        """Test the fields of a RetryError are slots"""
+        self.assertIn("records", RetryError.__slots__)
+
+    def test_pickle(self):
+        """Test the fields of a RetryError survive pickling & copying"""
+        error = RetryError(
+            "message",
+            attempts=2,
+            elapsed=1.5,
+            slept=1.0,
+            limits={"retry_limit": 1, "time_limit": math.inf},
+            records=(AttemptRecord(0.5, 1.0, constants.TestException),),
+            exceptions=(constants.TestException("failed"),),
+        )
+        for restored in (pickle.loads(pickle.dumps(error)), copy.copy(error)):
+            with self.subTest(restored=restored):
+                self.assertIsInstance(restored, RetryError)
+                self.assertEqual(str(restored), "message")
+                self.assertEqual(restored.attempts, 2)
+                self.assertEqual(restored.elapsed, 1.5)
+                self.assertEqual(restored.slept, 1.0)
+                self.assertEqual(restored.limits, error.limits)
+                self.assertEqual(restored.records, error.records)
+                self.assertEqual(restored.exceptions[0].args, ("failed",))
+
+
+class TestRetryErrorAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for the RetryError raised by coroutines with retry logic"""
+
+    async def test_history(self):
+        """Test the RetryError records each attempt & the time slept"""
+        wrapped_func = retry_factory(
+            AsyncMock(side_effect=[constants.TestException, ValueError, None]),
+            exceptions=(constants.TestException, ValueError),
+            retry_on_result=lambda result: result is None,
+            retry_limit=2,
+            time_limit=60,
+            init_backoff=0.001,
+            exponential=2,
+            jitter=False,
+        )
+        with self.assertRaises(RetryError) as context:
+            await wrapped_func()
+        error = context.exception
+        self.assertEqual(error.attempts, 3)
+        self.assertEqual(error.limits, {"retry_limit": 2, "time_limit": 60})
+        self.assertEqual(error.slept, 0.003)
+        self.assertGreaterEqual(error.elapsed, error.slept)
+        self.assertEqual(
+            [(record.backoff, record.exception) for record in error.records],
+            [(0.001, constants.TestException), (0.002, ValueError), (0, None)],
+        )
+        for record in error.records:
+            self.assertIsInstance(record, AttemptRecord)
+            self.assertGreaterEqual(record.duration, 0)
+
+
+class TestRetryErrorSync(unittest.TestCase):
+    """Test case for the RetryError raised by functions with retry logic"""
+
+    def test_no_attempt(self):
+        """Test the RetryError of a call rejected before any attempt"""
+        bulkhead = Bulkhead(0)
+        wrapped_func = retry_factory(
+            Mock(), exceptions=constants.TestException, bulkhead=bulkhead
+        )
+        with self.assertRaises(RetryError) as context:
+            wrapped_func()
+        self.assertEqual(context.exception.attempts, 0)
+        self.assertEqual(context.exception.records, ())
+
+    def test_max_records(self):
+        """Test only the records of the last attempts are kept"""
+        wrapped_func = retry_factory(
+            Mock(side_effect=constants.TestException),
+            exceptions=constants.TestException,
+            retry_limit=200,
+            init_backoff=0,
+        )
+        with patch("tubthumper._retry_factory.MAX_RECORDS", 3):
+            with self.assertRaises(RetryError) as context:
+                wrapped_func()
+        self.assertEqual(context.exception.attempts, 201)
+        self.assertEqual(len(context.exception.records), 3)
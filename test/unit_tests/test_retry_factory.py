@@ -124,6 +124,64 @@ class TestRetryFactoryAsync(unittest.IsolatedAsyncioTestCase):
             await wrapped_func()
         func.assert_awaited_once_with()
 
+    async def test_retry_on_result(self):
+        """Test a result matching retry_on_result is retried, returning the first non-matching result"""
+        func = AsyncMock(side_effect=[None, None, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            init_backoff=0,
+        )
+        result = await wrapped_func()
+        self.assertEqual(result, 1)
+        self.assertEqual(func.await_count, 3)
+
+    async def test_retry_on_result_retry_limit(self):
+        """Test retrying a result past the retry limit raises a RetryError"""
+        func = AsyncMock(return_value=None)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            retry_limit=1,
+            init_backoff=0,
+        )
+        with self.assertRaises(RetryError) as context:
+            await wrapped_func()
+        self.assertIsNone(context.exception.__cause__)
+        self.assertEqual(func.await_count, 2)
+
+    async def test_retry_on_result_reraise(self):
+        """Test that setting reraise to True returns the last result, not RetryError"""
+        return_value = {"status": 503}
+        func = AsyncMock(return_value=return_value)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result["status"] == 503,
+            retry_limit=1,
+            init_backoff=0,
+            reraise=True,
+        )
+        result = await wrapped_func()
+        self.assertIs(result, return_value)
+        self.assertEqual(func.await_count, 2)
+
+    async def test_retry_on_result_and_exception(self):
+        """Test retried results and caught exceptions share the same retry limit"""
+        func = AsyncMock(side_effect=[None, constants.TestException, None])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            retry_limit=2,
+            init_backoff=0,
+        )
+        with self.assertRaises(RetryError):
+            await wrapped_func()
+        self.assertEqual(func.await_count, 3)
+
     async def test_jitter(self):
         """Test jitter results in random variation in backoff time, predictable thanks to setting the random seed"""
         func = util.timed_mock(async_mock=True, side_effect=constants.TestException)
@@ -484,6 +542,78 @@ class TestRetryFactory(unittest.TestCase):
             wrapped_func()
         func.assert_called_once_with()
 
+    def test_retry_on_result(self):
+        """Test a result matching retry_on_result is retried, returning the first non-matching result"""
+        func = Mock(side_effect=[None, None, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            init_backoff=0,
+        )
+        result = wrapped_func()
+        self.assertEqual(result, 1)
+        self.assertEqual(func.call_count, 3)
+
+    def test_retry_on_result_retry_limit(self):
+        """Test retrying a result past the retry limit raises a RetryError"""
+        func = Mock(return_value=None)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            retry_limit=1,
+            init_backoff=0,
+        )
+        with self.assertRaises(RetryError) as context:
+            wrapped_func()
+        self.assertIsNone(context.exception.__cause__)
+        self.assertEqual(func.call_count, 2)
+
+    def test_retry_on_result_time_limit(self):
+        """Test retrying a result past the time limit raises a RetryError"""
+        func = Mock(return_value=None)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            time_limit=0,
+        )
+        with self.assertRaises(RetryError):
+            wrapped_func()
+        func.assert_called_once_with()
+
+    def test_retry_on_result_reraise(self):
+        """Test that setting reraise to True returns the last result, not RetryError"""
+        return_value = {"status": 503}
+        func = Mock(return_value=return_value)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result["status"] == 503,
+            retry_limit=1,
+            init_backoff=0,
+            reraise=True,
+        )
+        result = wrapped_func()
+        self.assertIs(result, return_value)
+        self.assertEqual(func.call_count, 2)
+
+    def test_retry_on_result_logging(self):
+        """Test retrying a result results in a warning log statement without exception info"""
+        func = Mock(side_effect=[None, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_on_result=lambda result: result is None,
+            init_backoff=0,
+        )
+        with self.assertLogs(logger=tubthumper_logger, level=logging.WARNING) as logs:
+            wrapped_func()
+        (record,) = logs.records
+        self.assertIn("returned None on try 1", record.getMessage())
+        self.assertFalse(record.exc_info)
+
     def test_jitter(self):
         """Test jitter results in random variation in backoff time, predictable thanks to setting the random seed"""
         func = util.timed_mock(side_effect=constants.TestException)
@@ -0,0 +1,219 @@
+"""Unit tests for the function retry_to_thread, and retrying functions within an event loop"""
+
+import asyncio
+import logging
+import threading
+import unittest
+import warnings
+from typing import Generator, List
+
+from mock import Mock
+
+from tubthumper import (
+    EventLoopBlockingError,
+    RetryError,
+    in_flight,
+    retry,
+    retry_decorator,
+    retry_factory,
+    retry_to_thread,
+    retrying,
+)
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestRetryToThread(unittest.IsolatedAsyncioTestCase):
+    """Test case for retry_to_thread function"""
+
+    async def test_success(self):
+        """Test the function is called with appropriate arguments in another thread"""
+        threads = []
+
+        def func(*args: object, **kwargs: object) -> int:
+            threads.append(threading.current_thread())
+            return len(args) + len(kwargs)
+
+        result = await retry_to_thread(
+            func,
+            args=constants.ARGS,
+            kwargs=constants.KWARGS,
+            exceptions=constants.TestException,
+        )
+        self.assertEqual(result, len(constants.ARGS) + len(constants.KWARGS))
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    async def test_retry_limit(self):
+        """Test retries happen in the thread, raising a RetryError once the limit is reached"""
+        func = Mock(side_effect=constants.TestException)
+        with self.assertRaises(RetryError):
+            await retry_to_thread(
+                func, exceptions=constants.TestException, retry_limit=1, init_backoff=0
+            )
+        self.assertEqual(func.call_count, 2)
+
+    async def test_event_loop_not_blocked(self):
+        """Test the event loop keeps running while the function backs off"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        result = await retry_to_thread(
+            func, exceptions=constants.TestException, init_backoff=0.2, jitter=False
+        )
+        ticker.cancel()
+        self.assertEqual(result, 1)
+        self.assertGreater(ticks, 5)
+
+
+class TestRetryInEventLoop(unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying functions from within a running event loop"""
+
+    async def test_warn(self):
+        """Test sleeping before a retry within a running event loop warns by default"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0.001
+        )
+        with self.assertWarnsRegex(RuntimeWarning, "retry_to_thread"):
+            self.assertEqual(wrapped_func(), 1)
+
+    async def test_warn_location(self):
+        """Test the warning points at the caller of the function with retry logic"""
+        wrapped_func = retry_factory(
+            Mock(side_effect=[constants.TestException, 1]),
+            exceptions=constants.TestException,
+            init_backoff=0.001,
+            jitter=False,
+        )
+        with self.assertWarns(RuntimeWarning) as caught:
+            wrapped_func()
+        self.assertEqual(caught.filename, __file__)
+
+    async def test_warn_location_retry(self):
+        """Test the warning points at the caller of retry"""
+        with self.assertWarns(RuntimeWarning) as caught:
+            retry(
+                Mock(side_effect=[constants.TestException, 1]),
+                exceptions=constants.TestException,
+                init_backoff=0.001,
+            )
+        self.assertEqual(caught.filename, __file__)
+
+    async def test_warn_location_decorator(self):
+        """Test the warning points at the caller of a decorated function"""
+
+        @retry_decorator(exceptions=constants.TestException, init_backoff=0.001)
+        def func() -> None:
+            if not caught:
+                caught.append(True)
+                raise constants.TestException
+
+        caught: List[bool] = []
+        with self.assertWarns(RuntimeWarning) as warning:
+            func()
+        self.assertEqual(warning.filename, __file__)
+
+    async def test_warn_location_retrying(self):
+        """Test the warning points at the loop retrying a block of code"""
+        with self.assertWarns(RuntimeWarning) as caught:
+            for attempt in retrying(
+                exceptions=constants.TestException, init_backoff=0.001
+            ):
+                with attempt:
+                    if attempt.number < 2:
+                        raise constants.TestException
+        self.assertEqual(caught.filename, __file__)
+
+    async def test_raise(self):
+        """Test calling within a running event loop can raise an error right away"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0.001,
+            on_event_loop="raise",
+        )
+        with self.assertRaisesRegex(
+            EventLoopBlockingError, "block the running event loop"
+        ):
+            wrapped_func()
+        func.assert_not_called()
+        self.assertEqual(in_flight.snapshot(), [])
+
+    async def test_raise_generator(self):
+        """Test iterating within a running event loop can raise an error right away"""
+        started: List[bool] = []
+
+        def pages() -> Generator[int, None, None]:
+            started.append(True)
+            yield 0
+
+        wrapped_func = retry_factory(
+            pages,
+            exceptions=constants.TestException,
+            resume=lambda page: {},
+            on_event_loop="raise",
+        )
+        with self.assertRaisesRegex(
+            EventLoopBlockingError, "block the running event loop"
+        ):
+            next(wrapped_func())
+        self.assertEqual(started, [])
+
+    async def test_ignore(self):
+        """Test sleeping before a retry within a running event loop can be allowed"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0.001,
+            on_event_loop="ignore",
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(wrapped_func(), 1)
+
+    async def test_no_backoff(self):
+        """Test retrying without sleeping within a running event loop doesn't warn"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(wrapped_func(), 1)
+
+
+class TestRetryOutsideEventLoop(unittest.TestCase):
+    """Test case for retrying functions without a running event loop"""
+
+    def test_no_warning(self):
+        """Test sleeping before a retry without a running event loop doesn't warn"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0.001
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(wrapped_func(), 1)
+
+    def test_no_raise(self):
+        """Test a function configured to raise within a running event loop is called without one"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            init_backoff=0.001,
+            on_event_loop="raise",
+        )
+        self.assertEqual(wrapped_func(), 1)
@@ -0,0 +1,185 @@
+"""Unit tests for the retrying interface, retrying blocks of code"""
+
+import asyncio
+import logging
+import unittest
+from typing import List, Optional
+
+from mock import Mock
+
+from tubthumper import (
+    Attempt,
+    AttemptContext,
+    ExceptionClassifier,
+    RetryError,
+    attempt_context,
+    in_flight,
+    load_shedder,
+    policy_registry,
+    retrying,
+)
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class TestRetryingAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying blocks of code with async for"""
+
+    async def test_retrying(self):
+        """Test a block of code is retried until it succeeds"""
+        attempts: List[Attempt] = []
+        async for attempt in retrying(
+            exceptions=constants.TestException, init_backoff=0.001
+        ):
+            with attempt:
+                attempts.append(attempt)
+                if attempt.number < 3:
+                    raise constants.TestException
+        self.assertEqual(len(attempts), 3)
+        self.assertTrue(all(attempt is attempts[0] for attempt in attempts))
+        self.assertEqual(in_flight.snapshot(), [])
+
+    async def test_give_up(self):
+        """Test a RetryError is raised once retries give up"""
+        with self.assertRaisesRegex(RetryError, "Retry limit 1 reached"):
+            async for attempt in retrying(
+                exceptions=constants.TestException, retry_limit=1, init_backoff=0
+            ):
+                with attempt:
+                    raise constants.TestException
+
+    async def test_break(self):
+        """Test breaking out of the loop after a failed attempt ends its backoff"""
+        async for attempt in retrying(exceptions=constants.TestException):
+            with attempt:
+                raise constants.TestException
+            break
+        for _ in range(2):  # for the event loop to close the loop left
+            await asyncio.sleep(0)
+        self.assertEqual(load_shedder.stats()["backing_off"], 0)
+        self.assertEqual(in_flight.snapshot(), [])
+
+
+class TestRetrying(unittest.TestCase):
+    """Test case for retrying blocks of code with for"""
+
+    def test_retrying(self):
+        """Test a block of code is retried until it succeeds, reusing the attempt"""
+        attempts: List[Attempt] = []
+        for attempt in retrying(exceptions=constants.TestException, init_backoff=0):
+            with attempt:
+                attempts.append(attempt)
+                if attempt.number < 3:
+                    raise constants.TestException
+        self.assertEqual(len(attempts), 3)
+        self.assertTrue(all(attempt is attempts[0] for attempt in attempts))
+        self.assertEqual(in_flight.snapshot(), [])
+
+    def test_give_up(self):
+        """Test a RetryError is raised once retries give up"""
+        with self.assertRaisesRegex(RetryError, "Retry limit 2 reached"):
+            for attempt in retrying(
+                exceptions=constants.TestException, retry_limit=2, init_backoff=0
+            ):
+                with attempt:
+                    raise constants.TestException
+        self.assertEqual(in_flight.snapshot(), [])
+
+    def test_reraise(self):
+        """Test the caught exception is re-raised once retries give up, if configured"""
+        with self.assertRaises(constants.TestException):
+            for attempt in retrying(
+                exceptions=constants.TestException, retry_limit=0, reraise=True
+            ):
+                with attempt:
+                    raise constants.TestException
+
+    def test_not_retried(self):
+        """Test exceptions not retried propagate right away"""
+        for exceptions in (
+            constants.TestException,
+            ExceptionClassifier(Exception, exclude=ValueError),
+        ):
+            with self.subTest(exceptions=exceptions):
+                numbers: List[int] = []
+                with self.assertRaises(ValueError):
+                    for attempt in retrying(exceptions=exceptions):
+                        with attempt:
+                            numbers.append(attempt.number)
+                            raise ValueError
+                self.assertEqual(numbers, [1])
+
+    def test_return(self):
+        """Test returning from within an attempt counts as succeeding"""
+        slow_start = Mock()
+
+        def func() -> int:
+            for attempt in retrying(
+                exceptions=constants.TestException,
+                init_backoff=0,
+                slow_start=slow_start,
+            ):
+                with attempt:
+                    if attempt.number < 2:
+                        raise constants.TestException
+                    return attempt.number
+            raise AssertionError("unreachable")
+
+        self.assertEqual(func(), 2)
+        slow_start.recover.assert_called_once_with()
+        self.assertEqual(in_flight.snapshot(), [])
+
+    def test_without_with(self):
+        """Test an attempt not entered with with counts as succeeding"""
+        slow_start = Mock()
+        attempts = list(
+            retrying(exceptions=constants.TestException, slow_start=slow_start)
+        )
+        self.assertEqual(len(attempts), 1)
+        slow_start.recover.assert_called_once_with()
+
+    def test_break(self):
+        """Test breaking out of the loop after a failed attempt ends the loop and its backoff"""
+        for attempt in retrying(exceptions=constants.TestException):
+            with attempt:
+                raise constants.TestException
+            break
+        self.assertEqual(load_shedder.stats()["backing_off"], 0)
+        self.assertEqual(in_flight.snapshot(), [])
+
+    def test_raise_after(self):
+        """Test an exception raised after a failed attempt ends the loop and its backoff"""
+        with self.assertRaises(ValueError):
+            for attempt in retrying(exceptions=constants.TestException):
+                with attempt:
+                    raise constants.TestException
+                raise ValueError
+        self.assertEqual(load_shedder.stats()["backing_off"], 0)
+        self.assertEqual(in_flight.snapshot(), [])
+
+    def test_attempt_context(self):
+        """Test the attempt context is only set within the attempt"""
+        contexts: List[Optional[AttemptContext]] = []
+        for attempt in retrying(
+            exceptions=constants.TestException, expose_attempt=True
+        ):
+            with attempt:
+                contexts.append(attempt_context())
+            contexts.append(attempt_context())
+        self.assertIsNotNone(contexts[0])
+        self.assertIsNone(contexts[1])
+
+    def test_policy(self):
+        """Test the policy's current values apply to each loop"""
+        self.addCleanup(policy_registry.update, {})
+        loop = retrying(
+            exceptions=constants.TestException, init_backoff=0, policy="blocks"
+        )
+        policy_registry.update({"blocks": {"retry_limit": 0}})
+        with self.assertRaisesRegex(RetryError, "Retry limit 0 reached"):
+            for attempt in loop:
+                with attempt:
+                    raise constants.TestException
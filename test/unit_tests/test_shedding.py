@@ -0,0 +1,151 @@
+"""Unit tests for priority-aware load shedding of retries"""
+
+import logging
+import threading
+import unittest
+from typing import Any
+
+from mock import AsyncMock, Mock, patch
+
+from tubthumper import (
+    LoadShedder,
+    RetryError,
+    load_shedder,
+    priority,
+    retry_factory,
+)
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class _PressureMixin:
+    """Mixin putting the process-wide load shedder under pressure"""
+
+    addCleanup: Any
+
+    def setUp(self):
+        max_backoffs = load_shedder.max_backoffs
+        load_shedder.max_backoffs = 2
+        load_shedder.start_backoff()
+        self.addCleanup(setattr, load_shedder, "max_backoffs", max_backoffs)
+        self.addCleanup(load_shedder.end_backoff)
+
+
+class TestLoadShedder(unittest.TestCase):
+    """Test case for the load shedder"""
+
+    def test_shed(self):
+        """Test retries are shed once the pressure reaches their priority"""
+        shedder = LoadShedder(max_backoffs=4)
+        self.assertFalse(shedder.shed(0.5))
+        shedder.start_backoff()
+        shedder.start_backoff()
+        self.assertTrue(shedder.shed(0.5))
+        self.assertFalse(shedder.shed(1))
+        shedder.end_backoff()
+        self.assertEqual(
+            shedder.stats(), {"backing_off": 1, "pressure": 0.25, "shed": 1}
+        )
+
+
+class TestSheddingAsync(_PressureMixin, unittest.IsolatedAsyncioTestCase):
+    """Test case for shedding retries of coroutines"""
+
+    async def test_shed(self):
+        """Test a low-priority coroutine gives up rather than retrying"""
+        func = AsyncMock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, priority=0.5
+        )
+        with self.assertRaisesRegex(RetryError, "shed under load"):
+            await wrapped_func()
+        func.assert_awaited_once_with()
+
+
+class TestShedding(_PressureMixin, unittest.TestCase):
+    """Test case for shedding retries of functions"""
+
+    def test_shed(self):
+        """Test a low-priority function gives up rather than retrying"""
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, priority=0.5
+        )
+        with self.assertRaisesRegex(RetryError, "shed under load"):
+            wrapped_func()
+        func.assert_called_once_with()
+
+    def test_high_priority(self):
+        """Test a high-priority function keeps retrying, counting towards the pressure"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0, priority=1
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(load_shedder.stats()["backing_off"], 1)
+
+    def test_no_priority(self):
+        """Test a function without a priority is never shed, but counts towards the pressure"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(func, exceptions=constants.TestException)
+
+        def sleep(backoff: float) -> None:
+            self.assertEqual(load_shedder.pressure(), 1)
+
+        with patch("time.sleep", side_effect=sleep) as time_sleep:
+            self.assertEqual(wrapped_func(), 1)
+        time_sleep.assert_called_once()
+        self.assertEqual(load_shedder.stats()["backing_off"], 1)
+
+    def test_default_priority_load(self):
+        """Test callers without a priority backing off shed retries of prioritized ones"""
+        load_shedder.max_backoffs = 4
+        release = threading.Event()
+        backing_off = threading.Barrier(4, timeout=5)
+
+        def sleep(backoff: float) -> None:
+            backing_off.wait()
+            release.wait()
+
+        with patch("time.sleep", side_effect=sleep):
+            threads = [
+                threading.Thread(
+                    target=retry_factory(
+                        Mock(side_effect=[constants.TestException, 1]),
+                        exceptions=constants.TestException,
+                    )
+                )
+                for _ in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            prioritized = retry_factory(
+                Mock(side_effect=constants.TestException),
+                exceptions=constants.TestException,
+                priority=0.3,
+            )
+            try:
+                backing_off.wait()
+                with self.assertRaisesRegex(RetryError, "shed under load"):
+                    prioritized()
+            finally:
+                release.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(load_shedder.stats()["backing_off"], 1)
+
+    def test_call_priority(self):
+        """Test the priority of calls overrides the priority of their wrapper"""
+        func = Mock(side_effect=[constants.TestException, 1])
+        wrapped_func = retry_factory(
+            func, exceptions=constants.TestException, init_backoff=0, priority=0.5
+        )
+        with priority(None):
+            self.assertEqual(wrapped_func(), 1)
+        wrapped_func = retry_factory(func, exceptions=constants.TestException)
+        with priority(0.5), self.assertRaisesRegex(RetryError, "shed under load"):
+            func.side_effect = constants.TestException
+            wrapped_func()
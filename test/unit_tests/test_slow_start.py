@@ -0,0 +1,193 @@
+"""Unit tests for the class SlowStart"""
+
+import logging
+import unittest
+from typing import Any
+
+from mock import AsyncMock, Mock, patch
+
+from tubthumper import Bulkhead, RetryBudget, RetryError, SlowStart, retry_factory
+
+from . import constants
+
+tubthumper_logger = logging.getLogger("tubthumper")
+tubthumper_logger.setLevel(logging.ERROR)  # silence warnings from retries
+
+
+class _TimeMixin:
+    """Mixin patching the ramp's clock & randomness"""
+
+    addCleanup: Any
+
+    def setUp(self):
+        patcher = patch("tubthumper._slow_start.time")
+        self.time = patcher.start()
+        self.time.monotonic.return_value = 0.0
+        self.addCleanup(patcher.stop)
+        patcher = patch("tubthumper._slow_start.random")
+        self.random = patcher.start()
+        self.random.random.return_value = 0.5
+        self.addCleanup(patcher.stop)
+
+
+class TestSlowStart(_TimeMixin, unittest.TestCase):
+    """Test case for the slow start ramp"""
+
+    def test_ramp(self):
+        """Test the share of attempts let through grows over the window"""
+        slow_start = SlowStart(10, min_share=0.1)
+        self.assertEqual(slow_start.share(), 1)
+        slow_start.recover()
+        self.assertEqual(slow_start.share(), 1)
+        slow_start.trip()
+        self.assertEqual(slow_start.share(), 0.1)
+        self.assertFalse(slow_start.admit())
+        self.time.monotonic.return_value = 60.0
+        self.assertEqual(slow_start.share(), 0.1)
+        self.time.monotonic.return_value = 0.0
+        slow_start.recover()
+        self.assertEqual(slow_start.share(), 0.1)
+        self.assertFalse(slow_start.admit())
+        self.time.monotonic.return_value = 6.0
+        self.assertEqual(slow_start.share(), 0.6)
+        self.assertTrue(slow_start.admit())
+        self.time.monotonic.return_value = 10.0
+        self.assertEqual(slow_start.share(), 1)
+        self.assertTrue(slow_start.admit())
+
+    def test_trip_while_ramping(self):
+        """Test a call giving up while ramping holds attempts back until the next recovery"""
+        slow_start = SlowStart(10)
+        slow_start.trip()
+        slow_start.recover()
+        self.time.monotonic.return_value = 5.0
+        self.assertEqual(slow_start.share(), 0.5)
+        slow_start.trip()
+        self.assertEqual(slow_start.share(), 0.1)
+        self.assertFalse(slow_start.admit())
+        self.time.monotonic.return_value = 8.0
+        slow_start.recover()
+        self.assertEqual(slow_start.share(), 0.1)
+
+    def test_ramp_restarted(self):
+        """Test a ramp started since isn't ended"""
+        slow_start = SlowStart(10)
+        slow_start.trip()
+        slow_start.recover()
+        slow_start._end_ramp(-1.0)
+        self.assertEqual(slow_start.share(), 0.1)
+
+    def test_named(self):
+        """Test a named ramp is shared"""
+        slow_start = SlowStart.named("test_named", 5)
+        self.assertIs(SlowStart.named("test_named"), slow_start)
+        self.assertEqual(slow_start.window, 5)
+        with self.assertRaisesRegex(ValueError, "window=5, not 10"):
+            SlowStart.named("test_named", 10)
+
+
+class TestSlowStartRetryAsync(_TimeMixin, unittest.IsolatedAsyncioTestCase):
+    """Test case for retrying coroutines with a slow start ramp"""
+
+    async def test_ramp(self):
+        """Test a coroutine isn't awaited when not let through after recovering"""
+        slow_start = SlowStart()
+        func = AsyncMock(side_effect=[constants.TestException, 1, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            slow_start=slow_start,
+        )
+        with self.assertRaises(RetryError):
+            await wrapped_func()
+        self.random.random.return_value = 0.05
+        self.assertEqual(await wrapped_func(), 1)
+        self.random.random.return_value = 0.5
+        with self.assertRaisesRegex(RetryError, "Slow start"):
+            await wrapped_func()
+        self.assertEqual(func.await_count, 2)
+
+
+class TestSlowStartRetry(_TimeMixin, unittest.TestCase):
+    """Test case for retrying functions with a slow start ramp"""
+
+    def test_ramp(self):
+        """Test a function isn't called when not let through after recovering"""
+        slow_start = SlowStart()
+        func = Mock(side_effect=[constants.TestException, 1, 1])
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            slow_start=slow_start,
+        )
+        with self.assertRaises(RetryError):
+            wrapped_func()
+        self.random.random.return_value = 0.05
+        self.assertEqual(wrapped_func(), 1)
+        self.random.random.return_value = 0.5
+        with self.assertRaisesRegex(RetryError, "Slow start"):
+            wrapped_func()
+        self.assertEqual(func.call_count, 2)
+
+    def test_retried(self):
+        """Test a function succeeding on a retry after a transient failure doesn't trip the ramp"""
+        slow_start = SlowStart()
+        wrapped_func = retry_factory(
+            Mock(side_effect=[constants.TestException, 1]),
+            exceptions=constants.TestException,
+            init_backoff=0,
+            slow_start=slow_start,
+        )
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(slow_start.share(), 1)
+
+    def test_outage(self):
+        """Test attempts are held back while calls keep giving up, until one succeeds"""
+        slow_start = SlowStart()
+        func = Mock(side_effect=constants.TestException)
+        wrapped_func = retry_factory(
+            func,
+            exceptions=constants.TestException,
+            retry_limit=0,
+            slow_start=slow_start,
+        )
+        with self.assertRaisesRegex(RetryError, "Retry limit 0 reached"):
+            wrapped_func()
+        for _ in range(3):
+            with self.assertRaisesRegex(RetryError, "Slow start"):
+                wrapped_func()
+        self.assertEqual(func.call_count, 1)
+
+    def test_refused_locally(self):
+        """Test calls giving up on retries refused locally don't trip the ramp"""
+        slow_start = Mock(spec=SlowStart)
+        bulkhead = Mock(spec=Bulkhead)
+        bulkhead.start_backoff.return_value = False
+        wrapped_func = retry_factory(
+            Mock(side_effect=constants.TestException),
+            exceptions=constants.TestException,
+            bulkhead=bulkhead,
+            slow_start=slow_start,
+        )
+        with self.assertRaisesRegex(RetryError, "Bulkhead full"):
+            wrapped_func()
+        slow_start.trip.assert_not_called()
+
+    def test_circuit_breaker(self):
+        """Test the ramp starts once the circuit breaker closes"""
+        slow_start = SlowStart()
+        budget = Mock(spec=RetryBudget)
+        budget.start.side_effect = [False, True]
+        wrapped_func = retry_factory(
+            Mock(return_value=1),
+            exceptions=constants.TestException,
+            budget=budget,
+            slow_start=slow_start,
+        )
+        with self.assertRaisesRegex(RetryError, "Circuit breaker open"):
+            wrapped_func()
+        self.random.random.return_value = 0.05
+        self.assertEqual(wrapped_func(), 1)
+        self.assertEqual(slow_start.share(), 0.1)
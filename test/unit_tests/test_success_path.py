@@ -0,0 +1,53 @@
+"""Unit tests for calls succeeding on their first attempt paying only for what they use"""
+
+import unittest
+
+from mock import AsyncMock, Mock, patch
+
+from tubthumper import retry_factory, retrying
+
+from . import constants
+
+
+@patch("tubthumper._retry_factory.in_flight")
+class TestSuccessPathAsync(unittest.IsolatedAsyncioTestCase):
+    """Test case for coroutines succeeding on their first attempt"""
+
+    async def test_plain(self, in_flight: Mock):
+        """Test a plain coroutine call doesn't register its loop"""
+        wrapped_func = retry_factory(
+            AsyncMock(return_value=1), exceptions=constants.TestException
+        )
+        self.assertEqual(await wrapped_func(), 1)
+        in_flight.register.assert_not_called()
+        in_flight.unregister.assert_not_called()
+
+
+@patch("tubthumper._retry_factory.in_flight")
+class TestSuccessPath(unittest.TestCase):
+    """Test case for functions succeeding on their first attempt"""
+
+    def test_plain(self, in_flight: Mock):
+        """Test a plain function call doesn't register its loop"""
+        wrapped_func = retry_factory(
+            Mock(return_value=1), exceptions=constants.TestException
+        )
+        self.assertEqual(wrapped_func(), 1)
+        in_flight.register.assert_not_called()
+        in_flight.unregister.assert_not_called()
+
+    def test_no_attempt_snapshot(self, in_flight: Mock):
+        """Test a call not exposing its attempt never takes a snapshot of it"""
+        wrapped_func = retry_factory(
+            Mock(return_value=1), exceptions=constants.TestException
+        )
+        with patch("tubthumper._retry_factory.AttemptContext") as attempt_context:
+            self.assertEqual(wrapped_func(), 1)
+        attempt_context.assert_not_called()
+
+    def test_block(self, in_flight: Mock):
+        """Test a block of code succeeding right away doesn't register its loop"""
+        for attempt in retrying(exceptions=constants.TestException):
+            with attempt:
+                pass
+        in_flight.register.assert_not_called()